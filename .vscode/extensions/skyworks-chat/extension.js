@@ -2,7 +2,7 @@ const vscode = require('vscode');
 const fs = require('fs');
 const path = require('path');
 const { execSync } = require('child_process');
-const { handleAskAgentWithLLM } = require('./llm_handler');
+const { handleAskAgentWithLLM, disposeAgentService, loadAgentMemory, readText } = require('./llm_handler');
 
 /**
  * @param {vscode.ExtensionContext} context
@@ -97,17 +97,15 @@ async function handleTrainingStatus(stream, logsDir, memoryDir) {
     const indexedMatch = logContent.match(/✓ Indexed (\d+) documents/);
     const indexed = indexedMatch ? indexedMatch[1] : 'N/A';
 
-    // Get memory files
-    const soraMemPath = path.join(memoryDir, 'SORA_Compliance_Agent_memory.json');
-    const missionMemPath = path.join(memoryDir, 'Mission_Planning_Agent_memory.json');
+    // Get agent memory
+    const soraMem = loadAgentMemory(memoryDir, 'SORA_Compliance_Agent');
+    const missionMem = loadAgentMemory(memoryDir, 'Mission_Planning_Agent');
 
     let soraEntries = 'N/A', missionEntries = 'N/A';
-    if (fs.existsSync(soraMemPath)) {
-        const soraMem = JSON.parse(fs.readFileSync(soraMemPath, 'utf-8'));
+    if (soraMem) {
         soraEntries = soraMem.total_memory_entries || 0;
     }
-    if (fs.existsSync(missionMemPath)) {
-        const missionMem = JSON.parse(fs.readFileSync(missionMemPath, 'utf-8'));
+    if (missionMem) {
         missionEntries = missionMem.total_memory_entries || 0;
     }
 
@@ -149,7 +147,7 @@ async function handleTrainingReport(stream, memoryDir) {
     stream.markdown(`## 📊 Latest Training Report\n\n`);
 
     const reportFiles = fs.readdirSync(memoryDir)
-        .filter(f => f.startsWith('training_report_') && f.endsWith('.json'))
+        .filter(f => /^training_report_.*\.json(\.gz)?$/.test(f))
         .map(f => ({ name: f, time: fs.statSync(path.join(memoryDir, f)).mtime }))
         .sort((a, b) => b.time - a.time);
 
@@ -160,7 +158,7 @@ async function handleTrainingReport(stream, memoryDir) {
 
     const latestReport = reportFiles[0];
     const reportPath = path.join(memoryDir, latestReport.name);
-    const report = JSON.parse(fs.readFileSync(reportPath, 'utf-8'));
+    const report = JSON.parse(readText(reportPath));
 
     stream.markdown(`**Timestamp**: ${new Date(report.training_session.timestamp).toLocaleString('el-GR')}\n\n`);
     stream.markdown(`### Knowledge Sources\n`);
@@ -189,18 +187,17 @@ async function handleAgents(stream, memoryDir) {
     stream.markdown(`## 🤖 Active Agents\n\n`);
 
     const agents = [
-        { name: 'SORA_Compliance_Agent', file: 'SORA_Compliance_Agent_memory.json' },
-        { name: 'Mission_Planning_Agent', file: 'Mission_Planning_Agent_memory.json' }
+        { name: 'SORA_Compliance_Agent' },
+        { name: 'Mission_Planning_Agent' }
     ];
 
     agents.forEach(agent => {
-        const memPath = path.join(memoryDir, agent.file);
-        if (!fs.existsSync(memPath)) {
+        const memory = loadAgentMemory(memoryDir, agent.name);
+        if (!memory) {
             stream.markdown(`⚠️ **${agent.name}**: Memory file not found\n\n`);
             return;
         }
 
-        const memory = JSON.parse(fs.readFileSync(memPath, 'utf-8'));
         stream.markdown(`### ${agent.name}\n`);
         stream.markdown(`**Expertise**:\n`);
         memory.expertise.forEach(exp => stream.markdown(`- ${exp}\n`));
@@ -353,7 +350,9 @@ async function handleHelp(stream) {
     stream.markdown(`📖 Για λεπτομέρειες: \`Tools/TrainingCenter/CHAT_COMMANDS.md\`\n`);
 }
 
-function deactivate() {}
+function deactivate() {
+    disposeAgentService();
+}
 
 module.exports = {
     activate,
@@ -1,5 +1,107 @@
 const fs = require('fs');
 const path = require('path');
+const readline = require('readline');
+const zlib = require('zlib');
+const { spawn } = require('child_process');
+
+// Plain or gzip-compressed (.gz) text, as written by the trainer with --compress gz
+function readText(filePath) {
+    const data = fs.readFileSync(filePath);
+    return filePath.endsWith('.gz') ? zlib.gunzipSync(data).toString('utf-8') : data.toString('utf-8');
+}
+
+// Latest agent memory state. The trainer's memory store (Python) writes the
+// current state in the legacy schema to <agent>_memory.json after every
+// session, so this reads that one compat file instead of replaying the store.
+function loadAgentMemory(memoryDir, agentName) {
+    const memoryPath = path.join(memoryDir, `${agentName}_memory.json`);
+    return fs.existsSync(memoryPath) ? JSON.parse(fs.readFileSync(memoryPath, 'utf-8')) : null;
+}
+
+// Persistent agent_llm.py service (JSON-RPC over stdio): one Python process
+// keeps the client, agent memories and retrieval indexes warm across questions.
+let agentService = null;
+
+function getAgentService(llmScript) {
+    if (agentService && !agentService.exited) {
+        return agentService;
+    }
+
+    const proc = spawn('python', [llmScript, '--serve'], { stdio: ['pipe', 'pipe', 'pipe'] });
+    const service = { proc, pending: new Map(), nextId: 1, exited: false };
+
+    const failAll = (err) => {
+        service.exited = true;
+        for (const waiter of service.pending.values()) {
+            clearTimeout(waiter.timer);
+            waiter.reject(err);
+        }
+        service.pending.clear();
+    };
+
+    readline.createInterface({ input: proc.stdout }).on('line', line => {
+        let message;
+        try {
+            message = JSON.parse(line);
+        } catch {
+            return; // Not a protocol line
+        }
+        if (message.method === 'stream') {
+            // Streaming notification for an in-flight request
+            const streaming = service.pending.get(message.params.id);
+            if (streaming && streaming.onEvent) {
+                streaming.touch();
+                streaming.onEvent(message.params);
+            }
+            return;
+        }
+        const waiter = service.pending.get(message.id);
+        if (!waiter) {
+            return;
+        }
+        service.pending.delete(message.id);
+        clearTimeout(waiter.timer);
+        if (message.error) {
+            waiter.reject(new Error(message.error.message));
+        } else {
+            waiter.resolve(message.result);
+        }
+    });
+    proc.stderr.on('data', () => {}); // Drain diagnostics
+    proc.on('error', err => failAll(err));
+    proc.on('exit', code => failAll(new Error(`Agent service exited (code ${code})`)));
+
+    agentService = service;
+    return service;
+}
+
+// onEvent receives `stream` notifications; each one restarts the timeout,
+// so a long answer that keeps streaming does not time out.
+function callAgentService(llmScript, method, params, timeoutMs = 60000, onEvent = null) {
+    const service = getAgentService(llmScript);
+    const id = service.nextId++;
+    return new Promise((resolve, reject) => {
+        const expire = () => {
+            service.pending.delete(id);
+            reject(new Error(`Agent service timed out after ${timeoutMs / 1000}s`));
+        };
+        const waiter = { resolve, reject, onEvent, timer: setTimeout(expire, timeoutMs) };
+        waiter.touch = () => {
+            clearTimeout(waiter.timer);
+            waiter.timer = setTimeout(expire, timeoutMs);
+        };
+        service.pending.set(id, waiter);
+        service.proc.stdin.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
+    });
+}
+
+function disposeAgentService() {
+    if (agentService && !agentService.exited) {
+        agentService.proc.stdin.write(JSON.stringify({ jsonrpc: '2.0', id: 0, method: 'shutdown' }) + '\n');
+        agentService.proc.stdin.end();
+    }
+    agentService = null;
+}
 
 async function handleAskAgentWithLLM(stream, agentName, question, memoryDir, workspaceRoot) {
     stream.markdown(`## 🤖 ${agentName}\n\n`);
@@ -36,29 +138,31 @@ async function handleAskAgentWithLLM(stream, agentName, question, memoryDir, wor
     const llmScript = path.join(workspaceRoot, 'Tools', 'TrainingCenter', 'agent_llm.py');
     
     try {
-        const { execSync } = require('child_process');
-        const result = execSync(`python "${llmScript}" "${agentName}" "${question}"`, {
-            encoding: 'utf-8',
-            timeout: 60000, // 60s timeout
-            maxBuffer: 10 * 1024 * 1024 // 10MB buffer
+        // Render the answer as it is generated
+        let started = false;
+        const response = await callAgentService(llmScript, 'ask_stream', { agent_name: agentName, question }, 60000, event => {
+            if (event.event !== 'delta') {
+                return;
+            }
+            if (!started) {
+                stream.markdown(`---\n\n`);
+                started = true;
+            }
+            stream.markdown(event.text);
         });
 
-        const response = JSON.parse(result);
-
         if (!response.success) {
             stream.markdown(`❌ **Error**: ${response.error}\n`);
             return;
         }
 
-        // Display LLM response
-        stream.markdown(`---\n\n`);
-        stream.markdown(response.answer);
         stream.markdown(`\n\n---\n\n`);
 
         // Metadata
         stream.markdown(`📊 **Metadata**:\n`);
         stream.markdown(`- Model: ${response.model}\n`);
         stream.markdown(`- Tokens Used: ${response.tokens_used}\n`);
+        stream.markdown(`- Time to first token: ${response.ttft_ms} ms (total ${response.latency_ms} ms)\n`);
         stream.markdown(`- Sources Retrieved: ${response.sources.length}\n\n`);
 
         if (response.sources.length > 0) {
@@ -80,23 +184,18 @@ async function handleAskAgentWithLLM(stream, agentName, question, memoryDir, wor
 
 async function handleAskAgentKeywordSearch(stream, agentName, question, memoryDir) {
     // Original keyword-based search (fallback)
-    const memFile = agentName === 'SORA_Compliance_Agent' 
-        ? 'SORA_Compliance_Agent_memory.json'
-        : 'Mission_Planning_Agent_memory.json';
-    const memPath = path.join(memoryDir, memFile);
+    const memory = loadAgentMemory(memoryDir, agentName);
 
-    if (!fs.existsSync(memPath)) {
+    if (!memory) {
         stream.markdown(`⚠️ Agent memory not found. Run training first.\n`);
         return;
     }
 
-    const memory = JSON.parse(fs.readFileSync(memPath, 'utf-8'));
-
     // Simple keyword search in memory
     const keywords = question.toLowerCase().split(' ').filter(w => w.length > 3);
     const relevantEntries = memory.memory.slice(0, 100).filter(entry => {
         const source = entry.source.toLowerCase();
-        const terms = entry.key_terms.map(t => t.toLowerCase());
+        const terms = (entry.key_terms || entry.key_operations || []).map(t => t.toLowerCase());
         return keywords.some(kw => source.includes(kw) || terms.some(t => t.includes(kw)));
     });
 
@@ -112,8 +211,9 @@ async function handleAskAgentKeywordSearch(stream, agentName, question, memoryDi
     stream.markdown(`📎 **Σχετικές πηγές**:\n`);
     relevantEntries.slice(0, 5).forEach(entry => {
         stream.markdown(`- \`${entry.source}\` (${entry.content_length} chars)\n`);
-        if (entry.key_terms.length > 0) {
-            stream.markdown(`  - Terms: ${entry.key_terms.slice(0, 5).join(', ')}\n`);
+        const terms = entry.key_terms || entry.key_operations || [];
+        if (terms.length > 0) {
+            stream.markdown(`  - Terms: ${terms.slice(0, 5).join(', ')}\n`);
         }
     });
 
@@ -121,4 +221,4 @@ async function handleAskAgentKeywordSearch(stream, agentName, question, memoryDi
 }
 
 // Export για χρήση στο extension.js
-module.exports = { handleAskAgentWithLLM };
+module.exports = { handleAskAgentWithLLM, callAgentService, disposeAgentService, loadAgentMemory, readText };
@@ -103,6 +103,7 @@ public class AgentsController : ControllerBase
 
             var reportFiles = Directory.Exists(memoryPath)
                 ? Directory.GetFiles(memoryPath, "training_report_*.json")
+                    .Concat(Directory.GetFiles(memoryPath, "training_report_*.json.gz"))
                     .OrderByDescending(System.IO.File.GetLastWriteTime)
                     .ToList()
                 : new List<string>();
@@ -110,7 +111,7 @@ public class AgentsController : ControllerBase
             if (!reportFiles.Any())
                 return NotFound(new { error = "No training reports found" });
 
-            var latestReport = System.IO.File.ReadAllText(reportFiles[0]);
+            var latestReport = ReadReportText(reportFiles[0]);
             return Ok(System.Text.Json.JsonSerializer.Deserialize<object>(latestReport));
         }
         catch (Exception ex)
@@ -119,6 +120,18 @@ public class AgentsController : ControllerBase
             return StatusCode(500, new { error = ex.Message });
         }
     }
+
+    // Reports may be stored gzip-compressed (agent_trainer.py --compress gz)
+    private static string ReadReportText(string path)
+    {
+        if (!path.EndsWith(".gz", StringComparison.OrdinalIgnoreCase))
+            return System.IO.File.ReadAllText(path);
+
+        using var file = System.IO.File.OpenRead(path);
+        using var gzip = new System.IO.Compression.GZipStream(file, System.IO.Compression.CompressionMode.Decompress);
+        using var reader = new StreamReader(gzip);
+        return reader.ReadToEnd();
+    }
 }
 
 public class AskAgentRequest
@@ -0,0 +1,36 @@
+import json
+
+from fastapi.testclient import TestClient
+from main import app
+
+client = TestClient(app)
+
+batch = {
+    "sora_version": ["2.5", "2.5", "2.0", "2.0", "2.5"],
+    "final_grc": [6, 10, 8, 5, 3],
+    "residual_arc": [None, None, "ARC-a", "ARC-c", None],
+    "residual_arc_level": [4, 10, None, None, 11],
+}
+
+r = client.post("/api/v1/calculate/sail/batch", json=batch)
+print("Batch status=", r.status_code)
+try:
+    result = r.json()
+    for i in range(result["count"]):
+        print(f"Row {i + 1}:", {field: result[field][i] for field in
+                               ("sora_version", "sail_level", "oso_count", "category", "error")})
+except Exception as e:
+    print("Non-JSON response:", e)
+
+missions = [
+    {"id": "m-001", "sora_version": "2.0", "final_grc": 5, "residual_arc": "ARC-c"},
+    {"id": "m-002", "sora_version": "2.5", "final_grc": 9, "residual_arc_level": 5},
+    {"id": "m-003", "sora_version": "2.5", "final_grc": 4},
+]
+ndjson = "".join(json.dumps(m) + "\n" for m in missions)
+
+with client.stream("POST", "/api/v1/calculate/sail/stream", content=ndjson,
+                   headers={"Content-Type": "application/x-ndjson"}) as r:
+    print("Stream status=", r.status_code)
+    for line in r.iter_lines():
+        print(line)
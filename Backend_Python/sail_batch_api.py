@@ -0,0 +1,391 @@
+"""
+SAIL batch endpoint - columnar SAIL calculations resolved with dense lookup tables
+Purpose: fleet planning runs that evaluate tens of thousands of GRC/ARC combinations
+
+POST /api/v1/calculate/sail/batch
+    {
+      "sora_version": "2.5",                       (one value for every row, or one per row)
+      "final_grc": [3, 6, 9],
+      "residual_arc": ["ARC-a", null, null],       (SORA 2.0 rows: 'ARC-a', 'ARC_a', 'a', ...)
+      "residual_arc_level": [null, 4, 10]          (SORA 2.5 rows: numeric residual ARC 1..10)
+    }
+ -> {"count", "errors", "sora_version", "sail_level", "oso_count", "category", "reference", "error"}
+    every output is a column with one entry per input row; `error` is null or {status_code, detail}
+
+POST /api/v1/calculate/sail/stream          (Content-Type: application/x-ndjson)
+    {"sora_version": "2.0", "final_grc": 5, "residual_arc": "ARC-c", "id": "m-001"}
+    {"sora_version": "2.5", "final_grc": 9, "residual_arc_level": 5}
+ -> one result line per non-blank input line, same order, written as soon as its block is resolved:
+    {"line", "id", "sora_version", "sail_level", "oso_count", "category", "reference", "error"}
+    (`id` is echoed only when the input line has one)
+
+The lookup tables are built once, on first use, by running the authoritative
+`sail.api.sail_api.calculate_sail` for every (version, GRC, ARC) cell. A batch
+row therefore gets exactly the answer of a single /sail/calculate call,
+Category C and HTTP errors included, and the tables cannot drift from the
+calculators. Requests are parsed column by column (each distinct value once)
+and resolved with one NumPy fancy-indexing pass. Invalid rows get their own
+`error` entry instead of failing the whole batch. The stream endpoint reads
+the body chunk by chunk and resolves blocks of at most STREAM_BLOCK_ROWS
+lines, so memory stays bounded whatever the size of the mission set.
+
+Mounted by main.py: app.include_router(sail_batch_api.router)
+"""
+
+import asyncio
+import json
+import logging
+import re
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/calculate/sail", tags=["SAIL"])
+
+VERSIONS = ("2.0", "2.5")
+MAX_GRC = 10
+MAX_ARC_LEVEL = 10
+ARC_LETTERS = ("a", "b", "c", "d")
+MAX_BATCH_ROWS = 200_000
+OUTPUT_FIELDS = ("sail_level", "oso_count", "category", "reference")
+INPUT_FIELDS = ("sora_version", "final_grc", "residual_arc", "residual_arc_level")
+STREAM_BLOCK_ROWS = 1000
+MAX_LINE_BYTES = 64 * 1024
+
+# Row codes of the parsed columns (valid values are >= 1)
+MISSING = -2
+INVALID = -1
+
+# Per-row input errors (same wording as the /api/v1/calculate/sail proxy)
+ERROR_VERSION = {"status_code": 400, "detail": "Invalid sora_version. Must be '2.0' or '2.5'"}
+ERROR_GRC = {"status_code": 400, "detail": f"final_grc must be an integer in [1..{MAX_GRC}]"}
+ERROR_ARC_MISSING = {"status_code": 400, "detail": "residual_arc required (a/b/c/d)"}
+ERROR_ARC_INVALID = {"status_code": 400, "detail": "Invalid residual_arc. Use a/b/c/d."}
+ERROR_LEVEL_MISSING = {"status_code": 400, "detail": "SORA 2.5 requires residual_arc_level (1..10)"}
+ERROR_LEVEL_INVALID = {"status_code": 400, "detail": "residual_arc_level must be in [1..10]"}
+
+
+class SAILBatchRequest(BaseModel):
+    """Columnar SAIL batch request (row values are validated per row, not per request)"""
+    model_config = ConfigDict(extra="forbid")
+
+    sora_version: Union[str, List[Any]] = Field(..., description="'2.0' / '2.5' for all rows, or one per row")
+    final_grc: List[Any] = Field(..., description="Final GRC per row (1..10; SORA 2.0 > 7 is Category C)")
+    residual_arc: Optional[List[Any]] = Field(None, description="Residual ARC letter per row (SORA 2.0)")
+    residual_arc_level: Optional[List[Any]] = Field(None, description="Residual ARC 1..10 per row (SORA 2.5)")
+
+
+class SAILTables:
+    """Dense (version, GRC, ARC) tables; every output is an int16 code into a list of values"""
+
+    def __init__(self):
+        shape = (len(VERSIONS), MAX_GRC + 1, MAX_ARC_LEVEL + 1)
+        self.fields = OUTPUT_FIELDS + ("error",)
+        self.codes = {field: np.zeros(shape, dtype=np.int16) for field in self.fields}
+        self.values: Dict[str, List[Any]] = {field: [None] for field in self.fields}
+        self._known: Dict[str, Dict[Any, int]] = {field: {(type(None), None): 0} for field in self.fields}
+        # Input errors have fixed codes, so a batch can assign them without a lookup
+        self.input_errors = {name: self.code("error", error) for name, error in (
+            ("version", ERROR_VERSION), ("grc", ERROR_GRC),
+            ("arc_missing", ERROR_ARC_MISSING), ("arc_invalid", ERROR_ARC_INVALID),
+            ("level_missing", ERROR_LEVEL_MISSING), ("level_invalid", ERROR_LEVEL_INVALID))}
+
+    def code(self, field: str, value: Any) -> int:
+        key = (type(value), repr(value) if isinstance(value, dict) else value)
+        known = self._known[field]
+        if key not in known:
+            known[key] = len(self.values[field])
+            self.values[field].append(value)
+        return known[key]
+
+    def set(self, version: int, grc: int, arc: int, **outputs: Any):
+        for field, value in outputs.items():
+            self.codes[field][version, grc, arc] = self.code(field, value)
+
+    def column(self, field: str, codes: np.ndarray) -> List[Any]:
+        return np.array(self.values[field] + [None], dtype=object)[codes].tolist()
+
+
+async def build_tables() -> SAILTables:
+    """Run the authoritative calculate_sail once per cell"""
+    from sail.api.sail_api import SAILCalculationAPIRequest, calculate_sail
+    from sail.models.sail_models import ARCLevel, SORAVersion
+
+    tables = SAILTables()
+    for version_index, version in enumerate(VERSIONS):
+        for grc in range(1, MAX_GRC + 1):
+            arcs = len(ARC_LETTERS) if version == "2.0" else MAX_ARC_LEVEL
+            for arc in range(1, arcs + 1):
+                try:
+                    if version == "2.0":
+                        request = SAILCalculationAPIRequest(grc_level=grc, arc_level=ARCLevel(ARC_LETTERS[arc - 1]),
+                                                            sora_version=SORAVersion.SORA_2_0)
+                    else:
+                        request = SAILCalculationAPIRequest(grc_level=grc, residual_arc_level=arc,
+                                                            sora_version=SORAVersion.SORA_2_5)
+                    response = await calculate_sail(request)
+                except HTTPException as e:
+                    tables.set(version_index, grc, arc, error={"status_code": e.status_code, "detail": e.detail})
+                except ValueError as e:
+                    tables.set(version_index, grc, arc, error={"status_code": 400, "detail": str(e)})
+                else:
+                    tables.set(version_index, grc, arc,
+                               **{field: getattr(response, field, None) for field in OUTPUT_FIELDS})
+    logger.info("SAIL batch tables built: %d SORA 2.0 + %d SORA 2.5 cells",
+                MAX_GRC * len(ARC_LETTERS), MAX_GRC * MAX_ARC_LEVEL)
+    return tables
+
+
+_tables: Optional[SAILTables] = None
+_tables_lock = asyncio.Lock()
+
+
+async def get_tables() -> SAILTables:
+    global _tables
+    if _tables is None:
+        async with _tables_lock:
+            if _tables is None:
+                try:
+                    _tables = await build_tables()
+                except ImportError as e:
+                    logger.error(f"SAIL batch tables unavailable: {e}")
+                    raise HTTPException(status_code=501, detail=f"SAIL calculation modules are not available: {e}")
+    return _tables
+
+
+# --- Column parsing: every distinct value is parsed once ---
+def _version_code(value: Any) -> int:
+    text = str(getattr(value, "value", value)).replace("_", ".").replace(" ", "")
+    match = re.search(r"(\d+\.\d+)", text)
+    version = match.group(1) if match else None
+    return VERSIONS.index(version) if version in VERSIONS else INVALID
+
+
+def _int_code(value: Any, maximum: int) -> int:
+    if value is None:
+        return MISSING
+    if isinstance(value, bool):
+        return INVALID
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, str) and value.strip().isdigit():
+        value = int(value.strip())
+    return value if isinstance(value, int) and 1 <= value <= maximum else INVALID
+
+
+def _grc_code(value: Any) -> int:
+    code = _int_code(value, MAX_GRC)
+    return INVALID if code == MISSING else code
+
+
+def _level_code(value: Any) -> int:
+    return _int_code(value, MAX_ARC_LEVEL)
+
+
+def _letter_code(value: Any) -> int:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return MISSING
+    if not isinstance(value, str):
+        return INVALID
+    token = value.strip().lower()
+    for prefix in ("arc-", "arc_"):
+        if token.startswith(prefix):
+            token = token[len(prefix):]
+    return ARC_LETTERS.index(token) + 1 if token in ARC_LETTERS else INVALID
+
+
+def encode_column(values: Sequence[Any], parse: Callable[[Any], int]) -> np.ndarray:
+    """int16 codes of a column; unhashable values (lists, objects) are parsed row by row"""
+    memo: Dict[Tuple[type, Any], int] = {}
+
+    def code(value: Any) -> int:
+        # Keyed by type too: True == 1 and 1.0 == 1 hash alike but do not parse alike
+        key = (type(value), value)
+        try:
+            return memo[key]
+        except KeyError:
+            memo[key] = parse(value)
+            return memo[key]
+        except TypeError:
+            return parse(value)
+
+    return np.fromiter((code(value) for value in values), dtype=np.int16, count=len(values))
+
+
+def resolve_batch(tables: SAILTables, versions: np.ndarray, grcs: np.ndarray,
+                  letters: np.ndarray, levels: np.ndarray) -> Dict[str, Any]:
+    """Look every row up in one pass; rows with invalid inputs get their input error"""
+    is_20 = versions == 0
+    arcs = np.where(is_20, letters, levels)
+    valid = (versions >= 0) & (grcs > 0) & (arcs > 0)
+
+    # Invalid rows index a harmless cell; their outputs are masked below
+    cell = (np.where(valid, versions, 0), np.where(valid, grcs, 1), np.where(valid, arcs, 1))
+    outputs = {field: np.where(valid, tables.codes[field][cell], 0) for field in OUTPUT_FIELDS}
+    errors = tables.input_errors
+    outputs["error"] = np.select(
+        [versions < 0, grcs <= 0,
+         is_20 & (letters == MISSING), is_20 & (letters == INVALID),
+         ~is_20 & (levels == MISSING), ~is_20 & (levels == INVALID)],
+        [errors["version"], errors["grc"], errors["arc_missing"], errors["arc_invalid"],
+         errors["level_missing"], errors["level_invalid"]],
+        default=tables.codes["error"][cell]
+    )
+
+    version_names = np.array([None, *VERSIONS], dtype=object)
+    result: Dict[str, Any] = {
+        "count": int(versions.size),
+        "errors": int(np.count_nonzero(outputs["error"])),
+        "sora_version": version_names[np.maximum(versions, -1) + 1].tolist()
+    }
+    for field in tables.fields:
+        result[field] = tables.column(field, outputs[field])
+    return result
+
+
+def encode_request(request: SAILBatchRequest) -> Dict[str, np.ndarray]:
+    """Row codes of a batch request; 422 if the columns differ in length"""
+    n = len(request.final_grc)
+    columns = {"final_grc": request.final_grc, "residual_arc": request.residual_arc,
+               "residual_arc_level": request.residual_arc_level}
+    if isinstance(request.sora_version, list):
+        columns["sora_version"] = request.sora_version
+    lengths = {name: len(values) for name, values in columns.items() if values is not None}
+    if len(set(lengths.values())) > 1:
+        raise HTTPException(status_code=422, detail=f"Columns must have the same length, got {lengths}")
+    if n > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_ROWS} rows per batch, got {n}")
+
+    if isinstance(request.sora_version, list):
+        versions = encode_column(request.sora_version, _version_code)
+    else:
+        versions = np.full(n, _version_code(request.sora_version), dtype=np.int16)
+    missing = np.full(n, MISSING, dtype=np.int16)
+    return {
+        "versions": versions,
+        "grcs": encode_column(request.final_grc, _grc_code),
+        "letters": encode_column(request.residual_arc, _letter_code) if request.residual_arc is not None else missing,
+        "levels": (encode_column(request.residual_arc_level, _level_code)
+                   if request.residual_arc_level is not None else missing)
+    }
+
+
+@router.post("/batch")
+async def calculate_sail_batch(request: SAILBatchRequest) -> Dict[str, Any]:
+    """
+    Calculate SAIL for a columnar batch of SORA 2.0 / 2.5 inputs.
+    Official Reference: EASA AMC/GM SORA 2.0 Annex D (Table D.1), JARUS SORA 2.5 Annex D (Table 7)
+    """
+    tables = await get_tables()
+
+    def run() -> Dict[str, Any]:
+        return resolve_batch(tables, **encode_request(request))
+
+    # Large batches are CPU work: keep the event loop free
+    result = await run_in_threadpool(run)
+    logger.info(f"SAIL batch: {result['count']} rows, {result['errors']} row errors")
+    return result
+
+
+# --- NDJSON streaming ---
+async def iter_line_blocks(request: Request) -> AsyncIterator[List[Tuple[int, Optional[bytes]]]]:
+    """
+    (line number, line) blocks of the request body, read chunk by chunk.
+    Blank lines are skipped; a line over MAX_LINE_BYTES is dropped and yielded as None.
+    """
+    pending = b""
+    oversized = False
+    number = 0
+    block: List[Tuple[int, Optional[bytes]]] = []
+    async for chunk in request.stream():
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            number += 1
+            oversized = oversized or len(line) > MAX_LINE_BYTES
+            if oversized or line.strip():
+                block.append((number, None if oversized else line))
+            oversized = False
+            if len(block) >= STREAM_BLOCK_ROWS:
+                yield block
+                block = []
+        if len(pending) > MAX_LINE_BYTES:
+            pending = b""
+            oversized = True
+        # Flush what this chunk completed, so a slow producer still gets results early
+        if block:
+            yield block
+            block = []
+    if oversized or pending.strip():
+        yield [(number + 1, None if oversized else pending)]
+
+
+def resolve_lines(tables: SAILTables, block: List[Tuple[int, Optional[bytes]]]) -> bytes:
+    """NDJSON results of one block of input lines, in input order"""
+    rows: List[Dict[str, Any]] = []
+    line_errors: Dict[int, Dict[str, Any]] = {}
+    for i, (_, line) in enumerate(block):
+        row: Any = {}
+        if line is None:
+            line_errors[i] = {"status_code": 413, "detail": f"Line longer than {MAX_LINE_BYTES} bytes"}
+        else:
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                line_errors[i] = {"status_code": 400, "detail": f"Invalid JSON: {e}"}
+            if not isinstance(row, dict):
+                line_errors.setdefault(i, {"status_code": 400, "detail": "Each line must be a JSON object"})
+                row = {}
+        rows.append(row)
+
+    columns = {field: [row.get(field) for row in rows] for field in INPUT_FIELDS}
+    result = resolve_batch(tables,
+                           versions=encode_column(columns["sora_version"], _version_code),
+                           grcs=encode_column(columns["final_grc"], _grc_code),
+                           letters=encode_column(columns["residual_arc"], _letter_code),
+                           levels=encode_column(columns["residual_arc_level"], _level_code))
+
+    out = []
+    for i, (number, _) in enumerate(block):
+        record: Dict[str, Any] = {"line": number}
+        if "id" in rows[i]:
+            record["id"] = rows[i]["id"]
+        record.update((field, result[field][i]) for field in ("sora_version",) + OUTPUT_FIELDS)
+        record["error"] = line_errors.get(i, result["error"][i])
+        out.append(json.dumps(record, ensure_ascii=False))
+    return ("\n".join(out) + "\n").encode("utf-8")
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator reads the request body itself.
+    The base class listens for disconnects on `receive` in parallel (ASGI < 2.4),
+    which would swallow the body messages; Request.stream() already raises
+    ClientDisconnect, so `receive` is left to it.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@router.post("/stream")
+async def calculate_sail_stream(request: Request) -> NDJSONStreamingResponse:
+    """
+    Calculate SAIL for an NDJSON body of single-calculation requests, streaming NDJSON results.
+    Official Reference: EASA AMC/GM SORA 2.0 Annex D (Table D.1), JARUS SORA 2.5 Annex D (Table 7)
+    """
+    tables = await get_tables()
+
+    async def results() -> AsyncIterator[bytes]:
+        async for block in iter_line_blocks(request):
+            yield resolve_lines(tables, block)
+
+    return NDJSONStreamingResponse(results())
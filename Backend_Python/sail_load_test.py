@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+SAIL API load test - throughput and latency percentiles of /api/v1/calculate/sail
+
+Drives the `main.app` FastAPI app with a closed loop of --concurrency clients
+and a deterministic request mix:
+
+- 2.0      valid SORA 2.0 inputs (final_grc 1..8, residual_arc in every accepted spelling)
+- 2.5      valid SORA 2.5 inputs (final_grc 1..10, numeric residual_arc_level 1..10)
+- invalid  bad sora_version, missing / unknown ARC, out-of-range ARC level
+
+Targets:
+- in-process (default)  httpx ASGITransport; no sockets, measures the app itself
+- --uvicorn             a local uvicorn server started in a background thread
+- --url URL             an already running server
+
+Reports throughput and p50/p95/p99 latency (overall and per request kind),
+status codes, and "unexpected" answers (valid input not answered 200, invalid
+input answered 200, any 5xx). Results go to a JSON file; with --baseline the
+run is compared and exits 1 when throughput drops or p95/p99 grow beyond
+the threshold. With --repeat N the load runs N times and the run with the
+best throughput is kept; a percentile is only compared when both runs have
+enough samples for it (MIN_TAIL_SAMPLES beyond it), so small per-kind
+groups do not flag noise.
+
+Usage:
+    python sail_load_test.py --requests 5000 --concurrency 32
+    python sail_load_test.py --uvicorn --duration 30 --mix 2.0=40,2.5=40,invalid=20
+    python sail_load_test.py --baseline load_results/sail_load_20250101_120000.json
+"""
+
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+LOAD_VERSION = 1
+ENDPOINT = "/api/v1/calculate/sail"
+KINDS = ("2.0", "2.5", "invalid")
+DEFAULT_MIX = "2.0=45,2.5=45,invalid=10"
+# pXX is compared only with at least this many samples above it (p95: 200 requests, p99: 1000)
+MIN_TAIL_SAMPLES = 10
+
+# Accepted residual_arc spellings: {0} is the lower-case letter, {1} the upper-case one
+_ARC_SPELLINGS = ("ARC-{0}", "ARC_{0}", "{0}", "arc-{0}", "{1}")
+_INVALID_CASES = (
+    lambda rng: {"sora_version": rng.choice(["1.0", "3.0", "2.x"]), "final_grc": rng.randint(1, 7),
+                 "residual_arc": "ARC-a"},
+    lambda rng: {"sora_version": "2.0", "final_grc": rng.randint(1, 7)},
+    lambda rng: {"sora_version": "2.0", "final_grc": rng.randint(1, 7), "residual_arc": rng.choice(["e", "ARC-z"])},
+    lambda rng: {"sora_version": "2.5", "final_grc": rng.randint(1, 10)},
+    lambda rng: {"sora_version": "2.5", "final_grc": rng.randint(1, 10), "residual_arc_level": rng.choice([0, 11])},
+)
+
+
+# --- Request mix ---
+def parse_mix(text: str) -> Dict[str, float]:
+    """'2.0=45,2.5=45,invalid=10' -> normalised weights"""
+    weights = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in KINDS:
+            raise ValueError(f"unknown request kind '{kind}' (use {', '.join(KINDS)})")
+        weights[kind] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("mix weights must add up to more than 0")
+    return {kind: weight / total for kind, weight in weights.items() if weight > 0}
+
+
+def make_payload(kind: str, rng: random.Random) -> Dict[str, Any]:
+    if kind == "2.0":
+        letter = rng.choice("abcd")
+        arc = rng.choice(_ARC_SPELLINGS).format(letter, letter.upper())
+        return {"sora_version": "2.0", "final_grc": rng.randint(1, 8), "residual_arc": arc}
+    if kind == "2.5":
+        return {"sora_version": "2.5", "final_grc": rng.randint(1, 10), "residual_arc_level": rng.randint(1, 10)}
+    return rng.choice(_INVALID_CASES)(rng)
+
+
+def request_stream(mix: Dict[str, float], seed: int):
+    """Endless deterministic (kind, payload) sequence"""
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    while True:
+        kind = rng.choices(kinds, weights)[0]
+        yield kind, make_payload(kind, rng)
+
+
+# --- Statistics ---
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+
+
+def summarize(samples: List[Tuple[str, int, float, bool]], seconds: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles (ms) and status counts of (kind, status, latency, expected) samples"""
+    latencies = sorted(latency * 1000 for _, _, latency, _ in samples)
+    statuses: Dict[str, int] = {}
+    for _, status, _, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(samples),
+        "seconds": round(seconds, 3),
+        "requests_per_sec": round(len(samples) / seconds, 1) if seconds > 0 else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "status": dict(sorted(statuses.items())),
+        "unexpected": sum(1 for *_, expected in samples if not expected)
+    }
+
+
+def expected_status(kind: str, status: int) -> bool:
+    if status >= 500 or status == 0:
+        return False
+    return status == 200 if kind != "invalid" else 400 <= status < 500
+
+
+# --- Load loop ---
+async def run_load(client, requests: Optional[int], duration: Optional[float], concurrency: int,
+                   warmup: int, mix: Dict[str, float], seed: int) -> Dict[str, Any]:
+    """Closed loop: every client sends its next request as soon as the previous one is answered"""
+    stream = request_stream(mix, seed)
+
+    async def send(kind: str, payload: Dict[str, Any]) -> Tuple[str, int, float, bool]:
+        start = time.perf_counter()
+        try:
+            status = (await client.post(ENDPOINT, json=payload)).status_code
+        except Exception:
+            status = 0   # transport error
+        latency = time.perf_counter() - start
+        return kind, status, latency, expected_status(kind, status)
+
+    # Warm-up: first-call imports, lazy tables, connection pools
+    for _ in range(warmup):
+        await send(*next(stream))
+
+    samples: List[Tuple[str, int, float, bool]] = []
+    deadline = time.perf_counter() + duration if duration else None
+    remaining = [requests if requests is not None else -1]
+
+    async def worker():
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            if remaining[0] == 0:
+                return
+            remaining[0] -= 1
+            samples.append(await send(*next(stream)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    result = {"overall": summarize(samples, seconds), "by_kind": {}}
+    for kind in KINDS:
+        subset = [sample for sample in samples if sample[0] == kind]
+        if subset:
+            result["by_kind"][kind] = summarize(subset, seconds)
+    return result
+
+
+def start_uvicorn(app, host: str, port: int):
+    """uvicorn.Server in a daemon thread; returns (server, base_url) once it accepts connections"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"uvicorn failed to start on {host}:{port}")
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1] if port == 0 else port
+    return server, f"http://{host}:{port}"
+
+
+async def load(args, mix: Dict[str, float]) -> Tuple[Dict[str, Any], str]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    server = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout)
+        target = args.url
+    else:
+        from main import app
+        if args.uvicorn:
+            server, base_url = start_uvicorn(app, args.host, args.port)
+            client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout)
+            target = f"uvicorn {base_url}"
+        else:
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://sail",
+                                       timeout=args.timeout)
+            target = "in-process (ASGI)"
+    runs = []
+    try:
+        async with client:
+            for _ in range(args.repeat):
+                runs.append(await run_load(client, args.requests, args.duration, args.concurrency,
+                                           args.warmup, mix, args.seed))
+    finally:
+        if server is not None:
+            server.should_exit = True
+    best = max(runs, key=lambda run: run["overall"]["requests_per_sec"])
+    if len(runs) > 1:
+        best["runs"] = [run["overall"]["requests_per_sec"] for run in runs]
+    return best, target
+
+
+# --- Baseline comparison ---
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Ratios per result group; `regression` marks throughput drops and p95/p99 growth beyond the threshold"""
+    rows = []
+    groups = [("overall", current["results"]["overall"], baseline.get("results", {}).get("overall"))]
+    for kind, metrics in current["results"]["by_kind"].items():
+        groups.append((kind, metrics, baseline.get("results", {}).get("by_kind", {}).get(kind)))
+    for group, metrics, base in groups:
+        if not base:
+            continue
+        row = {"group": group, "regression": []}
+        if base["requests_per_sec"] > 0:
+            row["throughput_ratio"] = round(metrics["requests_per_sec"] / base["requests_per_sec"], 3)
+            if row["throughput_ratio"] < 1 - threshold:
+                row["regression"].append("throughput")
+        for key, q in (("p95_ms", 95), ("p99_ms", 99)):
+            needed = MIN_TAIL_SAMPLES * 100 / (100 - q)
+            if base[key] > 0 and min(metrics["requests"], base["requests"]) >= needed:
+                ratio = round(metrics[key] / base[key], 3)
+                row[key.replace("_ms", "_ratio")] = ratio
+                if ratio > 1 + threshold:
+                    row["regression"].append(key.replace("_ms", ""))
+        rows.append(row)
+    return rows
+
+
+def print_results(results: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None):
+    ratios = {row["group"]: row for row in comparison or []}
+    print(f"\n{'group':<10}{'requests':>10}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'max ms':>9}{'unexp.':>8}  vs baseline")
+    groups = [("overall", results["overall"])] + list(results["by_kind"].items())
+    for group, m in groups:
+        row = ratios.get(group)
+        versus = ""
+        if row is not None:
+            versus = (("✗ " if row["regression"] else "✓ ")
+                      + f"req/s x{row.get('throughput_ratio', '-')}, p95 x{row.get('p95_ratio', '-')}, "
+                      + f"p99 x{row.get('p99_ratio', '-')}")
+        print(f"{group:<10}{m['requests']:>10,}{m['requests_per_sec']:>10,.0f}{m['p50_ms']:>9.2f}"
+              f"{m['p95_ms']:>9.2f}{m['p99_ms']:>9.2f}{m['max_ms']:>9.2f}{m['unexpected']:>8}  {versus}")
+    print(f"Status codes: {', '.join(f'{code}×{n}' for code, n in results['overall']['status'].items())}")
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    script_dir = Path(__file__).resolve().parent
+
+    parser = argparse.ArgumentParser(description="Load-test /api/v1/calculate/sail and report latency percentiles")
+    parser.add_argument("--requests", type=int, default=2000,
+                       help="Measured requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=None,
+                       help="Run for this many seconds instead of a fixed request count")
+    parser.add_argument("--concurrency", type=int, default=16,
+                       help="Concurrent clients (closed loop)")
+    parser.add_argument("--warmup", type=int, default=50,
+                       help="Unmeasured requests sent first")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                       help="Request mix weights, e.g. 2.0=45,2.5=45,invalid=10")
+    parser.add_argument("--repeat", type=int, default=1,
+                       help="Runs; the one with the best throughput is kept")
+    parser.add_argument("--seed", type=int, default=2025,
+                       help="Request sequence seed")
+    parser.add_argument("--uvicorn", action="store_true",
+                       help="Serve main.app with a local uvicorn instead of the in-process ASGI transport")
+    parser.add_argument("--host", default="127.0.0.1",
+                       help="uvicorn host (--uvicorn)")
+    parser.add_argument("--port", type=int, default=0,
+                       help="uvicorn port (--uvicorn; 0 = any free port)")
+    parser.add_argument("--url", default=None,
+                       help="Load an already running server instead (e.g. http://127.0.0.1:8000)")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                       help="Per-request timeout in seconds")
+    parser.add_argument("--output",
+                       default=str(script_dir / "load_results"
+                                   / f"sail_load_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.json"),
+                       help="Results JSON")
+    parser.add_argument("--baseline", default=None,
+                       help="Previous results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                       help="Allowed throughput drop / p95 and p99 growth (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.duration is not None and args.duration <= 0:
+        parser.error("--duration must be positive")
+    if args.duration is not None:
+        args.requests = None
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        print("✗ httpx is required (pip install httpx)")
+        sys.exit(1)
+    sys.path.insert(0, str(script_dir))
+
+    print("━━━ SAIL API Load Test ━━━")
+    amount = f"{args.duration:g}s" if args.duration else f"{args.requests:,} requests"
+    print(f"{ENDPOINT} | {amount} | concurrency={args.concurrency} | "
+          f"mix: {', '.join(f'{kind} {weight:.0%}' for kind, weight in mix.items())}")
+
+    results, target = asyncio.run(load(args, mix))
+    print(f"Target: {target}")
+
+    report = {
+        "version": LOAD_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "target": "url" if args.url else "uvicorn" if args.uvicorn else "asgi",
+            "endpoint": ENDPOINT,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+            "mix": mix,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+    comparison = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        base_env = baseline.get("environment", {})
+        for key in ("target", "concurrency", "mix"):
+            if base_env.get(key) != report["environment"][key]:
+                print(f"⚠ Baseline was recorded with a different {key}; results are not comparable")
+        comparison = compare(report, baseline, args.threshold)
+        report["baseline"] = {"file": str(args.baseline), "threshold": args.threshold, "groups": comparison}
+
+    print_results(results, comparison)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output.with_suffix(output.suffix + ".tmp")
+    tmp_file.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    os.replace(tmp_file, output)
+    print(f"\n✓ Results: {output}")
+
+    if results["overall"]["unexpected"]:
+        print(f"⚠ {results['overall']['unexpected']} unexpected responses (5xx, transport errors or wrong status)")
+    regressions = [row for row in comparison or [] if row["regression"]]
+    if regressions:
+        for row in regressions:
+            print(f"✗ Regression: {row['group']} ({', '.join(row['regression'])})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
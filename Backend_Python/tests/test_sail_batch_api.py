@@ -0,0 +1,147 @@
+"""
+Tests for the SAIL batch and NDJSON stream endpoints (sail_batch_api.py)
+
+The lookup tables are filled by hand from authoritative cells (EASA Table D.1
+for SORA 2.0, Annex D Table 7 examples for SORA 2.5), so the endpoints are
+exercised without the sail calculators.
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import sail_batch_api
+
+SAIL_20 = {
+    1: ("I", "II", "IV", "VI"), 2: ("I", "II", "IV", "VI"), 3: ("II", "II", "IV", "VI"),
+    4: ("III", "III", "IV", "VI"), 5: ("IV", "IV", "IV", "VI"), 6: ("V", "V", "V", "VI"),
+    7: ("VI", "VI", "VI", "VI"),
+}
+SAIL_25 = {(1, 1): "I", (9, 5): "VI", (10, 1): "VI"}
+OSO = {"I": 6, "II": 10, "III": 15, "IV": 18, "V": 21, "VI": 24}
+
+
+def authoritative_tables() -> sail_batch_api.SAILTables:
+    tables = sail_batch_api.SAILTables()
+    for grc in range(1, 11):
+        for arc in range(1, 5):
+            if grc > 7:
+                tables.set(0, grc, arc, category="C", reference="Category C")
+            else:
+                sail = SAIL_20[grc][arc - 1]
+                tables.set(0, grc, arc, sail_level=sail, oso_count=OSO[sail], reference="Table D.1")
+    for (grc, level), sail in SAIL_25.items():
+        tables.set(1, grc, level, sail_level=sail, oso_count=OSO[sail], reference="Table 7")
+    return tables
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(sail_batch_api, "_tables", authoritative_tables())
+    app = FastAPI()
+    app.include_router(sail_batch_api.router)
+    return TestClient(app)
+
+
+class TestBatchEndpoint:
+    def test_sora_20_and_25_rows(self, client):
+        r = client.post("/api/v1/calculate/sail/batch", json={
+            "sora_version": ["2.0", "2.0", "2.5", "2.5"],
+            "final_grc": [5, 8, 9, 1],
+            "residual_arc": ["ARC-c", "a", None, None],
+            "residual_arc_level": [None, None, 5, 1],
+        })
+        assert r.status_code == 200
+        body = r.json()
+        assert body["count"] == 4 and body["errors"] == 0
+        assert body["sail_level"] == ["IV", None, "VI", "I"]
+        assert body["category"] == [None, "C", None, None]
+        assert body["oso_count"] == [18, None, 24, 6]
+
+    def test_arc_spellings(self, client):
+        r = client.post("/api/v1/calculate/sail/batch", json={
+            "sora_version": "2.0", "final_grc": [3] * 5,
+            "residual_arc": ["ARC-a", "ARC_b", "c", "arc-d", "A"],
+        })
+        assert r.json()["sail_level"] == ["II", "II", "IV", "VI", "II"]
+
+    def test_row_errors_do_not_fail_batch(self, client):
+        r = client.post("/api/v1/calculate/sail/batch", json={
+            "sora_version": ["3.0", "2.0", "2.0", "2.5", "2.5", "2.0"],
+            "final_grc": [3, 0, 3, 3, 3, 2],
+            "residual_arc": ["a", "a", "x", None, None, "b"],
+            "residual_arc_level": [None, None, None, None, 11, None],
+        })
+        assert r.status_code == 200
+        body = r.json()
+        details = [e and e["detail"] for e in body["error"]]
+        assert details == [
+            sail_batch_api.ERROR_VERSION["detail"],
+            sail_batch_api.ERROR_GRC["detail"],
+            sail_batch_api.ERROR_ARC_INVALID["detail"],
+            sail_batch_api.ERROR_LEVEL_MISSING["detail"],
+            sail_batch_api.ERROR_LEVEL_INVALID["detail"],
+            None,
+        ]
+        assert body["errors"] == 5
+        assert body["sail_level"][5] == "II"
+
+    @pytest.mark.parametrize("grcs", [[True, 1], [1, True]])
+    def test_bool_is_not_an_integer_grc(self, client, grcs):
+        # True == 1 hashes alike: a row's answer must not depend on earlier rows
+        r = client.post("/api/v1/calculate/sail/batch", json={
+            "sora_version": "2.0", "final_grc": grcs, "residual_arc": ["b", "b"],
+        })
+        body = r.json()
+        for grc, sail, error in zip(grcs, body["sail_level"], body["error"]):
+            if grc is True:
+                assert sail is None and error["detail"] == sail_batch_api.ERROR_GRC["detail"]
+            else:
+                assert sail == "II" and error is None
+
+    def test_bool_is_not_an_arc_level(self, client):
+        r = client.post("/api/v1/calculate/sail/batch", json={
+            "sora_version": "2.5", "final_grc": [1, 1], "residual_arc_level": [1, True],
+        })
+        body = r.json()
+        assert body["sail_level"] == ["I", None]
+        assert body["error"][1]["detail"] == sail_batch_api.ERROR_LEVEL_INVALID["detail"]
+
+    def test_column_length_mismatch(self, client):
+        r = client.post("/api/v1/calculate/sail/batch", json={
+            "sora_version": "2.5", "final_grc": [1, 2], "residual_arc_level": [1],
+        })
+        assert r.status_code == 422
+
+
+class TestStreamEndpoint:
+    def test_order_and_line_errors(self, client):
+        lines = [
+            json.dumps({"id": "m-1", "sora_version": "2.0", "final_grc": 5, "residual_arc": "ARC-c"}),
+            "",
+            "{not json",
+            "[1, 2]",
+            json.dumps({"sora_version": "2.5", "final_grc": 10, "residual_arc_level": 1}),
+            json.dumps({"sora_version": "2.0", "final_grc": True, "residual_arc": "a"}),
+        ]
+        r = client.post("/api/v1/calculate/sail/stream", content="\n".join(lines) + "\n",
+                        headers={"Content-Type": "application/x-ndjson"})
+        assert r.status_code == 200
+        results = [json.loads(line) for line in r.text.splitlines()]
+        assert [res["line"] for res in results] == [1, 3, 4, 5, 6]
+        assert results[0]["id"] == "m-1" and results[0]["sail_level"] == "IV"
+        assert results[1]["error"]["detail"].startswith("Invalid JSON")
+        assert results[2]["error"]["detail"] == "Each line must be a JSON object"
+        assert results[3]["sail_level"] == "VI" and results[3]["error"] is None
+        assert results[4]["error"]["detail"] == sail_batch_api.ERROR_GRC["detail"]
+
+    def test_oversized_line(self, client, monkeypatch):
+        monkeypatch.setattr(sail_batch_api, "MAX_LINE_BYTES", 64)
+        body = json.dumps({"pad": "x" * 200}) + "\n" + json.dumps(
+            {"sora_version": "2.5", "final_grc": 1, "residual_arc_level": 1})
+        results = [json.loads(line) for line in
+                   client.post("/api/v1/calculate/sail/stream", content=body).text.splitlines()]
+        assert results[0]["error"]["status_code"] == 413
+        assert results[1]["sail_level"] == "I"
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5 — Skyworks V5: Batch questions for the AI agents
+
+Runs a regression set of questions (JSONL) against the agents through
+AgentLLMService with asyncio:
+
+- at most `concurrency` questions in flight
+- a token bucket limiting request starts (`rate` per second, `burst` tokens)
+- exponential backoff with jitter on 429 / 5xx (honours Retry-After)
+
+Results are emitted as NDJSON in completion order, each with its latency and
+attempt count.
+
+Input lines: {"id": ..., "agent_name": ..., "question": ...}; `id` and
+`agent_name` are optional (without an agent the question goes to every agent).
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from agent_registry import agent_names
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0,
+                  retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff; a server Retry-After wins when longer"""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+def load_questions(path: Path, agent_name: Optional[str] = None,
+                   agents: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Read a JSONL question set; items without an agent fan out to every registered agent
+
+    Raises ValueError naming the file and line of a malformed record.
+    """
+    agents = agents or agent_names()
+    items = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON ({e.msg})") from None
+            if isinstance(record, str):
+                record = {"question": record}
+            question = record.get("question") if isinstance(record, dict) else None
+            if not isinstance(question, str) or not question.strip():
+                raise ValueError(f"{path}:{line_no}: expected a string or an object with a \"question\"")
+            agent = record.get("agent_name") or record.get("agent") or agent_name
+            for agent in ([agent] if agent else agents):
+                items.append({
+                    "index": len(items),
+                    "id": record.get("id", line_no),
+                    "agent_name": agent,
+                    "question": question
+                })
+    return items
+
+
+async def ask_many(service, items: Iterable[Dict[str, Any]], concurrency: int = 4,
+                   rate: float = 0.0, burst: Optional[float] = None, max_retries: int = 5,
+                   backoff_base: float = 1.0, backoff_cap: float = 30.0) -> AsyncIterator[Dict[str, Any]]:
+    """Ask every item ({agent_name, question, ...}); yield results as they complete.
+
+    `service` is an AgentLLMService (its blocking `ask_agent` runs on a
+    thread pool sized to `concurrency`). `rate` <= 0 disables rate limiting.
+    """
+    loop = asyncio.get_running_loop()
+    bucket = TokenBucket(rate, burst)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            async with semaphore:
+                await bucket.acquire()
+                result = await loop.run_in_executor(pool, service.ask_agent, item["agent_name"], item["question"])
+            status = result.get("status_code")
+            if result.get("success") or status not in RETRY_STATUS or attempt >= max_retries:
+                break
+            # Back off without holding a slot, so other items keep the pool busy
+            await asyncio.sleep(backoff_delay(attempt, backoff_base, backoff_cap, result.get("retry_after")))
+            attempt += 1
+        return dict(result,
+                    index=item.get("index"),
+                    id=item.get("id"),
+                    agent_name=item["agent_name"],
+                    question=item["question"],
+                    attempts=attempt + 1,
+                    latency_ms=round((time.perf_counter() - started) * 1000, 1))
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix="agent-batch") as pool:
+        tasks = [asyncio.ensure_future(run(item)) for item in items]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def _run_batch(args, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from agent_llm import AgentLLMService
+
+    service = AgentLLMService(args.workspace)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    summary = {"questions": len(items), "succeeded": 0, "failed": 0, "retries": 0, "tokens_used": 0}
+    latencies = []
+    started = time.perf_counter()
+    try:
+        async for result in ask_many(service, items, args.concurrency, args.rate, args.burst, args.max_retries):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            summary["succeeded" if result.get("success") else "failed"] += 1
+            summary["retries"] += result["attempts"] - 1
+            summary["tokens_used"] += result.get("tokens_used", 0)
+            latencies.append(result["latency_ms"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    summary.update({
+        "seconds": round(elapsed, 2),
+        "questions_per_sec": round(len(items) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_latency_ms": latencies[len(latencies) // 2] if latencies else None,
+        "p95_latency_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+        "cache": service.answer_cache.stats()
+    })
+    return summary
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    # Workspace root is 3 levels up from this script
+    script_path = Path(__file__).resolve()
+    workspace_root = script_path.parent.parent.parent
+
+    parser = argparse.ArgumentParser(description="Ask the SKYWORKS AI agents a batch of questions")
+    parser.add_argument("questions", help="JSONL file: {\"id\", \"agent_name\", \"question\"} per line")
+    parser.add_argument("--agent", default=None,
+                       help="Agent for lines without agent_name (default: every agent)")
+    parser.add_argument("--output", default=None,
+                       help="Write NDJSON results here instead of stdout")
+    parser.add_argument("--concurrency", type=int, default=4,
+                       help="Questions in flight at once")
+    parser.add_argument("--rate", type=float, default=0.0,
+                       help="Max request starts per second (0 = unlimited)")
+    parser.add_argument("--burst", type=float, default=None,
+                       help="Token bucket size (default: max(rate, 1))")
+    parser.add_argument("--max-retries", type=int, default=5,
+                       help="Retries per question on 429/5xx")
+    parser.add_argument("--workspace", default=str(workspace_root),
+                       help="Workspace root (agent memory under Tools/TrainingCenter/agent_memory)")
+
+    args = parser.parse_args()
+    try:
+        items = load_questions(Path(args.questions), args.agent)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    summary = asyncio.run(_run_batch(args, items))
+
+    print("━" * 60, file=sys.stderr)
+    print(f"✓ {summary['succeeded']}/{summary['questions']} answered, {summary['failed']} failed, "
+          f"{summary['retries']} retries in {summary['seconds']}s "
+          f"({summary['questions_per_sec']} q/s, p50 {summary['p50_latency_ms']} ms, "
+          f"p95 {summary['p95_latency_ms']} ms)", file=sys.stderr)
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
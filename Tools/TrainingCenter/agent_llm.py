@@ -8,15 +8,52 @@ import json
 import os
 import sys
 import re
+import heapq
+import threading
+import time
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+from agent_snapshot import AgentSnapshot, load_snapshot, snapshot_path, source_signature
+from answer_cache import AnswerCache, cache_key
+from bm25_index import BM25Index
+from corpus_store import CorpusStore, INDEX_FILE
+from memory_store import AgentMemoryStore
+from prompt_packer import ContextPacker, estimate_message_tokens, estimate_tokens
+from telemetry import Telemetry
+from vector_index import RETRIEVERS, VectorIndex, fuse, index_signature, vector_paths
+
+# LLM spans shorter than this give no meaningful tokens/s
+MIN_RATE_SECONDS = 0.001
+
+
+def _random():
+    # Only the mock fault injection needs it; keeps `random` off the import path
+    import random
+    return random
+
+
+class MockAPIError(Exception):
+    """Simulated API failure in mock mode (AGENT_MOCK_FAULT_RATE)"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Mock API error {status_code}")
+        self.status_code = status_code
 
 
 class AgentLLMService:
     def __init__(self, workspace_root: str):
         self.workspace_root = Path(workspace_root)
         self.memory_dir = self.workspace_root / "Tools" / "TrainingCenter" / "agent_memory"
+        self._indexes: Dict[str, Any] = {}  # agent -> (mtime_ns, BM25Index)
+        self._snapshots: Dict[str, Any] = {}  # agent -> (mtime_ns, AgentSnapshot)
+        self._memories: Dict[str, Any] = {}  # agent -> (mtime_ns, memory dict)
+        self._vectors: Dict[str, Any] = {}  # agent -> ((meta mtime_ns, index signature), VectorIndex)
+        self._corpus_store: Any = (None, None)  # (mtime_ns, CorpusStore)
+        self._memory_fields: Optional[Dict[str, str]] = None  # agent -> AgentSpec.memory_field
+        self._cache_lock = threading.Lock()
         
         # Load Azure OpenAI config (with mock fallback)
         self.mock_mode = False
@@ -24,6 +61,34 @@ class AgentLLMService:
         self.deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o") if not self.mock_mode else "mock"
         self.max_tokens = int(os.getenv("AZURE_OPENAI_MAX_TOKENS", "4096"))
         self.temperature = float(os.getenv("AZURE_OPENAI_TEMPERATURE", "0.7"))
+        # Delay between simulated chunks when streaming in mock mode
+        self.mock_stream_delay = float(os.getenv("AGENT_MOCK_STREAM_DELAY", "0.02"))
+        # Token budget for retrieved passage text in the user prompt
+        self.context_packer = ContextPacker(
+            budget_tokens=int(os.getenv("AGENT_CONTEXT_TOKENS", "3000")),
+            max_passage_tokens=int(os.getenv("AGENT_PASSAGE_TOKENS", "400"))
+        )
+        # Passage ranking: bm25, vector (hashed features, needs numpy) or fusion of both
+        self.retriever = os.getenv("AGENT_RETRIEVER", "bm25").lower()
+        if self.retriever not in RETRIEVERS:
+            print(f"⚠ Unknown AGENT_RETRIEVER={self.retriever!r}, using bm25", file=sys.stderr)
+            self.retriever = "bm25"
+        # Fraction of mock calls failing with a 429/5xx (exercises batch retries offline)
+        self.mock_fault_rate = float(os.getenv("AGENT_MOCK_FAULT_RATE", "0"))
+        
+        # Service-wide request timings; AGENT_METRICS_FILE also exports them for Prometheus
+        self.telemetry = Telemetry()
+        self.metrics_file = os.getenv("AGENT_METRICS_FILE") or None
+        self.metrics_interval = float(os.getenv("AGENT_METRICS_INTERVAL", "15"))
+        self._metrics_written: Optional[float] = None
+        self._metrics_lock = threading.Lock()
+        
+        # Answer cache (AGENT_ANSWER_CACHE_SIZE=0 disables it)
+        self.answer_cache = AnswerCache(
+            self.memory_dir / "answer_cache",
+            max_entries=int(os.getenv("AGENT_ANSWER_CACHE_SIZE", "256")),
+            ttl_seconds=float(os.getenv("AGENT_ANSWER_CACHE_TTL", str(24 * 3600)))
+        )
         
     def _init_azure_client(self):
         """Initialize Azure OpenAI client from env vars, else enable mock mode."""
@@ -50,94 +115,424 @@ class AgentLLMService:
     
     def ask_agent(self, agent_name: str, question: str) -> Dict[str, Any]:
         """Ρωτά έναν agent με πλήρη reasoning και citations"""
+        started = time.perf_counter()
+        request = Telemetry()
         try:
             # Load agent memory
-            memory = self._load_agent_memory(agent_name)
+            with request.span("memory"):
+                memory = self._load_agent_memory(agent_name)
             if not memory:
+                request.count("errors")
                 return {
                     "success": False,
                     "error": f"Agent memory not found for {agent_name}"
                 }
             
             # Retrieve relevant context (RAG)
-            relevant_sources = self._retrieve_relevant_context(question, memory)
+            with request.span("retrieval"):
+                relevant_sources = self._retrieve_relevant_context(question, memory)
             
-            # Build prompts
-            system_prompt = self._build_system_prompt(agent_name, memory, relevant_sources)
-            user_prompt = self._build_user_prompt(question, relevant_sources)
+            # Same question, same sources, same memory version -> same answer
+            key = cache_key(agent_name, question, self._source_names(relevant_sources),
+                            memory.get("memory_version", 0))
+            result, status = self.answer_cache.get_or_compute(
+                key, lambda: self._generate_answer(agent_name, question, memory, relevant_sources, request)
+            )
+            result = dict(result)
+            if status != "miss":
+                result.update(question=question, tokens_used=0)
+            request.count(f"cache_{status}")
+            result["cache"] = dict(self.answer_cache.stats(), status=status)
+            result["timings"] = self._timings(request, started)
+            return result
             
-            if self.mock_mode:
-                # Generate a structured mock answer without calling Azure
-                answer = self._build_mock_answer(agent_name, question, memory, relevant_sources)
-                return {
-                    "success": True,
-                    "agent_name": agent_name,
-                    "question": question,
-                    "answer": answer,
-                    "sources": [s["source"] for s in relevant_sources],
-                    "tokens_used": 0,
-                    "model": "mock"
-                }
+        except Exception as e:
+            request.count("errors")
+            return self._error_result(e)
+        finally:
+            self._finish_request(request, started)
+    
+    def _timings(self, request: Telemetry, started: float) -> Dict[str, Any]:
+        """Latency breakdown of one request (ms) plus generation speed"""
+        timings = request.milliseconds(("memory", "retrieval", "prompt", "llm"))
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        llm_seconds = request.seconds("llm")
+        tokens = request.counters.get("completion_tokens", 0)
+        # The mock answers in microseconds: a rate would be meaningless
+        measurable = not self.mock_mode and llm_seconds >= MIN_RATE_SECONDS
+        timings["tokens_per_sec"] = round(tokens / llm_seconds, 1) if measurable and tokens else None
+        return timings
+    
+    def _finish_request(self, request: Telemetry, started: float):
+        """Fold one request into the service totals (and the metrics file, at most every interval)"""
+        request.record("request", time.perf_counter() - started)
+        request.count("requests")
+        self.telemetry.merge(request)
+        self.write_metrics()
+    
+    def write_metrics(self, force: bool = False):
+        if not self.metrics_file:
+            return
+        now = time.monotonic()
+        with self._metrics_lock:
+            if not force and self._metrics_written is not None and now - self._metrics_written < self.metrics_interval:
+                return
+            self._metrics_written = now
+        try:
+            self.telemetry.write_prometheus(self.metrics_file, "skyworks_agent_llm", {"model": self.deployment})
+        except OSError as e:
+            print(f"⚠ Could not write metrics to {self.metrics_file}: {e}", file=sys.stderr)
+    
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        """Failed result; keeps the HTTP status and Retry-After of API errors for callers that retry"""
+        result = {
+            "success": False,
+            "error": f"LLM call failed: {str(error)}"
+        }
+        status_code = getattr(error, "status_code", None)
+        if status_code is not None:
+            result["status_code"] = status_code
+            headers = getattr(getattr(error, "response", None), "headers", None) or {}
+            retry_after = headers.get("retry-after")
+            if retry_after:
+                try:
+                    result["retry_after"] = float(retry_after)
+                except ValueError:
+                    pass
+        return result
+    
+    def ask_many(self, items: List[Dict[str, Any]], **options):
+        """Async iterator over batch results in completion order (see agent_batch.ask_many)"""
+        from agent_batch import ask_many
+        return ask_many(self, items, **options)
+    
+    def ask_agent_stream(self, agent_name: str, question: str) -> Iterator[Dict[str, Any]]:
+        """Streaming ask_agent: yields `start`, `delta`... and a final `done` (or `error`) event.
+        
+        The final event carries sources, token usage, time-to-first-token and
+        total latency (ms). Cached answers are replayed as a single delta.
+        """
+        started = time.perf_counter()
+        request = Telemetry()
+        first_token = None
+        yield {"event": "start", "agent_name": agent_name, "question": question}
+        try:
+            with request.span("memory"):
+                memory = self._load_agent_memory(agent_name)
+            if not memory:
+                request.count("errors")
+                yield {"event": "error", "success": False,
+                       "error": f"Agent memory not found for {agent_name}"}
+                return
+            
+            with request.span("retrieval"):
+                relevant_sources = self._retrieve_relevant_context(question, memory)
+            sources = self._source_names(relevant_sources)
+            key = cache_key(agent_name, question, sources, memory.get("memory_version", 0))
+            
+            cached = self.answer_cache.lookup(key)
+            if cached is not None:
+                first_token = time.perf_counter()
+                yield {"event": "delta", "text": cached["answer"]}
+                model, tokens_used, status = cached["model"], 0, "hit"
+                prompt = cached.get("prompt")
             else:
-                # Call Azure OpenAI
-                response = self.client.chat.completions.create(
-                    model=self.deployment,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    top_p=0.95
-                )
-
-                answer = response.choices[0].message.content
-
-                return {
+                parts = []
+                with request.span("prompt"):
+                    messages, prompt = self._build_messages(agent_name, question, memory, relevant_sources)
+                tokens_used = 0
+                completion_tokens = None
+                with request.span("llm"):
+                    for text, usage in self._stream_answer(messages, agent_name, question, memory,
+                                                           relevant_sources):
+                        if usage is not None:
+                            tokens_used = usage["total_tokens"]
+                            prompt["actual_tokens"] = usage["prompt_tokens"]
+                            completion_tokens = usage.get("completion_tokens")
+                        if text:
+                            if first_token is None:
+                                first_token = time.perf_counter()
+                            parts.append(text)
+                            yield {"event": "delta", "text": text}
+                request.count("completion_tokens", completion_tokens or estimate_tokens("".join(parts)))
+                model, status = ("mock" if self.mock_mode else self.deployment), "miss"
+                self.answer_cache.put(key, {
                     "success": True,
                     "agent_name": agent_name,
                     "question": question,
-                    "answer": answer,
-                    "sources": [s["source"] for s in relevant_sources],
-                    "tokens_used": getattr(response.usage, 'total_tokens', 0),
-                    "model": self.deployment
-                }
+                    "answer": "".join(parts),
+                    "sources": sources,
+                    "tokens_used": tokens_used,
+                    "model": model,
+                    "prompt": prompt
+                })
             
+            request.count(f"cache_{status}")
+            finished = time.perf_counter()
+            yield {
+                "event": "done",
+                "success": True,
+                "agent_name": agent_name,
+                "question": question,
+                "sources": sources,
+                "tokens_used": tokens_used,
+                "model": model,
+                "prompt": prompt,
+                "ttft_ms": round((first_token - started) * 1000, 1) if first_token else None,
+                "latency_ms": round((finished - started) * 1000, 1),
+                "timings": self._timings(request, started),
+                "cache": dict(self.answer_cache.stats(), status=status)
+            }
         except Exception as e:
+            request.count("errors")
+            yield dict(self._error_result(e), event="error")
+        finally:
+            self._finish_request(request, started)
+    
+    def _stream_answer(self, messages: List[Dict[str, str]], agent_name: str, question: str, memory: Dict,
+                       relevant_sources: List[Dict]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Yield (text, usage) pieces; usage ({total_tokens, prompt_tokens}) only on the usage chunk"""
+        if self.mock_mode:
+            # Simulated streaming: the mock answer in small word groups
+            answer = self._build_mock_answer(agent_name, question, memory, relevant_sources)
+            words = re.findall(r"\S+\s*", answer)
+            for i in range(0, len(words), 4):
+                if self.mock_stream_delay > 0:
+                    time.sleep(self.mock_stream_delay)
+                yield "".join(words[i:i + 4]), None
+            yield "", {"total_tokens": 0, "prompt_tokens": None, "completion_tokens": None}
+            return
+        
+        response = self.client.chat.completions.create(
+            model=self.deployment,
+            messages=messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            top_p=0.95,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content, None
+            usage = getattr(chunk, "usage", None)
+            if usage is not None:
+                yield "", {"total_tokens": getattr(usage, "total_tokens", 0),
+                           "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                           "completion_tokens": getattr(usage, "completion_tokens", None)}
+    
+    def _generate_answer(self, agent_name: str, question: str, memory: Dict,
+                         relevant_sources: List[Dict], telemetry: Optional[Telemetry] = None) -> Dict[str, Any]:
+        """Build prompts and get the answer from Azure OpenAI (or the mock)"""
+        telemetry = telemetry or Telemetry()
+        with telemetry.span("prompt"):
+            messages, prompt = self._build_messages(agent_name, question, memory, relevant_sources)
+        
+        if self.mock_mode:
+            with telemetry.span("llm"):
+                if self.mock_fault_rate and _random().random() < self.mock_fault_rate:
+                    raise MockAPIError(_random().choice((429, 500, 503)))
+                # Generate a structured mock answer without calling Azure
+                answer = self._build_mock_answer(agent_name, question, memory, relevant_sources)
+            telemetry.count("completion_tokens", estimate_tokens(answer))
             return {
-                "success": False,
-                "error": f"LLM call failed: {str(e)}"
+                "success": True,
+                "agent_name": agent_name,
+                "question": question,
+                "answer": answer,
+                "sources": self._source_names(relevant_sources),
+                "tokens_used": 0,
+                "model": "mock",
+                "prompt": prompt
             }
+        
+        # Call Azure OpenAI
+        with telemetry.span("llm"):
+            response = self.client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                top_p=0.95
+            )
+        telemetry.count("completion_tokens", getattr(response.usage, 'completion_tokens', 0) or 0)
+        
+        return {
+            "success": True,
+            "agent_name": agent_name,
+            "question": question,
+            "answer": response.choices[0].message.content,
+            "sources": self._source_names(relevant_sources),
+            "tokens_used": getattr(response.usage, 'total_tokens', 0),
+            "model": self.deployment,
+            "prompt": dict(prompt, actual_tokens=getattr(response.usage, 'prompt_tokens', None))
+        }
+    
+    def _build_messages(self, agent_name: str, question: str, memory: Dict,
+                        relevant_sources: List[Dict]) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Chat messages plus prompt stats (estimated tokens, packed context)"""
+        excerpts, context = self.context_packer.pack(question, relevant_sources, self._load_corpus_store())
+        messages = [
+            {"role": "system", "content": self._build_system_prompt(agent_name, memory, relevant_sources)},
+            {"role": "user", "content": self._build_user_prompt(question, relevant_sources, excerpts)}
+        ]
+        prompt = {
+            "estimated_tokens": estimate_message_tokens(messages),
+            "actual_tokens": None,
+            "context": context
+        }
+        return messages, prompt
+    
+    def _load_snapshot(self, agent_name: str) -> Optional[AgentSnapshot]:
+        """Fast-start snapshot (one read, no JSON parsing) while it matches the JSON files"""
+        path = snapshot_path(self.memory_dir, agent_name)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        signature = source_signature(self.memory_dir, agent_name)
+        with self._cache_lock:
+            cached = self._snapshots.get(agent_name)
+            if not cached or cached[0] != mtime:
+                cached = (mtime, load_snapshot(path))
+                self._snapshots[agent_name] = cached
+        snapshot = cached[1]
+        return snapshot if snapshot is not None and snapshot.signature == signature else None
     
     def _load_agent_memory(self, agent_name: str) -> Optional[Dict]:
-        """Load agent memory JSON"""
-        memory_file = self.memory_dir / f"{agent_name}_memory.json"
-        if not memory_file.exists():
+        """Load the latest agent memory state (cached until a training session saves)"""
+        snapshot = self._load_snapshot(agent_name)
+        if snapshot is not None:
+            return snapshot.memory
+        store = AgentMemoryStore(self.memory_dir, agent_name)
+        # The store header is rewritten on every save; legacy JSON is the fallback
+        marker = store.header_file if store.header_file.exists() else store.legacy_file
+        try:
+            mtime = marker.stat().st_mtime_ns
+        except OSError:
             return None
         
-        with open(memory_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def _retrieve_relevant_context(self, question: str, memory: Dict) -> List[Dict]:
-        """RAG: Retrieve relevant sources βάσει keyword matching"""
-        # Extract keywords
-        keywords = set(
-            word.lower() for word in re.findall(r'\b\w{4,}\b', question)
-        )
-        
-        # Score memory entries
-        scored_entries = []
-        for entry in memory.get("memory", [])[:200]:  # First 200 for performance
-            score = self._calculate_relevance_score(entry, keywords)
-            if score > 0:
-                scored_entries.append((score, entry))
+        with self._cache_lock:
+            cached = self._memories.get(agent_name)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            memory = store.load()
+            self._memories[agent_name] = (mtime, memory)
+            return memory
+    
+    def _load_passage_index(self, agent_name: str) -> Optional[Any]:
+        """Load the agent's BM25 passage index (snapshot, else the JSON file; cached until it changes)"""
+        snapshot = self._load_snapshot(agent_name)
+        if snapshot is not None:
+            return snapshot.index
+        index_file = self.memory_dir / f"{agent_name}_bm25.json"
+        try:
+            mtime = index_file.stat().st_mtime_ns
+        except OSError:
+            return None
+        with self._cache_lock:
+            cached = self._indexes.get(agent_name)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            index = BM25Index.load(index_file)
+            self._indexes[agent_name] = (mtime, index)
+            return index
+    
+    def _load_vector_index(self, agent_name: str, index: Any) -> Optional[VectorIndex]:
+        """Agent's passage vectors for `index` (None if not built, stale or numpy is missing)"""
+        _, meta_file = vector_paths(self.memory_dir, agent_name)
+        try:
+            mtime = meta_file.stat().st_mtime_ns
+        except OSError:
+            return None
+        key = (mtime, index_signature(self.memory_dir, agent_name))
+        with self._cache_lock:
+            cached = self._vectors.get(agent_name)
+            if not cached or cached[0] != key or (cached[1] is not None and cached[1].passages is not index):
+                cached = (key, VectorIndex.load(self.memory_dir, agent_name, index))
+                self._vectors[agent_name] = cached
+            return cached[1]
+    
+    def _rank_passages(self, agent_name: str, index: Any, questions: List[str], k: int) -> List[List[Dict]]:
+        """Top-k passages per question with the configured retriever (BM25 when no vectors are built)"""
+        vectors = self._load_vector_index(agent_name, index) if self.retriever != "bm25" else None
+        if vectors is None:
+            return [index.search(question, k) for question in questions]
+        if self.retriever == "vector":
+            return vectors.search_many(questions, k)
+        # Fusion: both rankings go twice as deep so a passage one of them ranks low can still surface
+        semantic = vectors.search_many(questions, 2 * k)
+        return [fuse([index.search(question, 2 * k), hits], k) for question, hits in zip(questions, semantic)]
+    
+    def _load_corpus_store(self) -> Optional[CorpusStore]:
+        """Memory-mapped corpus store for passage text (reopened after a rebuild)"""
+        index_file = self.memory_dir / "corpus_store" / INDEX_FILE
+        try:
+            mtime = index_file.stat().st_mtime_ns
+        except OSError:
+            return None
+        with self._cache_lock:
+            cached_mtime, store = self._corpus_store
+            if cached_mtime != mtime:
+                # The replaced store is left to the GC: other threads may still be slicing it
+                store = CorpusStore.open(index_file.parent)
+                self._corpus_store = (mtime, store)
+            return store
+    
+    def _retrieve_relevant_context(self, question: str, memory: Dict, k: int = 10) -> List[Dict]:
+        """RAG: Retrieve relevant passages με BM25/vectors (keyword overlap αν δεν υπάρχει index)"""
+        return self._retrieve_many([question], memory, k)[0]
+    
+    def retrieve_many(self, agent_name: str, questions: List[str], k: int = 10) -> List[List[Dict]]:
+        """Retrieval only, for a batch of questions (vector scoring is one matrix product per batch)"""
+        memory = self._load_agent_memory(agent_name)
+        if not memory:
+            raise ValueError(f"Agent memory not found for {agent_name}")
+        return self._retrieve_many(questions, memory, k)
+    
+    def _memory_field(self, agent_name: Optional[str]) -> str:
+        """Memory-entry field holding the agent's terms (registry; loaded on first retrieval)"""
+        if self._memory_fields is None:
+            from agent_registry import load_agent_specs
+            self._memory_fields = {spec.name: spec.memory_field for spec in load_agent_specs()}
+        return self._memory_fields.get(agent_name, "key_terms")
+    
+    def _retrieve_many(self, questions: List[str], memory: Dict, k: int) -> List[List[Dict]]:
+        field = self._memory_field(memory.get("agent"))
+        index = self._load_passage_index(memory["agent"]) if memory.get("agent") else None
+        if index is not None and len(index):
+            entries = {entry["source"]: entry for entry in memory.get("memory", [])}
+            ranked = self._rank_passages(memory["agent"], index, questions, k)
+            for hits in ranked:
+                for hit in hits:
+                    entry = entries.get(hit["source"], {})
+                    hit["key_terms"] = entry.get(field) or []
+                    hit["content_length"] = hit["end"] - hit["start"]
+            return ranked
         
-        # Top 10 most relevant
-        scored_entries.sort(reverse=True, key=lambda x: x[0])
-        return [entry for _, entry in scored_entries[:10]]
+        # Legacy memory-entry scoring
+        results = []
+        for question in questions:
+            keywords = set(
+                word.lower() for word in re.findall(r'\b\w{4,}\b', question)
+            )
+            scored_entries = (
+                (self._calculate_relevance_score(entry, keywords, field), i, entry)
+                for i, entry in enumerate(memory.get("memory", []))
+            )
+            top = heapq.nlargest(k, (s for s in scored_entries if s[0] > 0), key=itemgetter(0))
+            # Retrieved sources carry the agent's terms as `key_terms`, as passage hits do
+            results.append([dict(entry, key_terms=entry.get(field) or []) for _, _, entry in top])
+        return results
+    
+    @staticmethod
+    def _source_names(relevant_sources: List[Dict]) -> List[str]:
+        """Unique source names, best first"""
+        return list(dict.fromkeys(s["source"] for s in relevant_sources))
     
-    def _calculate_relevance_score(self, entry: Dict, keywords: set) -> int:
-        """Calculate relevance score βάσει keyword overlap"""
+    def _calculate_relevance_score(self, entry: Dict, keywords: set, field: str = "key_terms") -> int:
+        """Calculate relevance score βάσει keyword overlap (`field`: the agent's memory_field)"""
         score = 0
         
         # Score από source name
@@ -145,8 +540,8 @@ class AgentLLMService:
         score += sum(3 for kw in keywords if kw in source_lower)
         
         # Score από key terms
-        if entry.get("key_terms"):
-            terms_lower = [t.lower() for t in entry["key_terms"]]
+        if entry.get(field):
+            terms_lower = [t.lower() for t in entry[field]]
             for kw in keywords:
                 for term in terms_lower:
                     if kw in term or term in kw:
@@ -244,11 +639,16 @@ Response structure template:
         
         return base_prompt + sources_section
     
-    def _build_user_prompt(self, question: str, relevant_sources: List[Dict]) -> str:
-        """Build user prompt με relevant context"""
+    def _build_user_prompt(self, question: str, relevant_sources: List[Dict],
+                           excerpts: Optional[List[Dict]] = None) -> str:
+        """Build user prompt με relevant context (passage text όταν υπάρχει)"""
         prompt = f"User Question: {question}\n\n"
         
-        if relevant_sources:
+        if excerpts:
+            prompt += "Relevant excerpts from the regulatory documents (most relevant first):\n\n"
+            for i, excerpt in enumerate(excerpts, 1):
+                prompt += f"[{i}] Source: {excerpt['source']}\n{excerpt['text']}\n\n"
+        elif relevant_sources:
             prompt += "Relevant context from training data:\n\n"
             for source in relevant_sources[:5]:
                 prompt += f"Source: {source['source']}\n"
@@ -301,20 +701,124 @@ Response structure template:
             )
 
 
+def serve(service: AgentLLMService, workers: int = 4, stdin=None, stdout=None):
+    """Long-lived service: newline-delimited JSON-RPC 2.0 over stdio.
+    
+    Keeps the client, agent memories and passage indexes warm between
+    questions. Requests run concurrently on a thread pool; responses are
+    written one per line as they complete and matched by ``id``.
+    
+    Methods: ``ask`` {agent_name, question}, ``ask_stream`` (same params),
+    ``retrieve`` {agent_name, questions, k} (passages only, one batch),
+    ``ping``, ``shutdown``. ``ask_stream`` sends ``stream`` notifications
+    ({id, event: "start" | "delta", ...}) and answers with the final event.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+    
+    def respond(request_id, result=None, error=None):
+        message = {"jsonrpc": "2.0", "id": request_id}
+        if error is not None:
+            message["error"] = error
+        else:
+            message["result"] = result
+        line = json.dumps(message, ensure_ascii=False)
+        with write_lock:
+            stdout.write(line + "\n")
+            stdout.flush()
+    
+    def notify(params):
+        line = json.dumps({"jsonrpc": "2.0", "method": "stream", "params": params}, ensure_ascii=False)
+        with write_lock:
+            stdout.write(line + "\n")
+            stdout.flush()
+    
+    def handle(request_id, method, params):
+        try:
+            if method == "ask":
+                respond(request_id, service.ask_agent(params["agent_name"], params["question"]))
+            elif method == "ask_stream":
+                for event in service.ask_agent_stream(params["agent_name"], params["question"]):
+                    if event["event"] in ("done", "error"):
+                        respond(request_id, event)
+                    else:
+                        notify(dict(event, id=request_id))
+            elif method == "retrieve":
+                respond(request_id, {"results": service.retrieve_many(params["agent_name"], params["questions"],
+                                                                      int(params.get("k", 10)))})
+            elif method == "ping":
+                respond(request_id, {"pong": True, "mock": service.mock_mode, "model": service.deployment,
+                                     "retriever": service.retriever, "cache": service.answer_cache.stats(),
+                                     "telemetry": service.telemetry.to_dict()})
+            else:
+                respond(request_id, error={"code": -32601, "message": f"Unknown method: {method}"})
+        except KeyError as e:
+            respond(request_id, error={"code": -32602, "message": f"Missing param: {e}"})
+        except Exception as e:
+            respond(request_id, error={"code": -32603, "message": str(e)})
+    
+    from concurrent.futures import ThreadPoolExecutor
+    shutdown_id = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-rpc") as pool:
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                respond(None, error={"code": -32700, "message": f"Parse error: {e}"})
+                continue
+            if not isinstance(request, dict):
+                # Batches, numbers, null...: valid JSON but not a request object
+                respond(None, error={"code": -32600, "message": "Invalid Request: expected a JSON object"})
+                continue
+
+            request_id = request.get("id")
+            method = request.get("method")
+            if method == "shutdown":
+                shutdown_id = request_id
+                break
+            pool.submit(handle, request_id, method, request.get("params") or {})
+    
+    # In-flight requests are drained before acknowledging shutdown
+    service.write_metrics(force=True)
+    if shutdown_id is not None:
+        respond(shutdown_id, {"shutdown": True})
+
+
 def main():
     """CLI entry point"""
+    # Detect workspace root (3 levels up from this script)
+    script_path = Path(__file__).resolve()
+    workspace_root = script_path.parent.parent.parent
+    
+    if len(sys.argv) >= 2 and sys.argv[1] == "--serve":
+        workers = int(sys.argv[3]) if len(sys.argv) >= 4 and sys.argv[2] == "--workers" else 4
+        # Keep stdout reserved for protocol lines
+        rpc_out = sys.stdout
+        sys.stdout = sys.stderr
+        serve(AgentLLMService(str(workspace_root)), workers, sys.stdin, rpc_out)
+        return
+    
+    if len(sys.argv) >= 4 and sys.argv[1] == "--stream":
+        # NDJSON events, one per line, flushed as they arrive
+        service = AgentLLMService(str(workspace_root))
+        for event in service.ask_agent_stream(sys.argv[2], " ".join(sys.argv[3:])):
+            print(json.dumps(event, ensure_ascii=False), flush=True)
+        return
+    
     if len(sys.argv) < 3:
         print("Usage: python agent_llm.py <agent_name> <question>", file=sys.stderr)
+        print("       python agent_llm.py --stream <agent_name> <question>", file=sys.stderr)
+        print("       python agent_llm.py --serve [--workers N]", file=sys.stderr)
         print("Example: python agent_llm.py SORA_Compliance_Agent \"What is SAIL level for GRC=3?\"", file=sys.stderr)
         sys.exit(1)
     
     agent_name = sys.argv[1]
     question = " ".join(sys.argv[2:])
     
-    # Detect workspace root (3 levels up from this script)
-    script_path = Path(__file__).resolve()
-    workspace_root = script_path.parent.parent.parent
-    
     service = AgentLLMService(str(workspace_root))
     result = service.ask_agent(agent_name, question)
     
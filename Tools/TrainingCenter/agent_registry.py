@@ -0,0 +1,162 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Declarative agent registry with single-pass document routing.
+
+Agents are declared in config.yaml under `agents:`. Besides its expertise
+and key terms, each agent declares what it learns from:
+
+- name_patterns     globs on the document key, e.g. "*sora*" (case-insensitive)
+- content_keywords  terms found in the text by the shared KeywordScanner
+- context_packs     names of generated context packs
+
+The trainer walks the corpus once and hands every document to all agents
+whose rules match, so adding an agent adds no extra pass over the corpus.
+"""
+
+import fnmatch
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+DEFAULT_CONFIG = Path(__file__).resolve().parent / "config.yaml"
+
+# Used when config.yaml has no `agents:` section
+DEFAULT_AGENTS: List[Dict[str, Any]] = [
+    {
+        "name": "SORA_Compliance_Agent",
+        "memory_field": "key_terms",
+        "expertise": [
+            "SORA 2.0 AMC",
+            "JARUS SORA 2.5",
+            "PDRA-01 (UAS operations over controlled ground area)",
+            "PDRA-02 (UAS operations close to people)",
+            "GRC (Ground Risk Class) calculation",
+            "ARC (Air Risk Class) determination",
+            "SAIL (Specific Assurance & Integrity Levels)",
+            "OSO (Operational Safety Objectives)",
+            "Operational Authorization procedures"
+        ],
+        "key_terms": [
+            "SORA", "GRC", "ARC", "SAIL", "OSO", "PDRA", "TMPR",
+            "operational authorization", "risk assessment", "mitigation",
+            "ground risk", "air risk", "integrity level", "robustness"
+        ],
+        "name_patterns": ["*sora*", "*pdra*"],
+        "context_packs": ["GRC", "ARC", "SAIL", "OSO", "PDRA", "SORA_25_MainBody",
+                          "SORA_25_AnnexA", "SORA_25_AnnexB", "SORA_25_AnnexC", "SORA_25_AnnexD"]
+    },
+    {
+        "name": "Mission_Planning_Agent",
+        "memory_field": "key_operations",
+        "expertise": [
+            "STS-01 (VLOS operations)",
+            "STS-02 (BVLOS operations with airspace observers)",
+            "Operation Manual creation",
+            "Mission planning procedures",
+            "Airspace coordination",
+            "Risk mitigation strategies",
+            "Operational procedures",
+            "Flight authorization workflows"
+        ],
+        "key_terms": [
+            "STS-01", "STS-02", "VLOS", "BVLOS", "operational procedures",
+            "mission planning", "airspace", "flight authorization",
+            "operation manual", "risk mitigation"
+        ],
+        "name_patterns": ["*sts*", "*operation*", "*manual*", "*procedure*", "*flight*"],
+        "context_packs": ["STS", "PDRA"]
+    }
+]
+
+
+class AgentSpec:
+    """One agent as declared in config.yaml"""
+
+    def __init__(self, name: str, expertise: Optional[List[str]] = None,
+                 key_terms: Optional[List[str]] = None, memory_field: str = "key_terms",
+                 name_patterns: Optional[List[str]] = None, content_keywords: Optional[List[str]] = None,
+                 context_packs: Optional[List[str]] = None):
+        self.name = name
+        self.expertise = list(expertise or [])
+        self.key_terms = list(key_terms or [])
+        self.memory_field = memory_field
+        self.name_patterns = list(name_patterns or [])
+        self.content_keywords = list(content_keywords or [])
+        self.context_packs = list(context_packs or [])
+
+    @classmethod
+    def from_config(cls, entry: Dict[str, Any]) -> "AgentSpec":
+        if not entry.get("name"):
+            raise ValueError("agent entry without a name")
+        fields = ("expertise", "key_terms", "memory_field", "name_patterns", "content_keywords", "context_packs")
+        return cls(entry["name"], **{k: entry[k] for k in fields if entry.get(k) is not None})
+
+
+def agent_specs(config: Optional[Dict[str, Any]]) -> List[AgentSpec]:
+    """Agent specs from a loaded config (built-in defaults without an `agents:` section)"""
+    entries = (config or {}).get("agents") or DEFAULT_AGENTS
+    specs = [AgentSpec.from_config(entry) for entry in entries]
+    names = [spec.name for spec in specs]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate agent names in config: {', '.join(duplicates)}")
+    return specs
+
+
+def load_agent_specs(config_path: Union[str, Path, None] = DEFAULT_CONFIG) -> List[AgentSpec]:
+    config = None
+    if config_path is not None and Path(config_path).exists():
+        from make_context_pack import load_config
+        config = load_config(config_path)
+    return agent_specs(config)
+
+
+def agent_names(config_path: Union[str, Path, None] = DEFAULT_CONFIG) -> List[str]:
+    return [spec.name for spec in load_agent_specs(config_path)]
+
+
+class DocumentRouter:
+    """Decides, per document, which agents learn from it"""
+
+    def __init__(self, specs: List[AgentSpec]):
+        self.specs = specs
+        # One compiled alternation per agent instead of a glob loop per document
+        self._name_res = [
+            re.compile("|".join(fnmatch.translate(p.lower()) for p in spec.name_patterns))
+            if spec.name_patterns else None
+            for spec in specs
+        ]
+        self._pack_targets: Dict[str, List[int]] = {}
+        for i, spec in enumerate(specs):
+            for pack in spec.context_packs:
+                targets = self._pack_targets.setdefault(pack, [])
+                if i not in targets:
+                    targets.append(i)
+
+    @property
+    def content_keywords(self) -> List[str]:
+        return [kw for spec in self.specs for kw in spec.content_keywords]
+
+    @property
+    def needs_content(self) -> bool:
+        return any(spec.content_keywords for spec in self.specs)
+
+    def route_document(self, doc_name: str,
+                       hits: Optional[Callable[[], Dict[str, int]]] = None) -> List[int]:
+        """Indexes of the agents for a document; `hits` returns its keyword hits (called at most once)"""
+        lowered = doc_name.lower()
+        targets = []
+        scanned = None
+        for i, spec in enumerate(self.specs):
+            name_re = self._name_res[i]
+            if name_re is not None and name_re.match(lowered):
+                targets.append(i)
+            elif spec.content_keywords and hits is not None:
+                if scanned is None:
+                    scanned = hits()
+                if any(kw in scanned for kw in spec.content_keywords):
+                    targets.append(i)
+        return targets
+
+    def route_pack(self, pack_name: str) -> List[int]:
+        return self._pack_targets.get(pack_name, [])
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5 — Skyworks V5: Fast-start Agent Snapshot
+
+Binary snapshot of an agent's memory state and BM25 passage index, written
+at the end of every training session next to the JSON files:
+
+    agent_memory/<agent>.snapshot
+
+Layout: magic, header length, a marshal'd header (memory state, BM25
+parameters, section table, signature of the JSON files it was built from),
+then native-endian uint32 sections, each 8-byte aligned:
+
+    terms, term_offsets           UTF-8 terms in index order
+    term_order                    term ids sorted by their bytes (binary search)
+    posting_offsets, postings     [pid, tf, pid, tf, ...] per term
+    passages                      [source, start, end, n_tokens] per passage
+    source_names, source_paths    UTF-8 blobs with their offset tables
+
+Loading is one read plus zero-copy memoryview casts: no term, posting or
+passage is decoded until a query touches it. A snapshot is only used while
+its signature (size and mtime of header.json and <agent>_bm25.json) still
+matches, so the JSON files remain the source of truth.
+
+Usage (rebuild snapshots from the JSON files, e.g. after an upgrade):
+    py -3 Tools/TrainingCenter/agent_snapshot.py
+"""
+
+import heapq
+import marshal
+import math
+import os
+import struct
+import sys
+from array import array
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from bm25_index import INDEX_VERSION, BM25Index, tokenize
+from memory_store import AgentMemoryStore
+
+SNAPSHOT_VERSION = 1
+MAGIC = b"SKYSNAP\x01"
+_HEADER_LEN = struct.Struct("<Q")
+_ALIGN = 8
+
+
+def snapshot_path(memory_dir: Path, agent_name: str) -> Path:
+    return Path(memory_dir) / f"{agent_name}.snapshot"
+
+
+def source_signature(memory_dir: Path, agent_name: str) -> Optional[List[List[int]]]:
+    """[size, mtime_ns] of the files a snapshot is built from; None if one is missing"""
+    store = AgentMemoryStore(memory_dir, agent_name)
+    signature = []
+    for path in (store.header_file, Path(memory_dir) / f"{agent_name}_bm25.json"):
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        signature.append([st.st_size, st.st_mtime_ns])
+    return signature
+
+
+def _string_table(strings: List[str]) -> Tuple[bytes, array]:
+    blob = bytearray()
+    offsets = array("I", [0])
+    for s in strings:
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+    return bytes(blob), offsets
+
+
+def write_snapshot(memory_dir: Path, agent_name: str, state: Dict[str, Any], index: BM25Index) -> Optional[Path]:
+    """Snapshot `state` (as AgentMemoryStore.load returns it) and `index`; call after both are saved"""
+    signature = source_signature(memory_dir, agent_name)
+    if signature is None:
+        return None
+    index.compact()
+
+    # Terms keep the index order (a thawed index saves byte-identical JSON);
+    # term_order sorts them by bytes so lookups can bisect
+    encoded = [term.encode("utf-8") for term in index.postings]
+    term_order = array("I", sorted(range(len(encoded)), key=encoded.__getitem__))
+    terms = bytearray()
+    term_offsets = array("I", [0])
+    posting_offsets = array("I", [0])
+    postings = array("I")
+    for raw, plist in zip(encoded, index.postings.values()):
+        terms += raw
+        term_offsets.append(len(terms))
+        postings.extend(x for item in plist.items() for x in item)
+        posting_offsets.append(len(postings) // 2)
+
+    names = list(index.sources)
+    source_ids = {name: i for i, name in enumerate(names)}
+    passages = array("I")
+    for source, start, end, n_tokens in index.passages:
+        passages.extend((source_ids[source], start, end, n_tokens))
+    name_blob, name_offsets = _string_table(names)
+    path_blob, path_offsets = _string_table([index.sources[name] for name in names])
+
+    sections = [("terms", bytes(terms)), ("term_offsets", term_offsets), ("term_order", term_order),
+                ("posting_offsets", posting_offsets), ("postings", postings), ("passages", passages),
+                ("source_names", name_blob), ("source_name_offsets", name_offsets),
+                ("source_paths", path_blob), ("source_path_offsets", path_offsets)]
+    table = {}
+    offset = 0
+    for name, data in sections:
+        nbytes = len(data) * (data.itemsize if isinstance(data, array) else 1)
+        table[name] = [offset, nbytes]
+        offset += nbytes + (-nbytes % _ALIGN)
+
+    header = marshal.dumps({
+        "version": SNAPSHOT_VERSION,
+        "agent": agent_name,
+        "byteorder": sys.byteorder,
+        "signature": signature,
+        "memory": state,
+        "bm25": {"version": INDEX_VERSION, "k1": index.k1, "b": index.b, "passage_chars": index.passage_chars,
+                 "live": len(index), "total_tokens": index._total_tokens, "terms": len(encoded),
+                 "sources": len(names)},
+        "sections": table
+    })
+
+    path = snapshot_path(memory_dir, agent_name)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + _HEADER_LEN.pack(len(header)) + header)
+        f.write(b"\0" * (-f.tell() % _ALIGN))
+        for name, data in sections:
+            raw = data.tobytes() if isinstance(data, array) else data
+            f.write(raw + b"\0" * (-len(raw) % _ALIGN))
+    os.replace(tmp_path, path)
+    return path
+
+
+class PackedBM25Index:
+    """Read-only BM25 index over snapshot sections; scores like BM25Index.search"""
+
+    def __init__(self, params: Dict[str, Any], views: Dict[str, memoryview]):
+        self.k1 = params["k1"]
+        self.b = params["b"]
+        self.passage_chars = params["passage_chars"]
+        self._live = params["live"]
+        self._total_tokens = params["total_tokens"]
+        self._n_terms = params["terms"]
+        self._n_sources = params["sources"]
+        self._terms = views["terms"]
+        self._term_offsets = views["term_offsets"].cast("I")
+        self._term_order = views["term_order"].cast("I")
+        self._posting_offsets = views["posting_offsets"].cast("I")
+        self._postings = views["postings"].cast("I")
+        self._passages = views["passages"].cast("I")
+        self._lengths = self._passages[3::4]
+        self._names = (views["source_names"], views["source_name_offsets"].cast("I"))
+        self._paths = (views["source_paths"], views["source_path_offsets"].cast("I"))
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _term_id(self, term: str) -> int:
+        key = term.encode("utf-8")
+        offsets, order = self._term_offsets, self._term_order
+        lo, hi = 0, self._n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            tid = order[mid]
+            found = self._terms[offsets[tid]:offsets[tid + 1]].tobytes()
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                return tid
+        return -1
+
+    def _plist(self, term: str) -> Optional[memoryview]:
+        tid = self._term_id(term)
+        if tid < 0:
+            return None
+        return self._postings[2 * self._posting_offsets[tid]:2 * self._posting_offsets[tid + 1]]
+
+    def df(self, term: str) -> int:
+        plist = self._plist(term)
+        return len(plist) // 2 if plist else 0
+
+    def passage_info(self, pid: int) -> Dict[str, Any]:
+        sid, start, end, _ = self._passages[4 * pid:4 * pid + 4]
+        return {"passage_id": pid, "source": self._string(self._names, sid),
+                "path": self._string(self._paths, sid), "start": start, "end": end}
+
+    @staticmethod
+    def _string(table: Tuple[memoryview, memoryview], i: int) -> str:
+        blob, offsets = table
+        return str(blob[offsets[i]:offsets[i + 1]], "utf-8")
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k passages for a free-text query, best first."""
+        if not self._live:
+            return []
+        n = self._live
+        avgdl = self._total_tokens / n
+        k1, b = self.k1, self.b
+        lengths = self._lengths
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            plist = self._plist(term)
+            if not plist:
+                continue
+            df = len(plist) // 2
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for pid, tf in zip(plist[0::2], plist[1::2]):
+                dl = lengths[pid]
+                s = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+                scores[pid] = scores.get(pid, 0.0) + s
+
+        return [dict(self.passage_info(pid), score=round(score, 4))
+                for pid, score in heapq.nlargest(k, scores.items(), key=itemgetter(1))]
+
+    def thaw(self) -> BM25Index:
+        """Mutable BM25Index with the same content (for the trainer's incremental sessions)"""
+        index = BM25Index(self.k1, self.b, self.passage_chars)
+        names = [self._string(self._names, i) for i in range(self._n_sources)]
+        index.sources = {name: self._string(self._paths, i) for i, name in enumerate(names)}
+        p = self._passages.tolist()
+        index.passages = [[names[p[i]], p[i + 1], p[i + 2], p[i + 3]] for i in range(0, len(p), 4)]
+        postings = self._postings.tolist()
+        term_offsets = self._term_offsets.tolist()
+        posting_offsets = self._posting_offsets.tolist()
+        terms = self._terms.tobytes()
+        index.postings = {
+            terms[term_offsets[i]:term_offsets[i + 1]].decode("utf-8"):
+                dict(zip(postings[2 * posting_offsets[i]:2 * posting_offsets[i + 1]:2],
+                         postings[2 * posting_offsets[i] + 1:2 * posting_offsets[i + 1]:2]))
+            for i in range(self._n_terms)
+        }
+        index._live = self._live
+        index._total_tokens = self._total_tokens
+        index._rebuild_source_map()
+        return index
+
+
+class AgentSnapshot:
+    """A loaded snapshot: `memory` (the memory store state) and `index` (PackedBM25Index)"""
+
+    def __init__(self, header: Dict[str, Any], views: Dict[str, memoryview]):
+        self.agent = header["agent"]
+        self.signature = header["signature"]
+        self.memory: Dict[str, Any] = header["memory"]
+        self.index = PackedBM25Index(header["bm25"], views)
+
+    def is_current(self, memory_dir: Path) -> bool:
+        return self.signature == source_signature(memory_dir, self.agent)
+
+
+def load_snapshot(path: Path) -> Optional[AgentSnapshot]:
+    """Read a snapshot in one go; None if missing, foreign or from another version"""
+    try:
+        with open(path, "rb") as f:
+            data = memoryview(f.read())
+    except OSError:
+        return None
+    if data[:len(MAGIC)] != MAGIC:
+        return None
+    (header_len,) = _HEADER_LEN.unpack_from(data, len(MAGIC))
+    start = len(MAGIC) + _HEADER_LEN.size
+    try:
+        header = marshal.loads(data[start:start + header_len])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if (header.get("version") != SNAPSHOT_VERSION or header.get("byteorder") != sys.byteorder
+            or header["bm25"].get("version") != INDEX_VERSION):
+        return None
+    base = start + header_len
+    base += -base % _ALIGN
+    views = {name: data[base + offset:base + offset + nbytes]
+             for name, (offset, nbytes) in header["sections"].items()}
+    return AgentSnapshot(header, views)
+
+
+def load_current_snapshot(memory_dir: Path, agent_name: str) -> Optional[AgentSnapshot]:
+    """The agent's snapshot if it still matches its JSON files"""
+    snapshot = load_snapshot(snapshot_path(memory_dir, agent_name))
+    return snapshot if snapshot is not None and snapshot.is_current(memory_dir) else None
+
+
+def main():
+    """CLI entry point: (re)build snapshots from the JSON memory files"""
+    import argparse
+
+    script_path = Path(__file__).resolve()
+    parser = argparse.ArgumentParser(description="Build fast-start snapshots for the SKYWORKS agents")
+    parser.add_argument("--memory-dir", default=str(script_path.parent / "agent_memory"),
+                       help="Agent memory directory")
+    args = parser.parse_args()
+
+    memory_dir = Path(args.memory_dir)
+    for index_file in sorted(memory_dir.glob("*_bm25.json")):
+        agent_name = index_file.name[:-len("_bm25.json")]
+        state = AgentMemoryStore(memory_dir, agent_name).load()
+        index = BM25Index.load(index_file)
+        if state is None or index is None:
+            print(f"✗ {agent_name}: memory or passage index missing")
+            continue
+        path = write_snapshot(memory_dir, agent_name, state, index)
+        if path is None:
+            print(f"✗ {agent_name}: no memory store header (run a training session first)")
+        else:
+            print(f"✓ {agent_name}: {path} ({path.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
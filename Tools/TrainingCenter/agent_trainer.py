@@ -6,9 +6,10 @@ Phase1 Step5.1 — Skyworks V5: AI Agent Training System
 
 AI Agent Training Orchestrator for SORA/EASA Compliance Experts
 
-This system trains TWO specialized AI agents:
+This system trains the agents declared in config.yaml (`agents:`), by default:
 1. SORA_Compliance_Agent: Operational Authorization Expert (SORA 2.0 AMC, 2.5, PDRA, STS)
 2. Mission_Planning_Agent: Flight Operations & Airspace Expert
+Each document is routed once to every agent whose rules match (agent_registry.py).
 
 Training Schedule: 3x daily (08:00, 14:00, 20:00)
 Knowledge Sources: Full EASA corpus + Context Packs
@@ -18,11 +19,26 @@ Persistence: Training logs + memory snapshots
 """
 
 import json
+import os
 import sys
-import yaml
+import time
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
+
+from agent_registry import AgentSpec, DocumentRouter, agent_specs
+from agent_snapshot import load_current_snapshot, write_snapshot
+from bm25_index import BM25Index
+from compressed_io import SHARED_CODECS, check_codec, read_text, resolve, write_text
+from concurrent_loader import LoadStats, load_files
+from corpus_manifest import CorpusManifest
+from corpus_dedup import DEDUP_FILE, DedupMap
+from corpus_store import CorpusStore, DocumentMap, NBYTES, NCHARS
+from keyword_scanner import KeywordScanner
+from memory_store import AgentMemoryStore, DEFAULT_LOG_RETENTION
+from telemetry import MEMORY_MODES, Telemetry
+from training_pool import DocumentAnalyzer, analyze
+from vector_index import DEFAULT_DIM, VectorIndex, check_dim, numpy_available, write_vectors
 
 # Ensure console encoding won't crash under non-UTF consoles (e.g., Task Scheduler)
 try:
@@ -35,66 +51,203 @@ except Exception:
 class AgentKnowledgeBase:
     """Manages full corpus access for agents"""
     
-    def __init__(self, corpus_path: Path, context_packs_path: Path):
+    def __init__(self, corpus_path: Path, context_packs_path: Path, io_workers: int = 1,
+                 store: Optional[CorpusStore] = None, dedup: Optional[DedupMap] = None,
+                 telemetry: Optional[Telemetry] = None):
         self.corpus_path = corpus_path
         self.context_packs_path = context_packs_path
+        self.io_workers = io_workers
+        self.store = store
+        self.dedup = dedup
+        self.telemetry = telemetry or Telemetry()
+        self.io_stats: Optional[LoadStats] = None
+        self.source_paths: Dict[str, Path] = {}
         self.knowledge_index = {}
+        self._keywords: List[str] = []
+        self._scanner: Optional[KeywordScanner] = None
+    
+    def register_keywords(self, keywords: Iterable[str]):
+        """Add keywords to the shared scanner (compiled lazily, once)"""
+        self._keywords.extend(keywords)
+        self._scanner = None
+    
+    @property
+    def keywords(self) -> List[str]:
+        return list(self._keywords)
+    
+    @property
+    def scanner(self) -> KeywordScanner:
+        if self._scanner is None:
+            self._scanner = KeywordScanner(self._keywords)
+        return self._scanner
         
-    def load_all_documents(self) -> Dict[str, str]:
-        """Load ALL documents from corpus (not just chunks)"""
-        documents = {}
+    def discover_documents(self) -> Dict[str, Path]:
+        """Map every corpus document key to its file path"""
+        files = {}
         
-        # Load root corpus files (like JARUS SORA v2.0)
-        for file_path in self.corpus_path.glob("EXTRACTED_*.txt"):
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
-                documents[file_path.stem] = content
-                print(f"✓ Loaded: {file_path.name} ({len(content)} chars)")
-            except Exception as e:
-                print(f"✗ Failed to load {file_path.name}: {e}")
+        # Root corpus files (like JARUS SORA v2.0)
+        for file_path in sorted(self.corpus_path.glob("EXTRACTED_*.txt")):
+            files[file_path.stem] = file_path
         
-        # Load processed chunks
+        # Processed chunks
         processed_chunks = self.corpus_path / "processed_chunks"
         if processed_chunks.exists():
-            for subfolder in processed_chunks.iterdir():
+            for subfolder in sorted(processed_chunks.iterdir()):
                 if subfolder.is_dir():
-                    for chunk_file in subfolder.glob("*.txt"):
-                        try:
-                            content = chunk_file.read_text(encoding='utf-8', errors='ignore')
-                            key = f"{subfolder.name}/{chunk_file.stem}"
-                            documents[key] = content
-                        except:
-                            pass
-        
-        return documents
+                    for chunk_file in sorted(subfolder.glob("*.txt")):
+                        files[f"{subfolder.name}/{chunk_file.stem}"] = chunk_file
+        
+        return files
     
-    def load_context_packs(self) -> Dict[str, str]:
-        """Load all generated context packs"""
+    def discover_context_packs(self) -> Dict[str, Path]:
+        """Map every generated context pack name to its pack.md"""
         packs = {}
-        for pack_folder in self.context_packs_path.iterdir():
+        if not self.context_packs_path.exists():
+            return packs
+        for pack_folder in sorted(self.context_packs_path.iterdir()):
             if pack_folder.is_dir():
-                pack_file = pack_folder / "pack.md"
-                if pack_file.exists():
-                    content = pack_file.read_text(encoding='utf-8')
-                    packs[pack_folder.name] = content
-                    print(f"✓ Loaded Context Pack: {pack_folder.name}")
+                # pack.md, or pack.md.gz/.xz/.zst when packs are stored compressed
+                pack_file = resolve(pack_folder / "pack.md")
+                if pack_file is not None:
+                    packs[pack_folder.name] = pack_file
         return packs
     
-    def build_knowledge_index(self) -> Dict[str, Any]:
-        """Build comprehensive knowledge index for agents"""
-        print("\n━━━ Building Knowledge Index ━━━")
+    def drop_redundant(self, files: Dict[str, Path]) -> Dict[str, Any]:
+        """Remove files the dedup map marks as copies of other documents (in place)"""
+        skipped = {"documents": 0, "bytes": 0}
+        if self.dedup is None:
+            return skipped
+        for key in [k for k, path in files.items() if self.dedup.is_redundant(path)]:
+            skipped["documents"] += 1
+            skipped["bytes"] += files.pop(key).stat().st_size
+        return skipped
+    
+    def _from_store(self, files: Dict[str, Path], stats: LoadStats) -> Dict[str, Any]:
+        """Store entries for files unchanged since the corpus store was built"""
+        mapped = {}
+        if self.store is None:
+            return mapped
+        for key, file_path in files.items():
+            entry = self.store.lookup(file_path)
+            if entry is not None:
+                mapped[key] = entry
+                stats.add_bytes(entry[NBYTES])
+                stats.file_done()
+        return mapped
+    
+    def load_all_documents(self, files: Optional[Dict[str, Path]] = None) -> DocumentMap:
+        """Load ALL documents from corpus (not just chunks), or only `files`.
         
-        documents = self.load_all_documents()
-        context_packs = self.load_context_packs()
+        Documents in the corpus store are mapped, not read: their text is
+        decoded each time it is accessed.
+        """
+        if files is None:
+            files = self.discover_documents()
         
-        # Build SORA-specific indices
-        sora_docs = {k: v for k, v in documents.items() if 'sora' in k.lower()}
-        pdra_docs = {k: v for k, v in documents.items() if 'pdra' in k.lower()}
-        sts_docs = {k: v for k, v in documents.items() if 'sts' in k.lower()}
+        stats = LoadStats()
+        mapped = self._from_store(files, stats)
+        
+        def read(file_path: Path) -> str:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                stats.add_bytes(os.fstat(f.fileno()).st_size)
+                return f.read()
+        
+        documents = {}
+        to_read = [(key, file_path) for key, file_path in files.items() if key not in mapped]
+        for (key, file_path), content, error in load_files(to_read, lambda kv: read(kv[1]),
+                                                           workers=self.io_workers, stats=stats):
+            is_root = "/" not in key
+            if error is None:
+                documents[key] = content
+                if is_root:
+                    print(f"✓ Loaded: {file_path.name} ({len(content)} chars)")
+            elif is_root:
+                print(f"✗ Failed to load {file_path.name}: {error}")
+        for key, entry in mapped.items():
+            documents[key] = self.store.loader(entry)
+            if "/" not in key:
+                print(f"✓ Mapped: {files[key].name} ({entry[NCHARS]} chars)")
+        
+        stats.finish()
+        self.io_stats = stats
+        if files:
+            store_note = f", {len(mapped)} from corpus store" if self.store is not None else ""
+            print(f"✓ Read {stats.summary()} [io_workers={self.io_workers}{store_note}]")
+        # Keep discovery order whichever way a document was loaded
+        return DocumentMap({key: documents[key] for key in files if key in documents})
+    
+    def load_context_packs(self, pack_files: Optional[Dict[str, Path]] = None) -> DocumentMap:
+        """Load all generated context packs, or only `pack_files`"""
+        if pack_files is None:
+            pack_files = self.discover_context_packs()
+        
+        packs = {}
+        for pack_name, pack_file in pack_files.items():
+            entry = self.store.lookup(pack_file) if self.store is not None else None
+            if entry is not None:
+                packs[pack_name] = self.store.loader(entry)
+            else:
+                packs[pack_name] = read_text(pack_file)
+            print(f"✓ Loaded Context Pack: {pack_name}")
+        return DocumentMap(packs)
+    
+    def build_knowledge_index(self, manifest: Optional[CorpusManifest] = None) -> Dict[str, Any]:
+        """Build comprehensive knowledge index for agents.
+        
+        With a `manifest`, only files that were added or changed since the
+        previous session are loaded and indexed; the returned ``changes``
+        lists what was added, changed, removed and skipped.
+        """
+        print("\n━━━ Building Knowledge Index ━━━")
+        telemetry = self.telemetry
+        
+        with telemetry.span("discover"):
+            files = self.discover_documents()
+            # Redundant copies simply drop out of the listing (and out of memory via the manifest)
+            deduplicated = self.drop_redundant(files)
+            pack_files = self.discover_context_packs()
+            self.source_paths = {key: Path(os.path.abspath(path)) for key, path in files.items()}
+            self.source_paths.update({f"ContextPack_{name}": Path(os.path.abspath(path))
+                                      for name, path in pack_files.items()})
+            tracked = dict(files)
+            tracked.update({f"ContextPack_{name}": path for name, path in pack_files.items()})
+        changes = None
+        
+        if manifest is None:
+            with telemetry.span("load"):
+                documents = self.load_all_documents(files)
+                context_packs = self.load_context_packs(pack_files)
+        else:
+            with telemetry.span("load"):
+                candidates = set(manifest.stat_changed(tracked))
+                documents = self.load_all_documents({k: p for k, p in files.items() if k in candidates})
+                context_packs = self.load_context_packs(
+                    {n: p for n, p in pack_files.items() if f"ContextPack_{n}" in candidates}
+                )
+            
+            with telemetry.span("index"):
+                contents = documents.merged(context_packs, prefix="ContextPack_")
+                changes = manifest.update(tracked, contents)
+                
+                # Only new or modified content goes on to the agents
+                fresh = set(changes["added"]) | set(changes["changed"])
+                documents = documents.subset(k for k in documents if k in fresh)
+                context_packs = context_packs.subset(n for n in context_packs if f"ContextPack_{n}" in fresh)
+        
+        # Build SORA-specific indices (by key, so mapped documents stay undecoded)
+        sora_docs = documents.subset(k for k in documents if 'sora' in k.lower())
+        pdra_docs = documents.subset(k for k in documents if 'pdra' in k.lower())
+        sts_docs = documents.subset(k for k in documents if 'sts' in k.lower())
+        telemetry.count("documents_loaded", len(documents))
+        telemetry.count("context_packs_loaded", len(context_packs))
+        if self.io_stats is not None:
+            telemetry.count("bytes_read", self.io_stats.bytes)
         
         index = {
-            "total_documents": len(documents),
-            "total_context_packs": len(context_packs),
+            "total_documents": len(files),
+            "total_context_packs": len(pack_files),
+            "loaded_documents": len(documents),
+            "loaded_context_packs": len(context_packs),
             "sora_documents": len(sora_docs),
             "pdra_documents": len(pdra_docs),
             "sts_documents": len(sts_docs),
@@ -104,7 +257,10 @@ class AgentKnowledgeBase:
                 "SORA": sora_docs,
                 "PDRA": pdra_docs,
                 "STS": sts_docs
-            }
+            },
+            "changes": changes,
+            "dedup": deduplicated,
+            "io": self.io_stats.to_dict() if self.io_stats else None
         }
         
         print(f"✓ Indexed {len(documents)} documents")
@@ -112,59 +268,50 @@ class AgentKnowledgeBase:
         print(f"✓ SORA docs: {len(sora_docs)}")
         print(f"✓ PDRA docs: {len(pdra_docs)}")
         print(f"✓ STS docs: {len(sts_docs)}")
+        if deduplicated["documents"]:
+            print(f"✓ Skipped {deduplicated['documents']} redundant documents "
+                  f"({deduplicated['bytes'] / (1024 * 1024):.2f} MB)")
+        if changes is not None:
+            print(f"✓ Changes: {len(changes['added'])} added, {len(changes['changed'])} changed, "
+                  f"{len(changes['removed'])} removed, {len(changes['skipped'])} skipped")
         
         return index
 
 
-class SORAComplianceAgent:
-    """Agent 1: SORA Operational Authorization Expert"""
+class TrainingAgent:
+    """A trained expert agent, configured by its AgentSpec (see config.yaml `agents:`)"""
     
-    def __init__(self, knowledge_base: AgentKnowledgeBase):
-        self.name = "SORA_Compliance_Agent"
+    def __init__(self, spec: AgentSpec, knowledge_base: AgentKnowledgeBase):
+        self.spec = spec
+        self.name = spec.name
         self.kb = knowledge_base
-        self.expertise = [
-            "SORA 2.0 AMC",
-            "JARUS SORA 2.5",
-            "PDRA-01 (UAS operations over controlled ground area)",
-            "PDRA-02 (UAS operations close to people)",
-            "GRC (Ground Risk Class) calculation",
-            "ARC (Air Risk Class) determination",
-            "SAIL (Specific Assurance & Integrity Levels)",
-            "OSO (Operational Safety Objectives)",
-            "Operational Authorization procedures"
-        ]
+        self.kb.register_keywords(spec.key_terms + spec.content_keywords)
+        self.expertise = spec.expertise
         self.memory = []
         self.training_log = []
-        
-    def train(self, knowledge_index: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute training session"""
-        training_session = {
+        self.index = BM25Index()
+        self.log_retention = DEFAULT_LOG_RETENTION
+        self.compression: Optional[str] = None
+        # Hashed passage vectors (vector_index.py) are built when set; needs NumPy
+        self.vector_dim: Optional[int] = None
+        self._vectors: Optional[VectorIndex] = None
+        self._journal: List[Dict[str, Any]] = []
+        self._rebuild = True
+        self._session: Optional[Dict[str, Any]] = None
+    
+    def begin_session(self):
+        """Start a training session; documents arrive through process_document()"""
+        self._session = {
             "agent": self.name,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "knowledge_accessed": [],
             "training_summary": {}
         }
-        
-        print(f"\n━━━ Training {self.name} ━━━")
-        
-        # Train on SORA documents
-        sora_content = knowledge_index["indices"]["SORA"]
-        for doc_name, content in sora_content.items():
-            self._process_document(doc_name, content)
-            training_session["knowledge_accessed"].append(doc_name)
-        
-        # Train on PDRA
-        pdra_content = knowledge_index["indices"]["PDRA"]
-        for doc_name, content in pdra_content.items():
-            self._process_document(doc_name, content)
-            training_session["knowledge_accessed"].append(doc_name)
-        
-        # Train on Context Packs
-        for pack_name, pack_content in knowledge_index["context_packs"].items():
-            if pack_name in ["GRC", "ARC", "SAIL", "OSO", "PDRA", "SORA_25_MainBody", "SORA_25_AnnexA", "SORA_25_AnnexB", "SORA_25_AnnexC", "SORA_25_AnnexD"]:
-                self._process_document(f"ContextPack_{pack_name}", pack_content)
-                training_session["knowledge_accessed"].append(pack_name)
-        
+    
+    def end_session(self) -> Dict[str, Any]:
+        """Close the session and log it"""
+        training_session = self._session
+        self._session = None
         training_session["training_summary"] = {
             "documents_processed": len(training_session["knowledge_accessed"]),
             "memory_entries": len(self.memory),
@@ -172,215 +319,318 @@ class SORAComplianceAgent:
         }
         
         self.training_log.append(training_session)
+        self._journal.append({"op": "log", "session": training_session})
         
+        print(f"\n━━━ Training {self.name} ━━━")
         print(f"✓ Processed {len(training_session['knowledge_accessed'])} knowledge sources")
         print(f"✓ Memory entries: {len(self.memory)}")
         
         return training_session
     
-    def _process_document(self, doc_name: str, content: str):
+    def process_document(self, doc_name: str, content: str, accessed: Optional[str] = None):
         """Process and memorize document content"""
+        self.learn(doc_name, analyze(self.kb.scanner, content, [self.index.passage_chars]), accessed)
+    
+    def learn(self, doc_name: str, analysis: Dict[str, Any], accessed: Optional[str] = None):
+        """Memorize a document from its analysis (training_pool.analyze)"""
         # Extract key concepts (simplified - real implementation would use NLP)
         memory_entry = {
             "source": doc_name,
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "content_length": len(content),
-            "key_terms": self._extract_key_terms(content)
+            "content_length": analysis["length"],
+            self.spec.memory_field: KeywordScanner.select(analysis["hits"], self.spec.key_terms)
         }
         self.memory.append(memory_entry)
+        self._journal.append({"op": "add", "entry": memory_entry})
+        self.index.add_analyzed(doc_name, analysis["passages"][self.index.passage_chars],
+                                self.kb.source_paths.get(doc_name))
+        self._session["knowledge_accessed"].append(accessed or doc_name)
     
-    def _extract_key_terms(self, content: str) -> List[str]:
-        """Extract key regulatory terms"""
-        terms = []
-        keywords = [
-            "SORA", "GRC", "ARC", "SAIL", "OSO", "PDRA", "TMPR",
-            "operational authorization", "risk assessment", "mitigation",
-            "ground risk", "air risk", "integrity level", "robustness"
-        ]
-        for keyword in keywords:
-            if keyword.lower() in content.lower():
-                terms.append(keyword)
-        return terms
+    def _store(self, output_path: Path) -> AgentMemoryStore:
+        return AgentMemoryStore(output_path, self.name, log_retention=self.log_retention,
+                                compression=self.compression)
     
-    def save_memory(self, output_path: Path):
-        """Persist agent memory"""
-        memory_file = output_path / f"{self.name}_memory.json"
-        memory_data = {
-            "agent": self.name,
-            "last_updated": datetime.now(timezone.utc).isoformat(),
-            "total_memory_entries": len(self.memory),
-            "expertise": self.expertise,
-            "memory": self.memory[-100:],  # Keep last 100 entries
-            "training_log": self.training_log
-        }
-        
-        memory_file.write_text(json.dumps(memory_data, indent=2))
-        print(f"✓ Saved memory: {memory_file}")
-
-
-class MissionPlanningAgent:
-    """Agent 2: Flight Operations & Mission Planning Expert"""
+    def load_memory(self, output_path: Path) -> bool:
+        """Restore persisted memory and passage index so a session can merge into them"""
+        snapshot = load_current_snapshot(output_path, self.name)
+        if snapshot is not None:
+            # Binary fast start; the JSON files are only parsed when it is stale
+            state, index = snapshot.memory, snapshot.index.thaw()
+        else:
+            state = self._store(output_path).load()
+            index = BM25Index.load(output_path / f"{self.name}_bm25.json")
+        if state is None or index is None:
+            return False
+        self.memory = state.get("memory", [])
+        self.training_log = state.get("training_log", [])
+        self.index = index
+        # Rows of unchanged passages are reused by the next save
+        self._vectors = VectorIndex.load(output_path, self.name, index) if self.vector_dim else None
+        self._journal = []
+        self._rebuild = False
+        return True
     
-    def __init__(self, knowledge_base: AgentKnowledgeBase):
-        self.name = "Mission_Planning_Agent"
-        self.kb = knowledge_base
-        self.expertise = [
-            "STS-01 (VLOS operations)",
-            "STS-02 (BVLOS operations with airspace observers)",
-            "Operation Manual creation",
-            "Mission planning procedures",
-            "Airspace coordination",
-            "Risk mitigation strategies",
-            "Operational procedures",
-            "Flight authorization workflows"
-        ]
+    def reset_memory(self):
+        """Start from an empty memory and passage index"""
         self.memory = []
         self.training_log = []
-        
-    def train(self, knowledge_index: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute training session"""
-        training_session = {
-            "agent": self.name,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "knowledge_accessed": [],
-            "training_summary": {}
-        }
-        
-        print(f"\n━━━ Training {self.name} ━━━")
-        
-        # Train on STS documents
-        sts_content = knowledge_index["indices"]["STS"]
-        for doc_name, content in sts_content.items():
-            self._process_document(doc_name, content)
-            training_session["knowledge_accessed"].append(doc_name)
-        
-        # Train on operational documents
-        for doc_name, content in knowledge_index["documents"].items():
-            if any(term in doc_name.lower() for term in ["operation", "manual", "procedure", "flight"]):
-                self._process_document(doc_name, content)
-                training_session["knowledge_accessed"].append(doc_name)
-        
-        # Train on relevant Context Packs
-        for pack_name, pack_content in knowledge_index["context_packs"].items():
-            if pack_name in ["STS", "PDRA"]:
-                self._process_document(f"ContextPack_{pack_name}", pack_content)
-                training_session["knowledge_accessed"].append(pack_name)
-        
-        training_session["training_summary"] = {
-            "documents_processed": len(training_session["knowledge_accessed"]),
-            "memory_entries": len(self.memory),
-            "expertise_areas": len(self.expertise)
-        }
-        
-        self.training_log.append(training_session)
-        
-        print(f"✓ Processed {len(training_session['knowledge_accessed'])} knowledge sources")
-        print(f"✓ Memory entries: {len(self.memory)}")
-        
-        return training_session
+        self.index = BM25Index()
+        self._vectors = None
+        self._journal = []
+        self._rebuild = True
     
-    def _process_document(self, doc_name: str, content: str):
-        """Process and memorize document content"""
-        memory_entry = {
-            "source": doc_name,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "content_length": len(content),
-            "key_operations": self._extract_operational_terms(content)
-        }
-        self.memory.append(memory_entry)
-    
-    def _extract_operational_terms(self, content: str) -> List[str]:
-        """Extract operational terms"""
-        terms = []
-        keywords = [
-            "STS-01", "STS-02", "VLOS", "BVLOS", "operational procedures",
-            "mission planning", "airspace", "flight authorization",
-            "operation manual", "risk mitigation"
-        ]
-        for keyword in keywords:
-            if keyword.lower() in content.lower():
-                terms.append(keyword)
-        return terms
+    def forget(self, sources: Iterable[str]):
+        """Drop memory entries and indexed passages of changed or removed sources"""
+        stale = set(sources)
+        if stale:
+            self.memory = [entry for entry in self.memory if entry["source"] not in stale]
+            self.index.remove_sources(stale)
+            self._journal.append({"op": "forget", "sources": sorted(stale)})
     
     def save_memory(self, output_path: Path):
-        """Persist agent memory"""
-        memory_file = output_path / f"{self.name}_memory.json"
-        memory_data = {
-            "agent": self.name,
-            "last_updated": datetime.now(timezone.utc).isoformat(),
-            "total_memory_entries": len(self.memory),
-            "expertise": self.expertise,
-            "memory": self.memory[-100:],
-            "training_log": self.training_log
-        }
-        
-        memory_file.write_text(json.dumps(memory_data, indent=2))
-        print(f"✓ Saved memory: {memory_file}")
+        """Persist agent memory (append this session's segment, or a fresh snapshot on rebuild)"""
+        store = self._store(output_path)
+        if self._rebuild:
+            version = store.rewrite({"memory": self.memory, "training_log": self.training_log}, self.expertise)
+        else:
+            version = store.append(self._journal, self.expertise,
+                                   state={"memory": self.memory, "training_log": self.training_log})
+        self._journal = []
+        self._rebuild = False
+        print(f"✓ Saved memory: {store.dir} (version {version})")
+        
+        # Passages restored from the last session keep their vector rows (ids before compaction)
+        reuse = None
+        if self._vectors is not None:
+            restored = len(self._vectors)
+            reuse = [pid if pid < restored else -1
+                     for pid, passage in enumerate(self.index.passages) if passage is not None]
+        
+        index_file = output_path / f"{self.name}_bm25.json"
+        self.index.save(index_file)
+        print(f"✓ Saved passage index: {index_file} ({len(self.index)} passages)")
+        
+        snapshot = write_snapshot(output_path, self.name, store.load(), self.index)
+        if snapshot is not None:
+            print(f"✓ Saved fast-start snapshot: {snapshot}")
+        
+        if self.vector_dim:
+            vectors = write_vectors(output_path, self.name, self.index, self.vector_dim, self.kb.store,
+                                    self._vectors, reuse)
+            self._vectors = None
+            if vectors is not None:
+                print(f"✓ Saved passage vectors: {vectors['path']} ({vectors['passages']} passages, "
+                      f"{vectors['reused']} reused, {vectors['bytes'] / 1024:.0f} KB)")
 
 
 class AgentTrainingOrchestrator:
-    """Orchestrates daily training for both agents"""
+    """Orchestrates daily training for the registered agents"""
     
-    def __init__(self, corpus_path: str, context_packs_path: str, output_path: str):
+    def __init__(self, corpus_path: str, context_packs_path: str, output_path: str, full_rebuild: bool = False,
+                 config_path: Optional[str] = None, io_workers: int = 1,
+                 log_retention: int = DEFAULT_LOG_RETENTION, store_path: Optional[str] = None,
+                 dedup_path: Optional[str] = None, workers: int = 1,
+                 profile_memory: Optional[str] = None, metrics_file: Optional[str] = None,
+                 compression: Optional[str] = None, vector_dim: Optional[int] = None):
         self.corpus_path = Path(corpus_path)
+        # Codec for memory snapshots/segments and reports (None = plain JSON)
+        self.compression = check_codec(compression)
+        self.workers = workers
+        # Stage timings for the training report (and the Prometheus textfile, if set)
+        self.telemetry = Telemetry(memory=profile_memory)
+        self.metrics_file = Path(metrics_file) if metrics_file else None
         self.context_packs_path = Path(context_packs_path)
         self.output_path = Path(output_path)
         self.output_path.mkdir(parents=True, exist_ok=True)
+        self.full_rebuild = full_rebuild
         
-        # Initialize knowledge base
-        self.kb = AgentKnowledgeBase(self.corpus_path, self.context_packs_path)
+        # Change manifest for incremental sessions
+        self.manifest = CorpusManifest(self.output_path / "corpus_manifest.json")
+        
+        # Memory-mapped corpus store (built by corpus_store.py), if there is one
+        self.store = CorpusStore.open(store_path) if store_path else None
+        if self.store is not None:
+            print(f"✓ Corpus store: {self.store.blob_file} ({len(self.store)} files)")
         
-        # Initialize agents
-        self.agent1 = SORAComplianceAgent(self.kb)
-        self.agent2 = MissionPlanningAgent(self.kb)
+        # Canonical-ID mapping from the dedup stage (corpus_dedup.py), if there is one
+        self.dedup = DedupMap.load(dedup_path or self.output_path / DEDUP_FILE)
         
+        # Initialize knowledge base
+        self.kb = AgentKnowledgeBase(self.corpus_path, self.context_packs_path, io_workers=io_workers,
+                                     store=self.store, dedup=self.dedup, telemetry=self.telemetry)
+        self.config_path = Path(config_path) if config_path else None
+        self.config = self._load_config()
+        self._register_topic_keywords()
+        
+        # Initialize agents from the registry (config.yaml `agents:`)
+        self.agents = [TrainingAgent(spec, self.kb) for spec in agent_specs(self.config)]
+        self.router = DocumentRouter([agent.spec for agent in self.agents])
+        if vector_dim and not numpy_available():
+            print("⚠ NumPy not installed — passage vectors are not built (pip install numpy)")
+            vector_dim = None
+        for agent in self.agents:
+            agent.log_retention = log_retention
+            agent.compression = self.compression
+            agent.vector_dim = check_dim(vector_dim) if vector_dim else None
+        
+    def _load_config(self) -> Dict[str, Any]:
+        if self.config_path is None or not self.config_path.exists():
+            return {}
+        from make_context_pack import load_config
+        return load_config(self.config_path) or {}
+    
+    def _register_topic_keywords(self):
+        """Share one scanner with the context pack topics from config.yaml"""
+        for topic in self.config.get("topics", []):
+            self.kb.register_keywords(topic.get("keywords", []))
+    
+    def _dispatch(self, knowledge_index: Dict[str, Any]) -> Dict[str, Any]:
+        """Single pass over the new documents and packs, each handed to every matching agent.
+        
+        Documents are analyzed once (on `workers` processes) and merged into
+        the agents in document order, so the result matches a serial run.
+        """
+        print("\n━━━ Routing Documents ━━━")
+        for agent in self.agents:
+            agent.begin_session()
+        routed = {"documents": 0, "unrouted": 0, "deliveries": 0}
+        
+        documents = knowledge_index["documents"]
+        context_packs = knowledge_index["context_packs"]
+        
+        # Name rules need no text; content keywords are checked on the analysis
+        work = []
+        for doc_name in documents:
+            if self.router.needs_content or self.router.route_document(doc_name):
+                work.append((("doc", doc_name), lambda d=doc_name: documents[d]))
+            else:
+                routed["unrouted"] += 1
+        for pack_name in context_packs:
+            if self.router.route_pack(pack_name):
+                work.append((("pack", pack_name), lambda p=pack_name: context_packs[p]))
+        
+        analyzer = DocumentAnalyzer(self.kb.keywords, {agent.index.passage_chars for agent in self.agents},
+                                    workers=self.workers)
+        merge_seconds = [0.0] * len(self.agents)
+        for (kind, name), analysis in analyzer.map(work):
+            if kind == "pack":
+                targets = self.router.route_pack(name)
+                doc_name, accessed = f"ContextPack_{name}", name
+            else:
+                targets = self.router.route_document(name, lambda: analysis["hits"])
+                doc_name, accessed = name, None
+                if not targets:
+                    routed["unrouted"] += 1
+                    continue
+                routed["documents"] += 1
+            routed["deliveries"] += len(targets)
+            for i in targets:
+                started = time.perf_counter()
+                self.agents[i].learn(doc_name, analysis, accessed=accessed)
+                merge_seconds[i] += time.perf_counter() - started
+        
+        parallel = analyzer.stats()
+        self.telemetry.record("analyze", parallel["wall_seconds"] - sum(merge_seconds), calls=len(work))
+        for agent, seconds in zip(self.agents, merge_seconds):
+            self.telemetry.record(f"train.{agent.name}", seconds, calls=len(agent._session["knowledge_accessed"]))
+        self.telemetry.count("documents_routed", routed["documents"])
+        self.telemetry.count("deliveries", routed["deliveries"])
+        print(f"✓ Routed {routed['documents']} documents to {len(self.agents)} agents "
+              f"({routed['deliveries']} deliveries, {routed['unrouted']} unrouted)")
+        print(f"✓ Analyzed {len(work)} sources in {parallel['wall_seconds']}s "
+              f"[workers={parallel['workers']}, {parallel['shards']} shards, speedup {parallel['speedup']}x]")
+        return {"routing": routed, "parallel": parallel}
+    
     def run_training_session(self):
-        """Execute complete training session for both agents"""
+        """Execute complete training session for all agents"""
         print("╔═══════════════════════════════════════════════════════════╗")
         print("║   SKYWORKS AI AGENT TRAINING SYSTEM — Session Start      ║")
         print("╚═══════════════════════════════════════════════════════════╝")
         print(f"Timestamp: {datetime.now(timezone.utc).isoformat()}")
         
-        # Build knowledge index
-        knowledge_index = self.kb.build_knowledge_index()
-        
-        # Train Agent 1: SORA Compliance Expert
-        session1 = self.agent1.train(knowledge_index)
-        self.agent1.save_memory(self.output_path)
+        # Incremental unless forced, or unless there is no previous state to merge into
+        incremental = not self.full_rebuild and self.manifest.load()
+        if incremental:
+            with self.telemetry.span("restore"):
+                incremental = all(agent.load_memory(self.output_path) for agent in self.agents)
+            if not incremental:
+                print("⚠ Agent memory missing — falling back to full rebuild")
+        if not incremental:
+            self.manifest.reset()
+            for agent in self.agents:
+                agent.reset_memory()
+        print(f"Mode: {'incremental' if incremental else 'full rebuild'}")
         
-        # Train Agent 2: Mission Planning Expert
-        session2 = self.agent2.train(knowledge_index)
-        self.agent2.save_memory(self.output_path)
+        # Build knowledge index
+        knowledge_index = self.kb.build_knowledge_index(self.manifest)
+        
+        # Merge: drop memories of changed and deleted sources before retraining
+        changes = knowledge_index["changes"]
+        stale = changes["changed"] + changes["removed"]
+        for agent in self.agents:
+            agent.forget(stale)
+        
+        # Train every agent in one pass over the knowledge index
+        with self.telemetry.span("train"):
+            dispatch = self._dispatch(knowledge_index)
+        sessions = {}
+        for agent in self.agents:
+            sessions[agent.name] = agent.end_session()
+            with self.telemetry.span(f"save.{agent.name}"):
+                agent.save_memory(self.output_path)
+            self.telemetry.gauge(f"memory_entries.{agent.name}", len(agent.memory))
+        
+        # Commit the manifest only once every agent persisted its memory
+        with self.telemetry.span("save.manifest"):
+            self.manifest.save()
         
         # Save training report
-        self._save_training_report(session1, session2, knowledge_index)
+        self._save_training_report(sessions, knowledge_index, incremental, dispatch)
+        stages = ", ".join(f"{name} {span['seconds']:.2f}s"
+                           for name, span in self.telemetry.to_dict()["spans"].items())
+        print(f"✓ Stages: {stages}")
+        if self.metrics_file is not None:
+            self.telemetry.write_prometheus(self.metrics_file, "skyworks_training",
+                                            {"mode": "incremental" if incremental else "full"})
+            print(f"✓ Metrics: {self.metrics_file}")
         
         print("\n╔═══════════════════════════════════════════════════════════╗")
         print("║   TRAINING SESSION COMPLETE                               ║")
         print("╚═══════════════════════════════════════════════════════════╝")
     
-    def _save_training_report(self, session1: Dict, session2: Dict, knowledge_index: Dict):
+    def _save_training_report(self, sessions: Dict[str, Dict], knowledge_index: Dict, incremental: bool,
+                              dispatch: Dict[str, Any]):
         """Generate comprehensive training report"""
+        changes = knowledge_index["changes"]
         report_file = self.output_path / f"training_report_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.json"
         
         report = {
             "training_session": {
                 "timestamp": datetime.now(timezone.utc).isoformat(),
+                "mode": "incremental" if incremental else "full",
                 "knowledge_sources": {
                     "total_documents": knowledge_index["total_documents"],
                     "total_context_packs": knowledge_index["total_context_packs"],
                     "sora_documents": knowledge_index["sora_documents"],
                     "pdra_documents": knowledge_index["pdra_documents"],
                     "sts_documents": knowledge_index["sts_documents"]
+                },
+                "io": knowledge_index["io"],
+                "dedup": knowledge_index["dedup"],
+                "routing": dispatch["routing"],
+                "parallel": dispatch["parallel"],
+                "telemetry": self.telemetry.to_dict(),
+                "changes": {
+                    "added": len(changes["added"]),
+                    "changed": len(changes["changed"]),
+                    "removed": len(changes["removed"]),
+                    "skipped": len(changes["skipped"])
                 }
             },
-            "agents": {
-                "SORA_Compliance_Agent": session1,
-                "Mission_Planning_Agent": session2
-            }
+            "agents": sessions
         }
         
-        report_file.write_text(json.dumps(report, indent=2))
+        report_file = write_text(report_file, json.dumps(report, indent=2), self.compression)
         print(f"\n✓ Training report saved: {report_file}")
 
 
@@ -402,13 +652,59 @@ def main():
     parser.add_argument("--output", 
                        default=str(base_path / "Tools" / "TrainingCenter" / "agent_memory"),
                        help="Output path for agent memory")
+    parser.add_argument("--config",
+                       default=str(script_path.parent / "config.yaml"),
+                       help="Path to config.yaml (agent registry and topic keywords)")
+    parser.add_argument("--io-workers", type=int, default=1,
+                       help="Concurrent file reads while loading the corpus (1 = sequential)")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Processes for document analysis (1 = in-process; output is identical)")
+    parser.add_argument("--profile-memory", choices=MEMORY_MODES, default=None,
+                       help="Peak memory per stage in the report (tracemalloc is exact but slower)")
+    parser.add_argument("--metrics-file", default=None,
+                       help="Also write stage metrics as a Prometheus textfile (e.g. skyworks_training.prom)")
+    parser.add_argument("--compress", choices=SHARED_CODECS, default="none",
+                       help="Store memory snapshots and training reports gzip-compressed")
+    parser.add_argument("--vectors", action="store_true",
+                       help="Also build hashed passage vectors for vector/fusion retrieval (needs numpy)")
+    parser.add_argument("--vector-dim", type=int, default=DEFAULT_DIM,
+                       help="Buckets per passage vector (power of two)")
+    parser.add_argument("--log-retention", type=int, default=DEFAULT_LOG_RETENTION,
+                       help="Training sessions kept in each agent's training log")
+    parser.add_argument("--store",
+                       default=str(base_path / "Tools" / "TrainingCenter" / "agent_memory" / "corpus_store"),
+                       help="Memory-mapped corpus store (used when built; see corpus_store.py)")
+    parser.add_argument("--build-store", action="store_true",
+                       help="Refresh the corpus store and dedup map before training (reads only changed files)")
+    parser.add_argument("--full", action="store_true",
+                       help="Ignore the change manifest and rebuild agent memory from scratch")
     
     args = parser.parse_args()
     
+    if args.build_store:
+        from corpus_dedup import build_dedup_map, print_stats
+        from corpus_store import build_corpus_store
+        result = build_corpus_store([Path(args.corpus), Path(args.packs)], Path(args.store),
+                                    io_workers=args.io_workers)
+        print(f"✓ Corpus store refreshed: {result['files']} files, {result['reused']} reused")
+        store = CorpusStore.open(args.store)
+        print_stats(build_dedup_map(args.corpus, Path(args.output) / DEDUP_FILE, store))
+        store.close()
+    
     orchestrator = AgentTrainingOrchestrator(
         corpus_path=args.corpus,
         context_packs_path=args.packs,
-        output_path=args.output
+        output_path=args.output,
+        full_rebuild=args.full,
+        config_path=args.config,
+        io_workers=args.io_workers,
+        log_retention=args.log_retention,
+        store_path=args.store,
+        workers=args.workers,
+        profile_memory=args.profile_memory,
+        metrics_file=args.metrics_file,
+        compression=args.compress,
+        vector_dim=args.vector_dim if args.vectors else None
     )
     
     orchestrator.run_training_session()
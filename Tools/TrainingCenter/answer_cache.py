@@ -0,0 +1,206 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Answer cache for AgentLLMService.
+
+Two tiers: an in-process LRU (OrderedDict) in front of one small JSON file
+per answer under `agent_memory/answer_cache/`, both with a TTL. Keys combine
+the agent, the normalized question, the retrieved source set and the memory
+version, so a training session that bumps the version invalidates every
+cached answer of that agent. Identical requests arriving while an answer is
+being generated wait for it instead of calling the LLM again.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_ENTRIES = 4096
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Casefold, collapse whitespace and drop trailing punctuation."""
+    return _SPACE_RE.sub(" ", question.casefold()).strip().rstrip("?!.;: ")
+
+
+def cache_key(agent_name: str, question: str, sources: Iterable[str], memory_version: Any) -> str:
+    payload = json.dumps([agent_name, normalize_question(question), sorted(set(sources)), memory_version],
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AnswerCache:
+    """Thread-safe LRU + TTL answer cache with on-disk persistence and request coalescing."""
+
+    def __init__(self, cache_dir: Optional[Path], max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.tokens_saved = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    # --- Lookup ---
+    def get_or_compute(self, key: str,
+                       compute: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+        """Return (result, status) where status is "hit", "coalesced" or "miss".
+
+        Only successful results are stored; if the generating request fails,
+        one of the waiting requests takes over and generates again.
+        """
+        if not self.enabled:
+            return compute(), "miss"
+
+        waited = False
+        while True:
+            with self._lock:
+                entry = self._get_locked(key)
+                if entry is not None:
+                    status = "coalesced" if waited else "hit"
+                    if waited:
+                        self.coalesced += 1
+                    else:
+                        self.hits += 1
+                    self.tokens_saved += entry.get("tokens_used", 0)
+                    return entry, status
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            event.wait()
+            waited = True
+
+        try:
+            result = compute()
+            if result.get("success"):
+                self.put(key, result)
+            return result, "miss"
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Plain lookup (no coalescing), counted as a hit or a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._get_locked(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.tokens_saved += entry.get("tokens_used", 0)
+            return entry
+
+    def _get_locked(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        cached = self._entries.get(key)
+        if cached is not None:
+            if now - cached[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return cached[1]
+            del self._entries[key]
+
+        stored = self._read_disk(key)
+        if stored is None:
+            return None
+        created, result = stored
+        if now - created > self.ttl_seconds:
+            self._remove_disk(key)
+            return None
+        self._remember(key, created, result)
+        return result
+
+    # --- Storing ---
+    def put(self, key: str, result: Dict[str, Any]):
+        if not self.enabled:
+            return
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, result)
+        self._write_disk(key, created, result)
+
+    def _remember(self, key: str, created: float, result: Dict[str, Any]):
+        self._entries[key] = (created, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "tokens_saved": self.tokens_saved,
+                "entries": len(self._entries)
+            }
+
+    # --- Disk tier ---
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if self.cache_dir is None:
+            return None
+        try:
+            data = json.loads(self._path(key).read_text(encoding='utf-8'))
+            return data["created"], data["result"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _remove_disk(self, key: str):
+        if self.cache_dir is not None:
+            self._path(key).unlink(missing_ok=True)
+
+    def _write_disk(self, key: str, created: float, result: Dict[str, Any]):
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps({"created": created, "result": result}, ensure_ascii=False),
+                                encoding='utf-8')
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError:
+            # The disk tier is best effort; the in-memory entry is still valid
+            pass
+
+    def _prune_disk(self):
+        files = list(self.cache_dir.glob("*.json"))
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5 — Skyworks V5: TrainingCenter Pipeline Benchmark
+
+Times the pipeline stages on deterministic synthetic SORA-like corpora
+(1k / 10k / 100k chunks):
+
+- generate_pack[txt|jsonl|csv]  stream the corpus into the config.yaml topics
+- build_knowledge_index         discover + load the corpus and context packs
+- train                         route, analyze and persist every agent
+- retrieve                      _retrieve_relevant_context for a fixed question set
+- retrieve[vector|fusion]       the same with AGENT_RETRIEVER=vector / fusion (--vectors)
+- retrieve_batch[vector]        all questions as one retrieve_many batch (--vectors)
+
+Each stage reports wall time, throughput and peak Python heap (tracemalloc;
+timings then include tracing overhead, so compare runs with the same flags).
+With --repeat N every size runs N times and each stage keeps its fastest
+run. Results go to a JSON file; with --baseline the run is compared stage
+by stage and exits 1 when a stage is slower or larger than the threshold.
+
+The txt corpus mirrors the real layout (EXTRACTED_<doc>.txt roots plus
+processed_chunks/<doc>/chunk_NNNN.txt); jsonl/csv hold the same chunks as
+records. Corpora are cached in the work directory and reused across runs.
+"""
+
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BENCH_VERSION = 1
+GENERATOR_VERSION = 1
+CHUNKS_PER_DOC = 50
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+FORMS = ("txt", "jsonl", "csv")
+
+# retrieve_batch asks every question this many times in one batch
+BATCH_REPEAT = 8
+
+QUESTIONS = [
+    "How is the intrinsic ground risk class determined for a BVLOS operation?",
+    "Which OSOs apply at SAIL IV and with what robustness?",
+    "What containment requirements apply to operations near adjacent areas?",
+    "How does PDRA-01 limit the operational volume?",
+    "What are the STS-02 requirements for airspace observers?",
+    "Which strategic mitigations can reduce the initial ARC?",
+    "What must the operation manual contain for an operational authorization?",
+    "How are M1 mitigations credited in SORA 2.5?",
+    "What tactical mitigation performance is required for ARC-c?",
+    "When is an emergency response plan required?",
+    "How is the ground buffer sized for a fixed-wing UAS?",
+    "What competency is required of the remote pilot under STS-01?",
+]
+
+_FAMILIES = ["jarus_sora_v2_5_annex", "pdra_guidelines", "sts_scenarios", "operation_manual", "easa_amc_gm"]
+_SUBJECTS = ["The operator", "The competent authority", "The remote pilot", "The applicant",
+             "The UAS manufacturer", "The airspace observer"]
+_VERBS = ["shall demonstrate", "should document", "must verify", "may claim", "is required to assess",
+          "needs to justify", "can reduce"]
+_TERMS = ["the ground risk class (GRC)", "the air risk class (ARC)", "the SAIL", "each operational safety objective",
+          "the robustness level", "containment", "tactical mitigation", "strategic mitigation",
+          "the M1 mitigation", "the emergency response plan", "the operational authorization",
+          "the adjacent area", "the operational volume", "the ground buffer", "VLOS operations",
+          "BVLOS operations", "the U-space service", "the operation manual", "the flight authorization",
+          "PDRA-01 limits", "PDRA-02 limits", "STS-01 conditions", "STS-02 conditions",
+          "integrity and assurance", "the population density", "the detect and avoid capability"]
+_TAILS = ["", " before the flight", " for the intended operation", " in accordance with Annex B",
+          " at SAIL {sail}", " when the final GRC is {grc}", " for ARC-{arc}", " under OSO #{oso:02d}",
+          " as described in Step #{step}"]
+_CONNECTORS = ["and", "before assessing", "together with", "to justify", "in addition to", "against"]
+
+
+# --- Synthetic corpus ---
+def _sentence(rng: random.Random) -> str:
+    tail = rng.choice(_TAILS).format(sail=rng.choice(["I", "II", "III", "IV", "V", "VI"]),
+                                     grc=rng.randint(1, 7), arc=rng.choice("abcd"),
+                                     oso=rng.randint(1, 24), step=rng.randint(1, 10))
+    return (f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_TERMS)} "
+            f"{rng.choice(_CONNECTORS)} {rng.choice(_TERMS)}{tail}.")
+
+
+def synthetic_chunk(rng: random.Random, doc: str, number: int) -> str:
+    """One ~1.5 KB chunk: a heading and 3-5 paragraphs of regulatory-style sentences"""
+    paragraphs = [f"## {doc.replace('_', ' ').title()} — Section {number // 10 + 1}.{number % 10 + 1}"]
+    for _ in range(rng.randint(3, 5)):
+        paragraphs.append(" ".join(_sentence(rng) for _ in range(rng.randint(2, 4))))
+    return "\n\n".join(paragraphs)
+
+
+def synthetic_documents(chunks: int, seed: int):
+    """Yield (doc_name, [chunk texts]); the same seed gives the same text in every size and form"""
+    for d in range((chunks + CHUNKS_PER_DOC - 1) // CHUNKS_PER_DOC):
+        doc = f"{_FAMILIES[d % len(_FAMILIES)]}_{d:04d}"
+        rng = random.Random(f"{seed}:{doc}")
+        count = min(CHUNKS_PER_DOC, chunks - d * CHUNKS_PER_DOC)
+        yield doc, [synthetic_chunk(rng, doc, n) for n in range(count)]
+
+
+def generate_corpus(target: Path, chunks: int, form: str, seed: int) -> Dict[str, Any]:
+    """Write a synthetic corpus in one form; returns its file/byte counts"""
+    import csv
+
+    target.mkdir(parents=True, exist_ok=True)
+    files = size = 0
+    for doc, texts in synthetic_documents(chunks, seed):
+        if form == "txt":
+            chunk_dir = target / "processed_chunks" / doc
+            chunk_dir.mkdir(parents=True, exist_ok=True)
+            for n, text in enumerate(texts):
+                path = chunk_dir / f"chunk_{n:04d}.txt"
+                path.write_text(text, encoding='utf-8')
+                size += path.stat().st_size
+            root = target / f"EXTRACTED_{doc}.txt"
+            root.write_text("\n\n".join(texts), encoding='utf-8')
+            size += root.stat().st_size
+            files += len(texts) + 1
+        elif form == "jsonl":
+            path = target / f"{doc}.jsonl"
+            with open(path, 'w', encoding='utf-8') as f:
+                for n, text in enumerate(texts):
+                    f.write(json.dumps({"text": text, "source": f"{doc}/chunk_{n:04d}"}) + "\n")
+            size += path.stat().st_size
+            files += 1
+        elif form == "csv":
+            path = target / f"{doc}.csv"
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=["text", "source"])
+                writer.writeheader()
+                for n, text in enumerate(texts):
+                    writer.writerow({"text": text, "source": f"{doc}/chunk_{n:04d}"})
+            size += path.stat().st_size
+            files += 1
+        else:
+            raise ValueError(f"unknown corpus form: {form}")
+    return {"chunks": chunks, "form": form, "files": files, "bytes": size}
+
+
+def ensure_corpus(work_dir: Path, chunks: int, form: str, seed: int) -> Tuple[Path, Dict[str, Any]]:
+    """Cached synthetic corpus (regenerated when missing or from another generator version)"""
+    target = work_dir / f"corpus_{chunks}_{form}_{seed}"
+    marker = target / ".complete.json"
+    try:
+        info = json.loads(marker.read_text(encoding='utf-8'))
+        if info.get("generator") == GENERATOR_VERSION:
+            return target, info
+    except (OSError, ValueError):
+        pass
+    if target.exists():
+        shutil.rmtree(target)
+    started = time.perf_counter()
+    info = generate_corpus(target, chunks, form, seed)
+    info.update({"generator": GENERATOR_VERSION, "seconds": round(time.perf_counter() - started, 2)})
+    marker.write_text(json.dumps(info), encoding='utf-8')
+    return target, info
+
+
+# --- Measurement ---
+def measure(fn: Callable[[], Dict[str, Any]], trace_memory: bool = True) -> Dict[str, Any]:
+    """Run one stage; fn returns {"items": n, "bytes": b, ...}"""
+    gc.collect()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        result = fn() or {}
+    seconds = time.perf_counter() - started
+
+    items = result.pop("items", 0)
+    size = result.pop("bytes", 0)
+    metrics = {
+        "seconds": round(seconds, 4),
+        "items": items,
+        "items_per_sec": round(items / seconds, 1) if seconds > 0 else 0.0,
+        "mb_per_sec": round(size / (1024 * 1024) / seconds, 2) if seconds > 0 and size else None,
+        "peak_mb": round((tracemalloc.get_traced_memory()[1] - base) / (1024 * 1024), 2) if trace_memory else None
+    }
+    metrics.update(result)
+    return metrics
+
+
+def bench_size(label: str, chunks: int, args, work_dir: Path) -> Dict[str, Any]:
+    """All stages on one corpus size"""
+    from agent_llm import AgentLLMService
+    from agent_trainer import AgentTrainingOrchestrator
+    from concurrent_loader import LoadStats
+    from keyword_scanner import KeywordScanner
+    from make_context_pack import generate_packs, iter_corpus, load_config
+    from vector_index import DEFAULT_DIM
+
+    config = load_config(args.config)
+    topics = config["topics"]
+    scanner = KeywordScanner(kw for topic in topics for kw in topic["keywords"])
+
+    run_dir = Path(tempfile.mkdtemp(prefix=f"run_{label}_", dir=work_dir))
+    memory_dir = run_dir / "Tools" / "TrainingCenter" / "agent_memory"
+    packs_dir = run_dir / "ContextPacks"
+    stages: Dict[str, Dict[str, Any]] = {}
+    corpora: Dict[str, Dict[str, Any]] = {}
+    try:
+        # Context packs, once per corpus form (the txt packs feed training)
+        for form in args.forms:
+            corpus, info = ensure_corpus(work_dir, chunks, form, args.seed)
+            corpora[form] = info
+            output = packs_dir if form == "txt" else run_dir / f"packs_{form}"
+
+            def pack_stage(corpus=corpus, output=output):
+                stats = LoadStats()
+                read = generate_packs(topics, iter_corpus(corpus, config["supported_extensions"],
+                                                          args.io_workers, stats), output, scanner)
+                stats.finish()
+                return {"items": read, "bytes": stats.bytes}
+
+            stages[f"generate_pack[{form}]"] = measure(pack_stage, args.trace_memory)
+
+        if "txt" not in args.forms:
+            return {"chunks": chunks, "corpora": corpora, "stages": stages}
+        corpus = work_dir / f"corpus_{chunks}_txt_{args.seed}"
+
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            orchestrator = AgentTrainingOrchestrator(
+                corpus_path=str(corpus), context_packs_path=str(packs_dir), output_path=str(memory_dir),
+                full_rebuild=True, config_path=args.config, io_workers=args.io_workers, workers=args.workers,
+                vector_dim=DEFAULT_DIM if args.vectors else None
+            )
+        orchestrator.manifest.reset()
+        for agent in orchestrator.agents:
+            agent.reset_memory()
+        knowledge: Dict[str, Any] = {}
+
+        def index_stage():
+            knowledge.update(orchestrator.kb.build_knowledge_index(orchestrator.manifest))
+            io = knowledge["io"] or {}
+            return {"items": knowledge["loaded_documents"] + knowledge["loaded_context_packs"],
+                    "bytes": io.get("bytes", 0)}
+
+        def train_stage():
+            dispatch = orchestrator._dispatch(knowledge)
+            for agent in orchestrator.agents:
+                agent.end_session()
+                agent.save_memory(orchestrator.output_path)
+            orchestrator.manifest.save()
+            return {"items": dispatch["routing"]["deliveries"],
+                    "speedup": dispatch["parallel"]["speedup"]}
+
+        stages["build_knowledge_index"] = measure(index_stage, args.trace_memory)
+        stages["train"] = measure(train_stage, args.trace_memory)
+        knowledge.clear()
+
+        service = AgentLLMService(str(run_dir))
+
+        def retrieve_stage(retriever="bm25"):
+            service.retriever = retriever
+            latencies = []
+            for agent in orchestrator.agents:
+                memory = service._load_agent_memory(agent.name)
+                for question in QUESTIONS:
+                    started = time.perf_counter()
+                    service._retrieve_relevant_context(question, memory)
+                    latencies.append((time.perf_counter() - started) * 1000)
+            # The first question per agent includes loading its index
+            steady = sorted(latencies[1:]) or latencies
+            return {"items": len(latencies), "first_query_ms": round(latencies[0], 2),
+                    "p50_ms": round(steady[len(steady) // 2], 3)}
+
+        def retrieve_batch_stage():
+            service.retriever = "vector"
+            questions = QUESTIONS * BATCH_REPEAT
+            started = time.perf_counter()
+            for agent in orchestrator.agents:
+                service.retrieve_many(agent.name, questions)
+            seconds = time.perf_counter() - started
+            items = len(questions) * len(orchestrator.agents)
+            return {"items": items, "per_query_ms": round(seconds * 1000 / items, 3)}
+
+        stages["retrieve"] = measure(retrieve_stage, args.trace_memory)
+        if args.vectors:
+            for retriever in ("vector", "fusion"):
+                stages[f"retrieve[{retriever}]"] = measure(lambda: retrieve_stage(retriever), args.trace_memory)
+            stages["retrieve_batch[vector]"] = measure(retrieve_batch_stage, args.trace_memory)
+    finally:
+        if not args.keep:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    return {"chunks": chunks, "corpora": corpora, "stages": stages}
+
+
+def best_of(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge repeated runs of one size: each stage keeps its fastest run"""
+    best = dict(runs[0], stages={})
+    for stage in runs[0]["stages"]:
+        timings = [run["stages"][stage] for run in runs]
+        fastest = min(timings, key=lambda m: m["seconds"])
+        best["stages"][stage] = dict(fastest, runs=[m["seconds"] for m in timings]) if len(runs) > 1 else fastest
+    return best
+
+
+# --- Baseline comparison ---
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            min_seconds: float = 0.25, min_peak_mb: float = 1.0) -> List[Dict[str, Any]]:
+    """Per-stage ratios against a baseline run; `regression` marks what exceeds the threshold"""
+    rows = []
+    for label, result in current["results"].items():
+        base_result = baseline.get("results", {}).get(label)
+        if base_result is None:
+            continue
+        for stage, metrics in result["stages"].items():
+            base = base_result["stages"].get(stage)
+            if base is None:
+                continue
+            row = {"size": label, "stage": stage, "regression": []}
+            if base["seconds"] > 0:
+                row["time_ratio"] = round(metrics["seconds"] / base["seconds"], 3)
+                # Tiny stages are all noise
+                if row["time_ratio"] > 1 + threshold and metrics["seconds"] >= min_seconds:
+                    row["regression"].append("time")
+            if base.get("peak_mb") and metrics.get("peak_mb") is not None:
+                row["memory_ratio"] = round(metrics["peak_mb"] / base["peak_mb"], 3)
+                if row["memory_ratio"] > 1 + threshold and metrics["peak_mb"] >= min_peak_mb:
+                    row["regression"].append("memory")
+            rows.append(row)
+    return rows
+
+
+def print_results(results: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None):
+    ratios = {(row["size"], row["stage"]): row for row in comparison or []}
+    for label, result in results.items():
+        print(f"\n━━━ {label} chunks ━━━")
+        print(f"{'stage':<24}{'seconds':>10}{'items/s':>12}{'MB/s':>9}{'peak MB':>10}  vs baseline")
+        for stage, m in result["stages"].items():
+            row = ratios.get((label, stage))
+            versus = ""
+            if row is not None:
+                versus = f"time x{row.get('time_ratio', '-')}"
+                if "memory_ratio" in row:
+                    versus += f", mem x{row['memory_ratio']}"
+                versus = ("✗ " if row["regression"] else "✓ ") + versus
+            mb = f"{m['mb_per_sec']:.1f}" if m["mb_per_sec"] is not None else "-"
+            peak = f"{m['peak_mb']:.1f}" if m["peak_mb"] is not None else "-"
+            print(f"{stage:<24}{m['seconds']:>10.3f}{m['items_per_sec']:>12,.0f}{mb:>9}{peak:>10}  {versus}")
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    script_path = Path(__file__).resolve()
+    base_path = script_path.parent.parent.parent
+
+    parser = argparse.ArgumentParser(description="Benchmark the TrainingCenter pipeline on synthetic corpora")
+    parser.add_argument("--sizes", default="1k,10k",
+                       help=f"Corpus sizes in chunks ({', '.join(SIZES)} or a number)")
+    parser.add_argument("--forms", default=",".join(FORMS),
+                       help="Corpus forms for generate_pack (txt also drives index/train/retrieve)")
+    parser.add_argument("--seed", type=int, default=2025,
+                       help="Synthetic corpus seed")
+    parser.add_argument("--config", default=str(script_path.parent / "config.yaml"),
+                       help="Path to config.yaml (topics and agents)")
+    parser.add_argument("--work-dir", default=str(Path(tempfile.gettempdir()) / "skyworks_benchmark"),
+                       help="Where synthetic corpora are generated (and cached) and stages run")
+    parser.add_argument("--output",
+                       default=str(base_path / "Tools" / "TrainingCenter" / "agent_memory" / "benchmarks"
+                                   / f"benchmark_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.json"),
+                       help="Results JSON")
+    parser.add_argument("--baseline", default=None,
+                       help="Previous results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                       help="Allowed slowdown / memory growth per stage (0.2 = 20%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.25,
+                       help="Stages faster than this are never flagged as time regressions (noise)")
+    parser.add_argument("--repeat", type=int, default=1,
+                       help="Runs per size; each stage keeps its fastest run")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Training processes (agent_trainer --workers)")
+    parser.add_argument("--io-workers", type=int, default=1,
+                       help="Concurrent file reads")
+    parser.add_argument("--vectors", action="store_true",
+                       help="Also build passage vectors while training and time vector/fusion retrieval (needs numpy)")
+    parser.add_argument("--no-memory", dest="trace_memory", action="store_false",
+                       help="Skip tracemalloc (faster stages, no peak memory)")
+    parser.add_argument("--keep", action="store_true",
+                       help="Keep the per-run output (packs, agent memory) in the work dir")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(script_path.parent))
+    sizes = []
+    for label in args.sizes.split(","):
+        label = label.strip()
+        sizes.append((label, SIZES[label] if label in SIZES else int(label)))
+    args.forms = [form.strip() for form in args.forms.split(",") if form.strip()]
+    unknown = set(args.forms) - set(FORMS)
+    if unknown:
+        parser.error(f"unknown forms: {', '.join(sorted(unknown))}")
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    
+    print("━━━ TrainingCenter Benchmark ━━━")
+    print(f"Sizes: {', '.join(label for label, _ in sizes)} | forms: {', '.join(args.forms)} | "
+          f"workers={args.workers} | memory tracing={'on' if args.trace_memory else 'off'}")
+    if args.trace_memory:
+        tracemalloc.start()
+
+    results = {}
+    for label, chunks in sizes:
+        print(f"… {label}: {chunks:,} chunks")
+        runs = [bench_size(label, chunks, args, work_dir) for _ in range(args.repeat)]
+        results[label] = best_of(runs)
+
+    report = {
+        "version": BENCH_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers,
+            "io_workers": args.io_workers,
+            "trace_memory": args.trace_memory,
+            "vectors": args.vectors,
+            "repeat": args.repeat,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+    comparison = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        if baseline.get("environment", {}).get("trace_memory") != args.trace_memory:
+            print("⚠ Baseline was recorded with different memory tracing; timings are not comparable")
+        if baseline.get("environment", {}).get("vectors", False) != args.vectors:
+            print("⚠ Baseline was recorded with different --vectors; train timings are not comparable")
+        comparison = compare(report, baseline, args.threshold, args.min_seconds)
+        report["baseline"] = {"file": str(args.baseline), "threshold": args.threshold, "stages": comparison}
+
+    print_results(results, comparison)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output.with_suffix(output.suffix + ".tmp")
+    tmp_file.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    os.replace(tmp_file, output)
+    print(f"\n✓ Results: {output}")
+
+    regressions = [row for row in comparison or [] if row["regression"]]
+    if regressions:
+        for row in regressions:
+            print(f"✗ Regression: {row['size']} {row['stage']} ({', '.join(row['regression'])})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# Phase1 Step5 — Skyworks V5
+"""
+BM25 passage index for agent retrieval.
+
+Documents are split into paragraph-aligned passages at training time and
+indexed in an inverted index (term -> {passage: tf}). The index is persisted
+next to the agent memory (`<agent>_bm25.json`) and queried by AgentLLMService;
+top-k passages come from a heap over the accumulated scores.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"\w+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+STOPWORDS = frozenset(
+    "the and for are was were with that this from into over under shall should "
+    "may can will not but all any its their there which what when where who how "
+    "is of to in on at by or as be an if it do does".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Casefolded word tokens; keeps short numbers (GRC 3) but drops stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.casefold())
+            if (len(t) > 1 or t.isdigit()) and t not in STOPWORDS]
+
+
+def split_passages(text: str, target_chars: int = 1200) -> List[Tuple[int, int]]:
+    """Split text into paragraph-aligned (start, end) spans of roughly target_chars."""
+    spans = []
+    start = None
+    end = 0
+    pos = 0
+    for match in list(_PARAGRAPH_RE.finditer(text)) + [None]:
+        para_end = match.start() if match else len(text)
+        if text[pos:para_end].strip():
+            if start is None:
+                start = pos
+            end = para_end
+            if end - start >= target_chars:
+                spans.extend(_hard_split(start, end, target_chars))
+                start = None
+        pos = match.end() if match else len(text)
+    if start is not None:
+        spans.extend(_hard_split(start, end, target_chars))
+    return spans
+
+
+def _hard_split(start: int, end: int, target_chars: int) -> List[Tuple[int, int]]:
+    # Oversized paragraphs are cut into fixed windows
+    limit = target_chars * 2
+    if end - start <= limit:
+        return [(start, end)]
+    return [(s, min(s + target_chars, end)) for s in range(start, end, target_chars)]
+
+
+def analyze_passages(text: str, passage_chars: int = 1200) -> List[List[Any]]:
+    """[start, end, n_tokens, {term: tf}] for every non-empty passage (pure; safe in worker processes)."""
+    analyzed = []
+    for start, end in split_passages(text, passage_chars):
+        tokens = tokenize(text[start:end])
+        if not tokens:
+            continue
+        tf: Dict[str, int] = {}
+        for token in tokens:
+            tf[token] = tf.get(token, 0) + 1
+        analyzed.append([start, end, len(tokens), tf])
+    return analyzed
+
+
+class BM25Index:
+    """Incrementally maintained BM25 inverted index over document passages."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, passage_chars: int = 1200):
+        self.k1 = k1
+        self.b = b
+        self.passage_chars = passage_chars
+        self.sources: Dict[str, str] = {}                 # source -> file path
+        self.passages: List[Optional[List[Any]]] = []     # [source, start, end, n_tokens] or None
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self._by_source: Dict[str, List[int]] = {}
+        self._total_tokens = 0
+        self._live = 0
+
+    # --- Building ---
+    def add_document(self, source: str, text: str, path: Optional[str] = None):
+        """Index (or re-index) one document's passages."""
+        self.add_analyzed(source, analyze_passages(text, self.passage_chars), path)
+    
+    def add_analyzed(self, source: str, analyzed: List[List[Any]], path: Optional[str] = None):
+        """Index (or re-index) passages produced by analyze_passages()."""
+        if source in self._by_source:
+            self.remove_sources([source])
+        self.sources[source] = str(path) if path else ""
+        ids = []
+        for start, end, n_tokens, tf in analyzed:
+            pid = len(self.passages)
+            self.passages.append([source, start, end, n_tokens])
+            ids.append(pid)
+            self._total_tokens += n_tokens
+            self._live += 1
+            for term, n in tf.items():
+                self.postings.setdefault(term, {})[pid] = n
+        self._by_source[source] = ids
+
+    def remove_sources(self, sources: Iterable[str]):
+        """Drop every passage of the given sources (one pass over the postings)."""
+        dead = set()
+        for source in sources:
+            for pid in self._by_source.pop(source, []):
+                passage = self.passages[pid]
+                if passage is not None:
+                    self._total_tokens -= passage[3]
+                    self._live -= 1
+                    self.passages[pid] = None
+                    dead.add(pid)
+            self.sources.pop(source, None)
+        if not dead:
+            return
+        for term in list(self.postings):
+            plist = self.postings[term]
+            for pid in dead.intersection(plist):
+                del plist[pid]
+            if not plist:
+                del self.postings[term]
+
+    def compact(self):
+        """Renumber passages so removed ones leave no holes."""
+        if self._live == len(self.passages):
+            return
+        remap = {}
+        passages = []
+        for pid, passage in enumerate(self.passages):
+            if passage is not None:
+                remap[pid] = len(passages)
+                passages.append(passage)
+        self.passages = passages
+        self.postings = {term: {remap[pid]: tf for pid, tf in plist.items()}
+                         for term, plist in self.postings.items()}
+        self._rebuild_source_map()
+
+    def _rebuild_source_map(self):
+        self._by_source = {}
+        for pid, passage in enumerate(self.passages):
+            if passage is not None:
+                self._by_source.setdefault(passage[0], []).append(pid)
+
+    # --- Querying ---
+    def __len__(self) -> int:
+        return self._live
+
+    def df(self, term: str) -> int:
+        """Number of passages containing `term`."""
+        return len(self.postings.get(term, ()))
+
+    def passage_info(self, pid: int) -> Dict[str, Any]:
+        source, start, end, _ = self.passages[pid]
+        return {"passage_id": pid, "source": source, "path": self.sources.get(source, ""),
+                "start": start, "end": end}
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k passages for a free-text query, best first."""
+        if not self._live:
+            return []
+        n = self._live
+        avgdl = self._total_tokens / n
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            df = len(plist)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for pid, tf in plist.items():
+                dl = self.passages[pid][3]
+                s = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+                scores[pid] = scores.get(pid, 0.0) + s
+
+        return [dict(self.passage_info(pid), score=round(score, 4))
+                for pid, score in heapq.nlargest(k, scores.items(), key=itemgetter(1))]
+
+    # --- Persistence ---
+    def save(self, index_file: Path):
+        """Write the compacted index atomically."""
+        self.compact()
+        data = {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "passage_chars": self.passage_chars,
+            "sources": self.sources,
+            "passages": self.passages,
+            # Flattened [pid, tf, pid, tf, ...] keeps the file compact
+            "postings": {term: [x for item in plist.items() for x in item]
+                         for term, plist in self.postings.items()}
+        }
+        index_file = Path(index_file)
+        tmp_file = index_file.with_suffix(index_file.suffix + ".tmp")
+        tmp_file.write_text(json.dumps(data, separators=(",", ":")), encoding='utf-8')
+        os.replace(tmp_file, index_file)
+
+    @classmethod
+    def load(cls, index_file: Path) -> Optional["BM25Index"]:
+        """Load a persisted index; None if missing or from another version."""
+        index_file = Path(index_file)
+        if not index_file.exists():
+            return None
+        data = json.loads(index_file.read_text(encoding='utf-8'))
+        if data.get("version") != INDEX_VERSION:
+            return None
+        index = cls(data["k1"], data["b"], data["passage_chars"])
+        index.sources = data["sources"]
+        index.passages = data["passages"]
+        index.postings = {term: dict(zip(flat[::2], flat[1::2]))
+                          for term, flat in data["postings"].items()}
+        index._live = len(index.passages)
+        index._total_tokens = sum(p[3] for p in index.passages)
+        index._rebuild_source_map()
+        return index
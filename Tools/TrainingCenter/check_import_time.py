@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5 — Skyworks V5: Import-time Budget Check
+
+Every CLI call of agent_llm.py / agent_trainer.py pays its import time
+before doing any work. This check runs `python -X importtime` in a fresh
+interpreter for each entry module and fails (exit 1) when
+
+- the module's cumulative import time (best of --runs) exceeds its budget, or
+- a heavy module that must stay deferred is imported at startup.
+
+The same checks run under pytest (tests/test_import_time.py).
+
+Usage:
+    py -3 Tools/TrainingCenter/check_import_time.py
+    py -3 Tools/TrainingCenter/check_import_time.py --scale 2    # slower CI machine
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Cumulative import time per entry module, in milliseconds
+BUDGETS_MS = {
+    "agent_llm": 120,
+    "agent_trainer": 120,
+}
+
+# Only needed by optional paths (workers, profiling, compression, Azure, mock faults, exact token counts)
+DEFERRED = ("yaml", "openai", "tracemalloc", "multiprocessing", "concurrent.futures",
+            "gzip", "lzma", "zstandard", "random", "numpy", "tiktoken")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str, cwd: Path) -> Tuple[float, List[str]]:
+    """(cumulative ms, modules imported by `module`) for importing it in a fresh interpreter.
+
+    importtime prints children before their parent, so the entry module's
+    subtree is every line since the previous top-level import. Whatever the
+    interpreter loaded at startup (site, .pth hooks, sitecustomize) is not
+    counted against the module.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    subtree: List[str] = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        subtree.append(match.group(4))
+        if len(match.group(3)) <= 1:   # top-level import
+            if match.group(4) == module:
+                return int(match.group(2)) / 1000, subtree
+            subtree = []
+    raise RuntimeError(f"no importtime line for {module}")
+
+
+def deferred_imports(imported: List[str]) -> List[str]:
+    """Modules in `imported` that must stay deferred (DEFERRED or their submodules)."""
+    return sorted({name for name in imported
+                   for heavy in DEFERRED if name == heavy or name.startswith(heavy + ".")})
+
+
+def check(budgets: Dict[str, float], runs: int, scale: float) -> bool:
+    script_dir = Path(__file__).resolve().parent
+    ok = True
+    for module, budget in budgets.items():
+        timings = []
+        imported: List[str] = []
+        for _ in range(runs):
+            ms, imported = measure(module, script_dir)
+            timings.append(ms)
+        best = min(timings)
+        limit = budget * scale
+        status = "✓" if best <= limit else "✗"
+        ok = ok and best <= limit
+        print(f"{status} {module}: {best:.1f} ms (budget {limit:.0f} ms, best of {runs})")
+        eager = deferred_imports(imported)
+        if eager:
+            ok = False
+            print(f"✗ {module} imports deferred modules at startup: {', '.join(eager)}")
+    return ok
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the TrainingCenter CLIs")
+    parser.add_argument("--runs", type=int, default=5,
+                       help="Fresh interpreters per module (the fastest run counts)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                       help="Multiply every budget (e.g. 2 on a slow machine)")
+    args = parser.parse_args()
+
+    print("━━━ Import-time Budget ━━━")
+    if not check(BUDGETS_MS, args.runs, args.scale):
+        sys.exit(1)
+    print("✓ All entry modules within budget")
+
+
+if __name__ == "__main__":
+    main()
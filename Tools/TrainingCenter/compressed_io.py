@@ -0,0 +1,144 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Optional compressed storage for Training Center artifacts.
+
+Context packs, memory snapshots/segments and training reports may be stored
+as gzip (`.gz`), xz (`.xz`, stdlib lzma) or zstd (`.zst`, needs the
+`zstandard` package). The codec is chosen by the writer and recognised by
+readers from the file suffix; both sides stream through the codec, so a
+file is never held compressed and decompressed in memory at once.
+
+    with open_text(path) as f:                   # plain or compressed, by suffix
+        data = json.load(f)
+    pack = resolve(topic_dir / "pack.md")        # pack.md, pack.md.gz, ... whichever is current
+    with atomic_writer(topic_dir / "pack.md", "gz") as f:
+        f.write(text)                            # -> pack.md.gz, plain pack.md removed
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Union
+
+CODECS = ("none", "gz", "xz", "zst")
+# What the CLIs offer for packs, memory and reports: the VS Code extension and
+# the .NET API read these files too and only understand plain and gzip
+SHARED_CODECS = ("none", "gz")
+SUFFIXES = {"gz": ".gz", "xz": ".xz", "zst": ".zst"}
+
+PathLike = Union[str, Path]
+
+
+def _zstandard():
+    # Codec modules are imported on first use: plain storage never needs them
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def check_codec(codec: Optional[str]) -> Optional[str]:
+    """Normalise a codec name ("none" -> None); ValueError if unknown or unavailable"""
+    if codec in (None, "", "none"):
+        return None
+    if codec not in SUFFIXES:
+        raise ValueError(f"unknown codec {codec!r} (expected one of {', '.join(CODECS)})")
+    if codec == "zst" and _zstandard() is None:
+        raise ValueError("zstd storage needs the 'zstandard' package (pip install zstandard)")
+    return codec
+
+
+def codec_of(path: PathLike) -> Optional[str]:
+    suffix = Path(path).suffix
+    for codec, codec_suffix in SUFFIXES.items():
+        if suffix == codec_suffix:
+            return codec
+    return None
+
+
+def compressed_path(path: PathLike, codec: Optional[str]) -> Path:
+    """Where `path` is stored with `codec` (unchanged for plain storage)"""
+    path = Path(path)
+    codec = check_codec(codec)
+    return path.with_name(path.name + SUFFIXES[codec]) if codec else path
+
+
+def variants(path: PathLike) -> List[Path]:
+    """Every name `path` may be stored under"""
+    path = Path(path)
+    return [path] + [path.with_name(path.name + suffix) for suffix in SUFFIXES.values()]
+
+
+def resolve(path: PathLike) -> Optional[Path]:
+    """The stored variant of `path`; the newest one if a switch of codec left two"""
+    found = []
+    for candidate in variants(path):
+        try:
+            found.append((candidate.stat().st_mtime_ns, candidate))
+        except OSError:
+            continue
+    return max(found)[1] if found else None
+
+
+def remove_variants(path: PathLike, keep: Optional[Path] = None):
+    for candidate in variants(path):
+        if candidate != keep:
+            try:
+                candidate.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _open(path: PathLike, mode: str, codec: Optional[str], errors: Optional[str] = None) -> IO[str]:
+    if codec is None:
+        return open(path, mode, encoding='utf-8', errors=errors)
+    text_mode = mode if "t" in mode else mode + "t"
+    if codec == "gz":
+        import gzip
+        # Level 6: nearly the ratio of 9 at a fraction of the CPU
+        return gzip.open(path, text_mode, compresslevel=6, encoding='utf-8', errors=errors)
+    if codec == "xz":
+        import lzma
+        return lzma.open(path, text_mode, encoding='utf-8', errors=errors)
+    zstandard = _zstandard()
+    if zstandard is None:
+        raise OSError(f"{path}: zstd storage needs the 'zstandard' package")
+    return zstandard.open(path, text_mode, encoding='utf-8', errors=errors)
+
+
+def open_text(path: PathLike, mode: str = "r", errors: Optional[str] = None) -> IO[str]:
+    """Open a plain or compressed text file (codec from the suffix)"""
+    return _open(path, mode, codec_of(path), errors)
+
+
+def read_text(path: PathLike, errors: Optional[str] = None) -> str:
+    with open_text(path, errors=errors) as f:
+        return f.read()
+
+
+@contextmanager
+def atomic_writer(path: PathLike, codec: Optional[str] = None) -> Iterator[IO[str]]:
+    """Stream text to `path` (+ codec suffix) via a temp file and rename.
+
+    Once the new file is in place, variants stored with another codec are removed.
+    """
+    final = compressed_path(path, codec)
+    tmp_path = final.with_name(final.name + ".tmp")
+    f = _open(tmp_path, "w", check_codec(codec))
+    try:
+        yield f
+    except BaseException:
+        f.close()
+        tmp_path.unlink()
+        raise
+    f.close()
+    os.replace(tmp_path, final)
+    remove_variants(path, keep=final)
+
+
+def write_text(path: PathLike, text: str, codec: Optional[str] = None) -> Path:
+    """Atomically write `text`; returns the stored path"""
+    with atomic_writer(path, codec) as f:
+        f.write(text)
+    return compressed_path(path, codec)
@@ -0,0 +1,115 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Bounded concurrent file loader for the Training Center tools.
+
+Reads many small corpus files through a thread pool while keeping results in
+input order and at most `window` reads in flight. Designed for network-mounted
+KnowledgeBase folders where per-file latency, not CPU, dominates a run.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class LoadStats:
+    """Thread-safe throughput counters (files/sec, MB/sec)."""
+
+    def __init__(self):
+        self.files = 0
+        self.errors = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._elapsed: Optional[float] = None
+
+    def add_bytes(self, n: int):
+        with self._lock:
+            self.bytes += n
+
+    def file_done(self, ok: bool = True):
+        with self._lock:
+            self.files += 1
+            if not ok:
+                self.errors += 1
+
+    def finish(self):
+        self._elapsed = time.perf_counter() - self._started
+
+    @property
+    def elapsed(self) -> float:
+        if self._elapsed is not None:
+            return self._elapsed
+        return time.perf_counter() - self._started
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.bytes / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "seconds": round(self.elapsed, 3),
+            "files_per_sec": round(self.files_per_sec, 1),
+            "mb_per_sec": round(self.mb_per_sec, 2)
+        }
+
+    def summary(self) -> str:
+        return (f"{self.files} files, {self.bytes / (1024 * 1024):.1f} MB in {self.elapsed:.2f}s "
+                f"({self.files_per_sec:.0f} files/s, {self.mb_per_sec:.1f} MB/s)")
+
+
+def load_files(items: Iterable[Any], reader: Callable[[Any], Any], workers: int = 1,
+               window: Optional[int] = None,
+               stats: Optional[LoadStats] = None) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+    """Yield (item, result, error) for every item, in input order.
+
+    With ``workers > 1`` reads run on a thread pool with at most ``window``
+    (default ``4 * workers``) outstanding futures, so memory stays bounded
+    however many files there are. A failing read yields its exception
+    instead of aborting the whole load.
+    """
+    def run(item):
+        try:
+            return reader(item), None
+        except Exception as e:
+            return None, e
+
+    if workers <= 1:
+        for item in items:
+            result, error = run(item)
+            if stats is not None:
+                stats.file_done(error is None)
+            yield item, result, error
+        return
+
+    from concurrent.futures import ThreadPoolExecutor  # Only needed for concurrent reads
+    window = max(window or workers * 4, 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="corpus-io") as pool:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append((item, pool.submit(run, item)))
+                if len(pending) >= window:
+                    done_item, future = pending.popleft()
+                    result, error = future.result()
+                    if stats is not None:
+                        stats.file_done(error is None)
+                    yield done_item, result, error
+            while pending:
+                done_item, future = pending.popleft()
+                result, error = future.result()
+                if stats is not None:
+                    stats.file_done(error is None)
+                yield done_item, result, error
+        finally:
+            # Consumer stopped early: drop reads that have not started yet
+            for _, future in pending:
+                future.cancel()
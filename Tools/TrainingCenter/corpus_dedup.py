@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5 — Skyworks V5: Corpus Deduplication
+
+Most chunked documents exist twice in the corpus: as the root
+`EXTRACTED_*.txt` file and as its split `processed_chunks/<doc>/chunk_*.txt`.
+This stage runs once at ingestion and writes `agent_memory/corpus_dedup.json`,
+mapping every redundant file to its canonical copy:
+
+- exact      identical text after whitespace normalization (SHA-256)
+- split      a root document covered by its chunks; the chunks are canonical
+- contained  a chunk whose text lies inside a root document that is kept
+- near       SimHash (64 bit, Hamming distance <= 3) over word shingles
+
+Training, pack generation and retrieval skip redundant files while the
+recorded size/mtime of both the file and its canonical copy still match.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from corpus_store import CorpusStore, decode_text, store_key
+
+DEDUP_VERSION = 1
+DEDUP_FILE = "corpus_dedup.json"
+
+SHINGLE_WORDS = 8         # containment shingles
+SAMPLE_MOD = 8            # keep shingles whose hash % SAMPLE_MOD == 0
+CONTAINED_RATIO = 0.8     # share of a chunk's shingles found in a root document
+SPLIT_COVERAGE = 0.9      # share of a root document covered by its chunks
+SIMHASH_FEATURES = 128    # bottom-k shingles feeding the SimHash
+SIMHASH_DISTANCE = 3
+
+
+def sampled_shingles(words: List[str], size: int = SHINGLE_WORDS, mod: int = SAMPLE_MOD) -> Set[int]:
+    """Hashes of word n-grams, mod-sampled (an unbiased containment estimate)."""
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode('utf-8'))} if words else set()
+    hashes = (zlib.crc32(" ".join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1))
+    return {h for h in hashes if h % mod == 0}
+
+
+def simhash(words: List[str], k: int = SIMHASH_FEATURES) -> int:
+    """64-bit SimHash over the k smallest word-trigram hashes."""
+    grams = {zlib.crc32(" ".join(words[i:i + 3]).encode('utf-8')) for i in range(max(len(words) - 2, 1))}
+    features = [int.from_bytes(hashlib.blake2b(g.to_bytes(4, 'little'), digest_size=8).digest(), 'little')
+                for g in sorted(grams)[:k]]
+    half = len(features) / 2
+    value = 0
+    for bit in range(64):
+        if sum((f >> bit) & 1 for f in features) > half:
+            value |= 1 << bit
+    return value
+
+
+def _is_chunk(path: Path, corpus_dir: Path) -> bool:
+    return path.parent != corpus_dir
+
+
+def _preference(path: Path, corpus_dir: Path, length: int) -> Tuple[int, int, str]:
+    # Chunks first (precise excerpts), then the longer text, then path order
+    return (0 if _is_chunk(path, corpus_dir) else 1, -length, str(path))
+
+
+def build_dedup_map(corpus_path: Union[str, Path], output_file: Union[str, Path],
+                    store: Optional[CorpusStore] = None,
+                    extensions: Iterable[str] = ('.txt', '.md')) -> Dict[str, Any]:
+    """Scan the corpus, write the canonical-ID mapping and return its stats."""
+    corpus_dir = Path(os.path.abspath(corpus_path))
+    paths = sorted({p for ext in extensions for p in corpus_dir.rglob(f"*{ext}") if p.is_file()})
+
+    info: Dict[str, Dict[str, Any]] = {}
+    shingles: Dict[str, Set[int]] = {}
+    by_hash: Dict[str, List[str]] = {}
+    for path in paths:
+        key = store_key(path)
+        text = store.text(path) if store is not None else None
+        if text is None:
+            text, _ = decode_text(path.read_bytes())
+        st = path.stat()
+        # Signatures only: the text itself is not kept
+        words = text.split()
+        info[key] = {"path": path, "bytes": len(text.encode('utf-8')), "chars": len(text),
+                     "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                     "simhash": simhash(words) if len(words) >= 3 else None}
+        shingles[key] = sampled_shingles(words)
+        digest = hashlib.sha256(" ".join(words).encode('utf-8')).hexdigest()
+        by_hash.setdefault(digest, []).append(key)
+
+    duplicates: Dict[str, Dict[str, Any]] = {}
+
+    def prefer(keys):
+        return min(keys, key=lambda k: _preference(info[k]["path"], corpus_dir, info[k]["chars"]))
+
+    # 1. Exact duplicates
+    for keys in by_hash.values():
+        if len(keys) > 1:
+            canonical = prefer(keys)
+            for key in keys:
+                if key != canonical:
+                    duplicates[key] = {"canonical": [canonical], "kind": "exact", "similarity": 1.0}
+
+    live = [k for k in info if k not in duplicates]
+
+    # 2. Chunks inside root documents (containment over sampled shingles)
+    roots = {k for k in live if not _is_chunk(info[k]["path"], corpus_dir)}
+    postings: Dict[int, List[str]] = {}
+    for root in roots:
+        for h in shingles[root]:
+            postings.setdefault(h, []).append(root)
+
+    members: Dict[str, List[Tuple[str, float]]] = {}
+    for key in live:
+        if key in roots or not shingles[key]:
+            continue
+        overlap: Dict[str, int] = {}
+        for h in shingles[key]:
+            for root in postings.get(h, ()):
+                overlap[root] = overlap.get(root, 0) + 1
+        if overlap:
+            root, shared = max(overlap.items(), key=lambda kv: (kv[1], kv[0]))
+            ratio = shared / len(shingles[key])
+            if ratio >= CONTAINED_RATIO:
+                members.setdefault(root, []).append((key, ratio))
+
+    for root, chunks in members.items():
+        covered = set()
+        for key, _ in chunks:
+            covered |= shingles[key]
+        coverage = len(covered & shingles[root]) / len(shingles[root]) if shingles[root] else 0.0
+        if coverage >= SPLIT_COVERAGE:
+            duplicates[root] = {"canonical": sorted(k for k, _ in chunks), "kind": "split",
+                                "similarity": round(coverage, 3)}
+        else:
+            for key, ratio in chunks:
+                duplicates[key] = {"canonical": [root], "kind": "contained", "similarity": round(ratio, 3)}
+
+    # 3. Near duplicates among what is left (SimHash, 4 x 16-bit bands).
+    # Leaders in preference order: each document joins the closest leader
+    # within SIMHASH_DISTANCE, so A~B~C never chains A and C together.
+    live = [k for k in info if k not in duplicates]
+    hashes = {k: info[k]["simhash"] for k in live if info[k]["simhash"] is not None}
+    leader_bands: Dict[Tuple[int, int], List[str]] = {}
+    for key in sorted(hashes, key=lambda k: _preference(info[k]["path"], corpus_dir, info[k]["chars"])):
+        value = hashes[key]
+        keys = [(band, (value >> (16 * band)) & 0xFFFF) for band in range(4)]
+        best = None
+        for leader in {l for band in keys for l in leader_bands.get(band, ())}:
+            distance = bin(value ^ hashes[leader]).count("1")
+            if distance <= SIMHASH_DISTANCE and (best is None or (distance, leader) < best):
+                best = (distance, leader)
+        if best is None:
+            for band in keys:
+                leader_bands.setdefault(band, []).append(key)
+        else:
+            distance, leader = best
+            duplicates[key] = {"canonical": [leader], "kind": "near",
+                               "similarity": round(1 - distance / 64, 3)}
+
+    # Record stats of every file involved, so stale mappings can be detected
+    involved = set(duplicates)
+    for dup in duplicates.values():
+        involved.update(dup["canonical"])
+    files = {key: [info[key]["size"], info[key]["mtime_ns"]] for key in sorted(involved)}
+
+    kinds = {}
+    for dup in duplicates.values():
+        kinds[dup["kind"]] = kinds.get(dup["kind"], 0) + 1
+    stats = {
+        "documents": len(info),
+        "duplicates": len(duplicates),
+        "kinds": kinds,
+        "bytes_total": sum(i["bytes"] for i in info.values()),
+        "bytes_saved": sum(info[k]["bytes"] for k in duplicates),
+    }
+
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_suffix(output_file.suffix + ".tmp")
+    tmp_file.write_text(json.dumps({
+        "version": DEDUP_VERSION,
+        "built": datetime.now(timezone.utc).isoformat(),
+        "corpus": str(corpus_dir),
+        "stats": stats,
+        "duplicates": duplicates,
+        "files": files
+    }, indent=1), encoding='utf-8')
+    os.replace(tmp_file, output_file)
+    return stats
+
+
+class DedupMap:
+    """Loaded canonical-ID mapping; answers whether a file can be skipped."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.stats = data.get("stats", {})
+        self.duplicates: Dict[str, Dict[str, Any]] = data.get("duplicates", {})
+        self.files: Dict[str, List[int]] = data.get("files", {})
+
+    @classmethod
+    def load(cls, dedup_file: Union[str, Path]) -> Optional["DedupMap"]:
+        try:
+            data = json.loads(Path(dedup_file).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        return cls(data) if data.get("version") == DEDUP_VERSION else None
+
+    def _current(self, key: str) -> bool:
+        recorded = self.files.get(key)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return False
+        return recorded is not None and recorded == [st.st_size, st.st_mtime_ns]
+
+    def canonical(self, path: Union[str, Path]) -> Optional[List[str]]:
+        """Canonical paths of a redundant file, or None if it must be kept."""
+        key = store_key(path)
+        dup = self.duplicates.get(key)
+        if dup is None:
+            return None
+        if not self._current(key) or not all(self._current(c) for c in dup["canonical"]):
+            return None
+        return dup["canonical"]
+
+    def is_redundant(self, path: Union[str, Path]) -> bool:
+        return self.canonical(path) is not None
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    script_path = Path(__file__).resolve()
+    base_path = script_path.parent.parent.parent
+    memory_dir = base_path / "Tools" / "TrainingCenter" / "agent_memory"
+
+    parser = argparse.ArgumentParser(description="Detect duplicate documents in the SKYWORKS corpus")
+    parser.add_argument("--corpus",
+                       default=str(base_path / "KnowledgeBase" / "EASA DOCS SPLIT CHUNKS"),
+                       help="Path to EASA corpus")
+    parser.add_argument("--store", default=str(memory_dir / "corpus_store"),
+                       help="Corpus store to read from (when built)")
+    parser.add_argument("--output", default=str(memory_dir / DEDUP_FILE),
+                       help="Where to write the canonical-ID mapping")
+    args = parser.parse_args()
+
+    print("━━━ Corpus Deduplication ━━━")
+    store = CorpusStore.open(args.store)
+    stats = build_dedup_map(args.corpus, args.output, store)
+    print_stats(stats)
+    print(f"✓ Mapping: {args.output}")
+
+
+def print_stats(stats: Dict[str, Any]):
+    kinds = ", ".join(f"{n} {kind}" for kind, n in sorted(stats["kinds"].items())) or "none"
+    print(f"✓ {stats['duplicates']} of {stats['documents']} documents redundant ({kinds})")
+    print(f"✓ Saved {stats['bytes_saved'] / (1024 * 1024):.2f} MB of "
+          f"{stats['bytes_total'] / (1024 * 1024):.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5.2 — Skyworks V5: Corpus Change Manifest
+
+Tracks every file the agents were trained on (path, size, mtime, content hash)
+so a scheduled training session only loads and retrains on files that were
+added, changed or deleted since the previous session.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+MANIFEST_VERSION = 1
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of the document text as the agents see it"""
+    return hashlib.sha256(content.encode('utf-8', errors='ignore')).hexdigest()
+
+
+class CorpusManifest:
+    """Persisted record of the last trained state of every knowledge source"""
+
+    def __init__(self, manifest_file: Path):
+        self.manifest_file = Path(manifest_file)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._pending: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def load(self) -> bool:
+        """Load the manifest from disk; returns False when none exists yet"""
+        if not self.manifest_file.exists():
+            return False
+        try:
+            data = json.loads(self.manifest_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"✗ Ignoring unreadable manifest {self.manifest_file.name}: {e}")
+            return False
+        if data.get("version") != MANIFEST_VERSION:
+            return False
+        self.entries = data.get("entries", {})
+        return True
+
+    def reset(self):
+        """Forget every tracked file (forces a full rebuild)"""
+        self.entries = {}
+        self._pending = None
+
+    @staticmethod
+    def _stat(path: Path) -> Dict[str, Any]:
+        st = path.stat()
+        return {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def stat_changed(self, files: Dict[str, Path]) -> List[str]:
+        """Keys that are new or whose path, size or mtime differ from the manifest"""
+        candidates = []
+        for key, path in files.items():
+            previous = self.entries.get(key)
+            try:
+                current = self._stat(path)
+            except OSError:
+                candidates.append(key)
+                continue
+            if previous is None or any(previous.get(f) != current[f] for f in ("path", "size", "mtime_ns")):
+                candidates.append(key)
+        return candidates
+
+    def update(self, files: Dict[str, Path], contents: Dict[str, str]) -> Dict[str, List[str]]:
+        """Classify every tracked key against the freshly loaded contents.
+
+        ``files`` is the full current listing, ``contents`` the text of the
+        files that were (re)loaded. Files that were not loaded keep their
+        previous entry. The new state is staged until :meth:`save`.
+        """
+        changes = {"added": [], "changed": [], "removed": [], "skipped": []}
+        pending = {}
+
+        for key, path in files.items():
+            previous = self.entries.get(key)
+            if key not in contents:
+                # Untouched since last session (or unreadable this time)
+                if previous is not None:
+                    pending[key] = previous
+                    changes["skipped"].append(key)
+                continue
+
+            digest = content_hash(contents[key])
+            try:
+                entry = self._stat(path)
+            except OSError:
+                entry = {"path": str(path), "size": None, "mtime_ns": None}
+            entry["sha256"] = digest
+            pending[key] = entry
+
+            if previous is None:
+                changes["added"].append(key)
+            elif previous.get("sha256") != digest:
+                changes["changed"].append(key)
+            else:
+                # Touched but identical content: refresh stat only
+                changes["skipped"].append(key)
+
+        changes["removed"] = sorted(k for k in self.entries if k not in files)
+        self._pending = pending
+        return changes
+
+    def save(self):
+        """Commit the staged state atomically (temp file + rename)"""
+        if self._pending is not None:
+            self.entries = self._pending
+            self._pending = None
+        data = {
+            "version": MANIFEST_VERSION,
+            "last_updated": datetime.now(timezone.utc).isoformat(),
+            "total_files": len(self.entries),
+            "entries": self.entries
+        }
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_suffix(self.manifest_file.suffix + ".tmp")
+        tmp_file.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        os.replace(tmp_file, self.manifest_file)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5 — Skyworks V5: Memory-mapped Corpus Store
+
+Packs the corpus (and the generated context packs) into one contiguous UTF-8
+blob plus a small JSON index of offsets:
+
+    agent_memory/corpus_store/
+    ├── corpus_index.json       (version, blob name, path -> [offset, bytes, chars, size, mtime_ns, strict])
+    └── corpus_<build>.bin      (decoded text of every file, back to back)
+
+The trainer, the context pack generator and the LLM service open the blob
+with mmap, so a document is a slice of the page cache that is decoded only
+when it is used, and nothing holds the whole corpus as Python strings.
+Entries are served only while the source file's size and mtime still match;
+anything else falls back to reading the file.
+
+Rebuilding reuses the bytes of unchanged files from the previous blob, so
+only new or modified files are read from the (possibly network-mounted)
+corpus.
+"""
+
+import json
+import mmap
+import os
+import sys
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from concurrent_loader import LoadStats, load_files
+
+STORE_VERSION = 1
+INDEX_FILE = "corpus_index.json"
+DEFAULT_EXTENSIONS = ('.md', '.txt', '.jsonl', '.csv')
+
+# Index entry fields
+OFFSET, NBYTES, NCHARS, SIZE, MTIME_NS, STRICT = range(6)
+
+
+def store_key(path: Union[str, Path]) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def decode_text(raw: bytes) -> Tuple[str, bool]:
+    """Decode like text-mode open(): UTF-8 (invalid bytes dropped) with universal newlines.
+
+    The flag tells whether the bytes were valid UTF-8, for readers that
+    decode strictly.
+    """
+    try:
+        text, strict = raw.decode('utf-8'), True
+    except UnicodeDecodeError:
+        text, strict = raw.decode('utf-8', errors='ignore'), False
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text, strict
+
+
+class DocumentMap(Mapping):
+    """Read-only {key: text} view whose values may be decoded lazily on access.
+
+    Values are either strings or zero-argument loaders; loaded text is not
+    kept, so iterating the map holds one document at a time.
+    """
+
+    def __init__(self, sources: Optional[Dict[str, Union[str, Callable[[], str]]]] = None):
+        self._sources = dict(sources or {})
+
+    def __getitem__(self, key: str) -> str:
+        value = self._sources[key]
+        return value() if callable(value) else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sources)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def __contains__(self, key) -> bool:
+        return key in self._sources
+
+    def subset(self, keys: Iterable[str]) -> "DocumentMap":
+        return DocumentMap({key: self._sources[key] for key in keys if key in self._sources})
+
+    def merged(self, other: "DocumentMap", prefix: str = "") -> "DocumentMap":
+        sources = dict(self._sources)
+        sources.update({prefix + key: value for key, value in other._sources.items()})
+        return DocumentMap(sources)
+
+
+class CorpusStore:
+    """Read-only view over a built store; documents are slices of one mmap."""
+
+    def __init__(self, store_dir: Path, index: Dict[str, Any]):
+        self.store_dir = Path(store_dir)
+        self.build_id = index["build_id"]
+        self.entries: Dict[str, List[Any]] = index["entries"]
+        self.blob_file = self.store_dir / index["blob"]
+        self._file = open(self.blob_file, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap of an empty file is not allowed
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._mm) if self._mm is not None else memoryview(b"")
+
+    @classmethod
+    def open(cls, store_dir: Union[str, Path]) -> Optional["CorpusStore"]:
+        """Open a built store; None if it is missing, incomplete or from another version."""
+        store_dir = Path(store_dir)
+        try:
+            index = json.loads((store_dir / INDEX_FILE).read_text(encoding='utf-8'))
+            if index.get("version") != STORE_VERSION:
+                return None
+            return cls(store_dir, index)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def close(self):
+        try:
+            self._view.release()
+            if self._mm is not None:
+                self._mm.close()
+        except BufferError:
+            # A caller still holds a slice; the mapping goes with the last reference
+            pass
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # --- Lookup ---
+    def lookup(self, path: Union[str, Path], verify: bool = True) -> Optional[List[Any]]:
+        """Index entry for a source file, if stored and (with verify) unchanged since the build."""
+        entry = self.entries.get(store_key(path))
+        if entry is None or not verify:
+            return entry
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size != entry[SIZE] or st.st_mtime_ns != entry[MTIME_NS]:
+            return None
+        return entry
+
+    def raw(self, entry: List[Any]) -> memoryview:
+        """Zero-copy UTF-8 bytes of one document."""
+        return self._view[entry[OFFSET]:entry[OFFSET] + entry[NBYTES]]
+
+    def decode(self, entry: List[Any]) -> str:
+        return str(self.raw(entry), 'utf-8')
+
+    def text(self, path: Union[str, Path], verify: bool = True) -> Optional[str]:
+        entry = self.lookup(path, verify)
+        return self.decode(entry) if entry is not None else None
+
+    def loader(self, entry: List[Any]) -> Callable[[], str]:
+        return lambda: self.decode(entry)
+
+    def passage(self, path: Union[str, Path], start: int, end: int, verify: bool = True) -> Optional[str]:
+        """Characters [start:end) of a document; ASCII documents are sliced without decoding the rest."""
+        entry = self.lookup(path, verify)
+        if entry is None:
+            return None
+        if entry[NBYTES] == entry[NCHARS]:
+            offset = entry[OFFSET]
+            return str(self._view[offset + start:offset + min(end, entry[NCHARS])], 'utf-8')
+        return self.decode(entry)[start:end]
+
+
+def discover_files(roots: Iterable[Path], extensions: Iterable[str] = DEFAULT_EXTENSIONS) -> List[Path]:
+    """Every file under the roots with a supported extension (sorted, de-duplicated)."""
+    files = {}
+    for root in roots:
+        root = Path(root)
+        if not root.exists():
+            continue
+        for ext in extensions:
+            for path in root.rglob(f"*{ext}"):
+                if path.is_file():
+                    files.setdefault(store_key(path), path)
+    return [files[key] for key in sorted(files)]
+
+
+def build_corpus_store(roots: Iterable[Path], store_dir: Path,
+                       extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+                       io_workers: int = 1) -> Dict[str, Any]:
+    """(Re)build the store for every file under `roots`; returns build stats."""
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    previous = CorpusStore.open(store_dir)
+    stats = LoadStats()
+    build_id = time.strftime("%Y%m%d%H%M%S") + f"_{os.getpid()}"
+    blob_name = f"corpus_{build_id}.bin"
+    tmp_blob = store_dir / (blob_name + ".tmp")
+
+    def read(path: Path) -> Tuple[bytes, os.stat_result]:
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        stats.add_bytes(len(raw))
+        return raw, st
+
+    entries: Dict[str, List[Any]] = {}
+    reused = 0
+    offset = 0
+    files = discover_files(roots, extensions)
+    try:
+        with open(tmp_blob, 'wb') as blob:
+            # Unchanged files are copied from the previous blob; only the rest is read
+            to_read = []
+            for path in files:
+                entry = previous.lookup(path) if previous is not None else None
+                if entry is not None:
+                    blob.write(previous.raw(entry))
+                    entries[store_key(path)] = [offset] + entry[NBYTES:]
+                    offset += entry[NBYTES]
+                    reused += 1
+                else:
+                    to_read.append(path)
+
+            for path, result, error in load_files(to_read, read, workers=io_workers, stats=stats):
+                if error is not None:
+                    print(f"✗ Failed to read {path}: {error}")
+                    continue
+                raw, st = result
+                text, strict = decode_text(raw)
+                data = text.encode('utf-8')
+                blob.write(data)
+                entries[store_key(path)] = [offset, len(data), len(text), st.st_size, st.st_mtime_ns, strict]
+                offset += len(data)
+        stats.finish()
+    finally:
+        if previous is not None:
+            previous.close()
+
+    os.replace(tmp_blob, store_dir / blob_name)
+    index_file = store_dir / INDEX_FILE
+    tmp_index = store_dir / (INDEX_FILE + ".tmp")
+    tmp_index.write_text(json.dumps({
+        "version": STORE_VERSION,
+        "build_id": build_id,
+        "blob": blob_name,
+        "blob_bytes": offset,
+        "entries": entries
+    }, separators=(",", ":")), encoding='utf-8')
+    os.replace(tmp_index, index_file)
+
+    # Older blobs go once the index points past them (a reader may still map one)
+    for old in store_dir.glob("corpus_*.bin"):
+        if old.name != blob_name:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+    return {
+        "files": len(entries),
+        "reused": reused,
+        "read": stats.to_dict(),
+        "blob_bytes": offset,
+        "blob": str(store_dir / blob_name)
+    }
+
+
+def main():
+    """CLI entry point: build or refresh the store"""
+    import argparse
+
+    script_path = Path(__file__).resolve()
+    base_path = script_path.parent.parent.parent
+
+    parser = argparse.ArgumentParser(description="Build the memory-mapped SKYWORKS corpus store")
+    parser.add_argument("--corpus",
+                       default=str(base_path / "KnowledgeBase" / "EASA DOCS SPLIT CHUNKS"),
+                       help="Path to EASA corpus")
+    parser.add_argument("--packs",
+                       default=str(base_path / "ContextPacks"),
+                       help="Path to Context Packs")
+    parser.add_argument("--output",
+                       default=str(base_path / "Tools" / "TrainingCenter" / "agent_memory" / "corpus_store"),
+                       help="Store directory")
+    parser.add_argument("--io-workers", type=int, default=1,
+                       help="Concurrent file reads (1 = sequential)")
+    parser.add_argument("--no-dedup", action="store_true",
+                       help="Skip the dedup stage (corpus_dedup.json next to the store)")
+    args = parser.parse_args()
+
+    print("━━━ Building Corpus Store ━━━")
+    result = build_corpus_store([Path(args.corpus), Path(args.packs)], Path(args.output),
+                                io_workers=args.io_workers)
+    read = result["read"]
+    print(f"✓ Stored {result['files']} files ({result['blob_bytes'] / (1024 * 1024):.1f} MB): "
+          f"{result['reused']} reused, {read['files']} read at {read['mb_per_sec']} MB/s")
+    print(f"✓ Blob: {result['blob']}")
+    
+    if not args.no_dedup:
+        from corpus_dedup import DEDUP_FILE, build_dedup_map, print_stats
+        store = CorpusStore.open(args.output)
+        dedup_file = Path(args.output).parent / DEDUP_FILE
+        print_stats(build_dedup_map(args.corpus, dedup_file, store))
+        print(f"✓ Dedup map: {dedup_file}")
+        store.close()
+    if read["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Multi-keyword scanner shared by the agent trainer and the context pack generator.
+
+All keywords are compiled once into a single matcher. Each text is casefolded
+exactly once and scanned in one pass, returning hit counts per keyword.
+Matches are leftmost-longest and non-overlapping ("airspace" is one hit for
+"airspace", not also one for "air"), whichever backend runs: a pyahocorasick
+automaton when the optional package is installed (pip install pyahocorasick),
+otherwise one compiled regex alternation, longest pattern first.
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+
+class KeywordScanner:
+    """Compiled case-insensitive substring matcher for a fixed keyword set."""
+
+    def __init__(self, keywords: Iterable[str]):
+        # Folded pattern -> original spellings ("SAIL" and "sail" share one pattern)
+        self.variants: Dict[str, List[str]] = {}
+        for keyword in keywords:
+            folded = keyword.casefold()
+            if not folded:
+                continue
+            spellings = self.variants.setdefault(folded, [])
+            if keyword not in spellings:
+                spellings.append(keyword)
+
+        self.patterns = sorted(self.variants)
+        self._automaton = self._build_automaton(self.patterns)
+        self._regex = None
+        if self._automaton is None and self.patterns:
+            # Longest first: at each position the alternation takes the longest keyword
+            alternation = "|".join(re.escape(p) for p in sorted(self.patterns, key=lambda p: (-len(p), p)))
+            self._regex = re.compile(alternation)
+
+    @staticmethod
+    def _build_automaton(patterns: List[str]):
+        """Aho-Corasick automaton (optional pyahocorasick), or None for the fallback."""
+        try:
+            import ahocorasick
+        except ImportError:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for idx, pattern in enumerate(patterns):
+            automaton.add_word(pattern, idx)
+        if not patterns:
+            return None
+        automaton.make_automaton()
+        return automaton
+
+    def scan_folded(self, text: str) -> Dict[str, int]:
+        """Count hits per folded pattern in a text (single casefold)."""
+        folded_text = text.casefold()
+        counts: Dict[str, int] = {}
+
+        if self._automaton is not None:
+            hits = [0] * len(self.patterns)
+            for _, idx in self._automaton.iter_long(folded_text):
+                hits[idx] += 1
+            for idx, n in enumerate(hits):
+                if n:
+                    counts[self.patterns[idx]] = n
+        elif self._regex is not None:
+            for match in self._regex.finditer(folded_text):
+                pattern = match.group()
+                counts[pattern] = counts.get(pattern, 0) + 1
+
+        return counts
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Return {keyword: hit count} for every keyword found in `text`."""
+        counts = {}
+        for pattern, n in self.scan_folded(text).items():
+            for keyword in self.variants[pattern]:
+                counts[keyword] = n
+        return counts
+
+    @staticmethod
+    def select(hits: Dict[str, int], keywords: Iterable[str]) -> List[str]:
+        """Keywords (in the caller's order) that were found by a previous scan."""
+        return [k for k in keywords if k in hits]
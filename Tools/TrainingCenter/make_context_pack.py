@@ -5,13 +5,25 @@ Builds markdown context packs from EASA/SORA corpus for AI agent training.
 """
 
 import os
+import io
 import sys
 import json
 import csv
 import argparse
+import hashlib
+import heapq
+import math
+import time
 from pathlib import Path
 from datetime import datetime, timezone
 
+from compressed_io import SHARED_CODECS, atomic_writer, check_codec, compressed_path
+from concurrent_loader import LoadStats, load_files
+from corpus_dedup import DedupMap
+from corpus_store import CorpusStore, NBYTES, STRICT
+from keyword_scanner import KeywordScanner
+from telemetry import MEMORY_MODES, Telemetry
+
 # --- Config Parser (with PyYAML fallback) ---
 def load_config(config_path):
     """Load config.yaml with optional PyYAML or fallback parser."""
@@ -23,8 +35,26 @@ def load_config(config_path):
         # Fallback: simple YAML parser (supports basic structure only)
         return parse_yaml_simple(config_path)
 
+# List sections of config.yaml and the defaults of their items
+_SECTIONS = {
+    'topics': {'keywords': [], 'max_chars': 50000},
+    'agents': {},
+}
+
+def _yaml_scalar(value):
+    value = value.strip()
+    if value == '[]':
+        return []
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return int(value) if value.isdigit() else value
+
 def parse_yaml_simple(config_path):
-    """Simple YAML parser for config.yaml (no external deps)."""
+    """Simple YAML parser for config.yaml (no external deps).
+
+    Understands the `topics:` and `agents:` lists: items start with
+    `- name:`, and their fields are scalars or lists of quoted strings.
+    """
     config = {
         'version': '1.0',
         'corpus_path': 'KnowledgeBase/EASA DOCS SPLIT CHUNKS',
@@ -36,124 +66,377 @@ def parse_yaml_simple(config_path):
     with open(config_path, 'r', encoding='utf-8') as f:
         lines = f.readlines()
     
-    current_topic = None
-    in_keywords = False
+    section = None
+    item = None
+    list_field = None
+    
+    def close_item():
+        if item is not None:
+            config.setdefault(section, []).append(item)
     
     for line in lines:
         line = line.rstrip()
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
         
-        # Topic start
-        if line.strip().startswith('- name:'):
-            if current_topic:
-                config['topics'].append(current_topic)
-            current_topic = {'name': line.split('"')[1], 'keywords': [], 'max_chars': 50000}
-            in_keywords = False
+        # Top-level key: enter (or leave) a list section
+        if not line[0].isspace():
+            close_item()
+            item = None
+            list_field = None
+            key = stripped.split(':', 1)[0]
+            section = key if key in _SECTIONS else None
+            continue
+        if section is None:
+            continue
         
-        # Keywords section
-        elif 'keywords:' in line and current_topic:
-            in_keywords = True
+        # Item start
+        if stripped.startswith('- name:'):
+            close_item()
+            item = {k: list(v) if isinstance(v, list) else v for k, v in _SECTIONS[section].items()}
+            item['name'] = _yaml_scalar(stripped[len('- name:'):])
+            list_field = None
         
-        # Keyword item
-        elif in_keywords and line.strip().startswith('- "'):
-            kw = line.strip()[3:-1]  # Remove '- "' and '"'
-            current_topic['keywords'].append(kw)
+        elif item is None:
+            continue
         
-        # Max chars
-        elif 'max_chars:' in line and current_topic:
-            current_topic['max_chars'] = int(line.split(':')[1].strip())
-            in_keywords = False
-    
-    # Add last topic
-    if current_topic:
-        config['topics'].append(current_topic)
+        # List entry
+        elif stripped.startswith('- '):
+            if list_field:
+                item[list_field].append(_yaml_scalar(stripped[2:]))
+        
+        # Field: scalar, or the start of a list
+        elif ':' in stripped:
+            key, value = stripped.split(':', 1)
+            if value.strip():
+                item[key.strip()] = _yaml_scalar(value)
+                list_field = None
+            else:
+                item[key.strip()] = []
+                list_field = key.strip()
     
+    close_item()
     return config
 
 # --- Corpus Reader ---
-def read_corpus(corpus_path, extensions):
-    """Read all corpus files and return list of (text, source) tuples."""
-    chunks = []
+def _read_chunks(file_path, ext, corpus_dir, stats=None, store=None):
+    """Yield (text, source) tuples from one corpus file (from the corpus store when it is current)."""
+    default_source = str(file_path.relative_to(corpus_dir.parent))
+    entry = store.lookup(file_path) if store is not None else None
+    if entry is not None and entry[STRICT]:
+        if stats is not None:
+            stats.add_bytes(entry[NBYTES])
+        yield from _parse_chunks(io.StringIO(store.decode(entry)), ext, default_source)
+        return
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        if stats is not None:
+            stats.add_bytes(os.fstat(f.fileno()).st_size)
+        yield from _parse_chunks(f, ext, default_source)
+
+def _parse_chunks(f, ext, default_source):
+    if ext in ['.md', '.txt']:
+        text = f.read().strip()
+        if text:
+            yield (text, default_source)
+    
+    elif ext == '.jsonl':
+        for line in f:
+            obj = json.loads(line)
+            text = obj.get('text', '').strip()
+            source = obj.get('source', default_source)
+            if text:
+                yield (text, source)
+    
+    elif ext == '.csv':
+        reader = csv.DictReader(f)
+        for row in reader:
+            text = row.get('text', '').strip()
+            source = row.get('source', default_source)
+            if text:
+                yield (text, source)
+
+def iter_corpus(corpus_path, extensions, io_workers=1, stats=None, store=None, dedup=None):
+    """Yield (text, source) tuples from every corpus file, one chunk at a time.
+    
+    With io_workers > 1 files are read on a bounded thread pool; chunks are
+    still yielded in the same order as a sequential read. Files that are
+    current in `store` (a CorpusStore) are decoded from its mmap instead;
+    files `dedup` (a DedupMap) marks as redundant copies are skipped.
+    """
     corpus_dir = Path(corpus_path)
     
     if not corpus_dir.exists():
         print(f"ERROR: Corpus path not found: {corpus_path}")
-        return chunks
+        return
     
-    for ext in extensions:
-        for file_path in corpus_dir.rglob(f"*{ext}"):
+    files = [(file_path, ext) for ext in extensions for file_path in corpus_dir.rglob(f"*{ext}")]
+    if dedup is not None:
+        files = [(file_path, ext) for file_path, ext in files if not dedup.is_redundant(file_path)]
+    
+    if io_workers <= 1:
+        for file_path, ext in files:
+            ok = True
             try:
-                if ext in ['.md', '.txt']:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        text = f.read().strip()
-                        if text:
-                            chunks.append((text, str(file_path.relative_to(corpus_dir.parent))))
-                
-                elif ext == '.jsonl':
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            obj = json.loads(line)
-                            text = obj.get('text', '').strip()
-                            source = obj.get('source', str(file_path.relative_to(corpus_dir.parent)))
-                            if text:
-                                chunks.append((text, source))
-                
-                elif ext == '.csv':
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            text = row.get('text', '').strip()
-                            source = row.get('source', str(file_path.relative_to(corpus_dir.parent)))
-                            if text:
-                                chunks.append((text, source))
-            
+                yield from _read_chunks(file_path, ext, corpus_dir, stats, store)
             except Exception as e:
+                ok = False
                 print(f"WARNING: Failed to read {file_path}: {e}")
+            if stats is not None:
+                stats.file_done(ok)
+        return
+    
+    def read_file(item):
+        # Keep the chunks parsed before a bad line, like the sequential reader
+        chunks = []
+        try:
+            for chunk in _read_chunks(item[0], item[1], corpus_dir, stats, store):
+                chunks.append(chunk)
+        except Exception as e:
+            return chunks, e
+        return chunks, None
     
-    return chunks
+    for (file_path, _), (chunks, error), _ in load_files(files, read_file, workers=io_workers):
+        yield from chunks
+        if error is not None:
+            print(f"WARNING: Failed to read {file_path}: {error}")
+        if stats is not None:
+            stats.file_done(error is None)
+
+def read_corpus(corpus_path, extensions):
+    """Read all corpus files and return list of (text, source) tuples."""
+    return list(iter_corpus(corpus_path, extensions))
 
 # --- Pack Generator ---
-def generate_pack(topic, chunks, output_path, max_chars):
-    """Generate a context pack for a specific topic."""
-    keywords = [kw.lower() for kw in topic['keywords']]
-    filtered_chunks = []
-    total_chars = 0
+# Excerpts shorter than this are scored as if they were this long, so a
+# heading made of keywords alone does not outrank real paragraphs
+MIN_SCORED_CHARS = 200
+# Candidates kept per topic, in multiples of its budget (slack for the final fill)
+CANDIDATE_BUDGET = 2
+# Bump when scoring or selection changes, so existing packs are rebuilt
+SELECTION_VERSION = 1
+DEPS_FILE = 'pack.deps.json'
+
+def chunk_digest(text, source):
+    """Content hash of one chunk, as recorded in a pack's dependency file."""
+    return hashlib.sha256(f"{source}\0{text}".encode('utf-8')).hexdigest()
+
+def topic_digest(topic):
+    """Hash of everything in a topic's config that shapes its pack."""
+    spec = {'name': topic['name'], 'keywords': topic['keywords'], 'max_chars': topic['max_chars'],
+            'selection': SELECTION_VERSION}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def relevance(hits, keywords):
+    """Topic relevance of a chunk: every distinct keyword counts, repeats sublinearly."""
+    return sum(1.0 + math.log(hits[kw]) for kw in keywords if kw in hits)
+
+class PackBuilder:
+    """Relevance-ranked excerpt selection for one topic's pack.md.
     
-    # Filter by keywords
-    for text, source in chunks:
-        text_lower = text.lower()
-        if any(kw in text_lower for kw in keywords):
-            chunk_len = len(text)
-            if total_chars + chunk_len <= max_chars:
-                filtered_chunks.append((text, source))
-                total_chars += chunk_len
-            else:
-                break  # Budget exceeded
+    Every matching chunk is scored by keyword density (relevance per char)
+    and offered to a min-heap holding at most CANDIDATE_BUDGET x max_chars of
+    candidates; the least dense is evicted first, so memory stays bounded and
+    each offer costs O(log k). Duplicate excerpts are recognised by an 8-byte
+    digest of their normalised text; only the digests of candidates still in
+    the heap are kept (a duplicate of an evicted chunk ranks below it and is
+    evicted again). On finalize the survivors are packed greedily
+    by density (knapsack with value = relevance, weight = chars), skipping
+    any that no longer fit so smaller dense excerpts still fill the gaps.
     
-    if not filtered_chunks:
-        print(f"WARNING: No chunks found for topic '{topic['name']}'")
-        return
+    The hashes of all matching chunks and of the topic config are written to
+    pack.deps.json next to pack.md; when a rerun sees the same inputs, the
+    existing pack is left untouched (same bytes, same mtime). With a
+    `compression` codec the pack is stored as pack.md.gz/.xz/.zst.
+    """
+    
+    def __init__(self, topic, output_path, max_chars, force=False, compression=None):
+        self.topic = topic
+        self.output_path = output_path
+        self.max_chars = max_chars
+        self.keywords = topic['keywords']
+        self.force = force
+        self.compression = check_codec(compression)
+        self.unchanged = False
+        self._inputs = hashlib.sha256(topic_digest(dict(topic, max_chars=max_chars)).encode('ascii'))
+        self.count = 0
+        self.total_chars = 0
+        self.candidates = 0
+        self.oversized = 0
+        self.duplicates = 0
+        self._seen = set()  # Text digests of the heap candidates
+        self._heap = []   # (density, -sequence, text, source, digest, text digest)
+        self._heap_chars = 0
+    
+    def offer(self, text, source, hits, digest=None):
+        """Score one chunk for this topic and keep it if it is among the densest so far."""
+        score = relevance(hits, self.keywords)
+        if not score:
+            return
+        # Every matching chunk can change the ranking, so all of them are inputs
+        digest = digest or chunk_digest(text, source)
+        self._inputs.update(digest.encode('ascii'))
+        chunk_len = len(text)
+        if chunk_len > self.max_chars:
+            self.oversized += 1  # Can never fit the budget
+            return
+        # The same excerpt twice only spends budget
+        key = hashlib.blake2b(" ".join(text.split()).encode('utf-8'), digest_size=8).digest()
+        if key in self._seen:
+            self.duplicates += 1
+            return
+        self._seen.add(key)
+        self.candidates += 1
+        density = score / max(chunk_len, MIN_SCORED_CHARS)
+        # Sequence breaks ties in corpus order and keeps text out of comparisons
+        heapq.heappush(self._heap, (density, -self.candidates, text, source, digest, key))
+        self._heap_chars += chunk_len
+        while self._heap_chars > self.max_chars * CANDIDATE_BUDGET:
+            evicted = heapq.heappop(self._heap)
+            self._heap_chars -= len(evicted[2])
+            self._seen.discard(evicted[5])
+    
+    def select(self):
+        """Densest candidates that fit the budget, in rank order."""
+        selected = []
+        total = 0
+        for _, _, text, source, digest, _ in sorted(self._heap, reverse=True):
+            if total + len(text) <= self.max_chars:
+                selected.append((text, source, digest))
+                total += len(text)
+        return selected
+    
+    def _load_deps(self, topic_dir):
+        try:
+            with open(topic_dir / DEPS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _pack_intact(self, pack_path, deps):
+        """pack.md is still the file the dependency record describes."""
+        try:
+            return _file_sha256(pack_path) == deps.get('pack_sha256')
+        except OSError:
+            return False
     
-    # Create output directory
-    topic_dir = Path(output_path) / topic['name']
-    topic_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Write pack.md
-    pack_path = topic_dir / 'pack.md'
-    with open(pack_path, 'w', encoding='utf-8') as f:
-        f.write(f"# Context Pack: {topic['name']}\n\n")
-        f.write(f"**Generated:** {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC\n")
-        f.write(f"**Keywords:** {', '.join(topic['keywords'])}\n")
-        f.write(f"**Chunks:** {len(filtered_chunks)}\n")
-        f.write(f"**Total Characters:** {total_chars:,}\n\n")
-        f.write("---\n\n")
+    def finalize(self):
+        """Write pack.md (header + ranked excerpts) via temp file and rename.
         
-        for idx, (text, source) in enumerate(filtered_chunks, 1):
-            f.write(f"## Excerpt {idx}\n\n")
-            f.write(f"{text}\n\n")
-            f.write(f"**Source:** `{source}`\n\n")
+        Skipped when the recorded inputs match and pack.md is intact.
+        """
+        selected = self.select()
+        self._heap = []
+        self._heap_chars = 0
+        self._seen = set()
+        if not selected:
+            print(f"WARNING: No chunks found for topic '{self.topic['name']}'")
+            return None
+        self.count = len(selected)
+        self.total_chars = sum(len(text) for text, _, _ in selected)
+        inputs = self._inputs.hexdigest()
+        
+        # Create output directory
+        topic_dir = Path(self.output_path) / self.topic['name']
+        topic_dir.mkdir(parents=True, exist_ok=True)
+        pack_path = compressed_path(topic_dir / 'pack.md', self.compression)
+        
+        deps = None if self.force else self._load_deps(topic_dir)
+        if deps and deps.get('inputs') == inputs and self._pack_intact(pack_path, deps):
+            self.unchanged = True
+            print(f"= Unchanged pack: {pack_path} ({self.count} chunks, inputs match)")
+            return pack_path
+        
+        # Write pack.md (streamed through the codec; other stored variants are removed)
+        with atomic_writer(topic_dir / 'pack.md', self.compression) as f:
+            f.write(f"# Context Pack: {self.topic['name']}\n\n")
+            f.write(f"**Generated:** {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC\n")
+            f.write(f"**Keywords:** {', '.join(self.topic['keywords'])}\n")
+            f.write(f"**Chunks:** {self.count} (of {self.candidates} matching, ranked by keyword density)\n")
+            f.write(f"**Total Characters:** {self.total_chars:,}\n\n")
             f.write("---\n\n")
+            
+            for i, (text, source, _) in enumerate(selected, 1):
+                f.write(f"## Excerpt {i}\n\n")
+                f.write(f"{text}\n\n")
+                f.write(f"**Source:** `{source}`\n\n")
+                f.write("---\n\n")
+        pack_sha256 = _file_sha256(pack_path)
+        
+        # Written after the pack: a crash in between only costs one extra rebuild
+        deps = {
+            'version': SELECTION_VERSION,
+            'topic': topic_digest(dict(self.topic, max_chars=self.max_chars)),
+            'inputs': inputs,
+            'candidates': self.candidates,
+            'pack_sha256': pack_sha256,
+            'chunks': [{'source': source, 'sha256': digest} for _, source, digest in selected]
+        }
+        tmp_deps = topic_dir / (DEPS_FILE + '.tmp')
+        with open(tmp_deps, 'w', encoding='utf-8') as f:
+            json.dump(deps, f, indent=2)
+        os.replace(tmp_deps, topic_dir / DEPS_FILE)
+        
+        skipped = f", {self.duplicates} duplicates skipped" if self.duplicates else ""
+        if self.oversized:
+            skipped += f", {self.oversized} over budget"
+        print(f"✓ Generated pack: {pack_path} ({self.count} of {self.candidates} chunks, "
+              f"{self.total_chars:,} chars{skipped})")
+        return pack_path
+
+def generate_packs(topics, chunks, output_path, scanner=None, telemetry=None, force=False, compression=None):
+    """Route every chunk to all topics in a single pass; returns chunks read.
+    
+    `chunks` may be any iterable (typically the iter_corpus generator), so
+    memory stays bounded by the pack budgets rather than the corpus size.
+    The whole corpus is read, since a later chunk may outrank the ones
+    already kept. Packs whose inputs did not change are not rewritten
+    (unless `force`). With a Telemetry, time is split into read / route /
+    write spans.
+    """
+    if scanner is None:
+        scanner = KeywordScanner(kw for topic in topics for kw in topic['keywords'])
+    builders = [PackBuilder(topic, output_path, topic['max_chars'], force, compression) for topic in topics]
+    if telemetry is not None:
+        chunks = telemetry.timed_iter("read", chunks)
     
-    print(f"✓ Generated pack: {pack_path} ({len(filtered_chunks)} chunks, {total_chars:,} chars)")
+    read = 0
+    route_seconds = 0.0
+    for text, source in chunks:
+        read += 1
+        started = time.perf_counter()
+        hits = scanner.scan(text)
+        if hits:
+            # Hashed once, shared by every topic the chunk matches
+            digest = chunk_digest(text, source)
+            for builder in builders:
+                builder.offer(text, source, hits, digest)
+        route_seconds += time.perf_counter() - started
+    
+    if telemetry is None:
+        for builder in builders:
+            builder.finalize()
+        return read
+    
+    telemetry.record("route", route_seconds, calls=read)
+    with telemetry.span("write"):
+        finalized = [builder for builder in builders if builder.finalize() is not None]
+    telemetry.count("chunks_read", read)
+    telemetry.count("packs_written", sum(1 for builder in finalized if not builder.unchanged))
+    telemetry.count("packs_unchanged", sum(1 for builder in finalized if builder.unchanged))
+    return read
+
+def generate_pack(topic, chunks, output_path, max_chars, scanner=None, force=False):
+    """Generate a context pack for a specific topic."""
+    generate_packs([dict(topic, max_chars=max_chars)], chunks, output_path, scanner, force=force)
 
 # --- Main ---
 def main():
@@ -162,35 +445,68 @@ def main():
     parser.add_argument('--all', action='store_true', help='Generate packs for all topics')
     parser.add_argument('--config', type=str, default='Tools/TrainingCenter/config.yaml', 
                        help='Path to config.yaml')
+    parser.add_argument('--io-workers', type=int, default=1,
+                       help='Concurrent file reads while streaming the corpus (1 = sequential)')
+    parser.add_argument('--store', type=str, default='Tools/TrainingCenter/agent_memory/corpus_store',
+                       help='Memory-mapped corpus store (used when built; see corpus_store.py)')
+    parser.add_argument('--dedup', type=str, default='Tools/TrainingCenter/agent_memory/corpus_dedup.json',
+                       help='Canonical-ID mapping from corpus_dedup.py (redundant files are skipped)')
+    parser.add_argument('--force', action='store_true',
+                       help='Rewrite every selected pack even when its inputs are unchanged')
+    parser.add_argument('--compress', choices=SHARED_CODECS, default='none',
+                       help='Store packs as pack.md.gz')
+    parser.add_argument('--profile-memory', choices=MEMORY_MODES, default=None,
+                       help='Peak memory per stage (tracemalloc is exact but slower)')
+    parser.add_argument('--metrics-file', type=str, default=None,
+                       help='Write stage metrics as a Prometheus textfile (e.g. skyworks_packs.prom)')
     args = parser.parse_args()
+    telemetry = Telemetry(memory=args.profile_memory)
     
     # Load config
     config = load_config(args.config)
     print(f"Loaded config version {config['version']}")
     
-    # Read corpus
-    print(f"Reading corpus from: {config['corpus_path']}")
-    chunks = read_corpus(config['corpus_path'], config['supported_extensions'])
-    print(f"Loaded {len(chunks)} chunks")
-    
-    if not chunks:
-        print("ERROR: No chunks found. Check corpus path.")
-        sys.exit(1)
-    
-    # Generate packs
+    # Select topics
     if args.all:
-        for topic in config['topics']:
-            generate_pack(topic, chunks, config['output_path'], topic['max_chars'])
+        topics = config['topics']
     elif args.topic:
         topic_obj = next((t for t in config['topics'] if t['name'].lower() == args.topic.lower()), None)
         if not topic_obj:
             print(f"ERROR: Topic '{args.topic}' not found in config")
             sys.exit(1)
-        generate_pack(topic_obj, chunks, config['output_path'], topic_obj['max_chars'])
+        topics = [topic_obj]
     else:
         print("ERROR: Specify --topic or --all")
         sys.exit(1)
     
+    # Stream the corpus once, routing every chunk to all selected topics
+    print(f"Reading corpus from: {config['corpus_path']}")
+    scanner = KeywordScanner(kw for topic in config['topics'] for kw in topic['keywords'])
+    io_stats = LoadStats()
+    store = CorpusStore.open(args.store)
+    if store is not None:
+        print(f"Using corpus store: {store.blob_file} ({len(store)} files)")
+    dedup = DedupMap.load(args.dedup)
+    if dedup is not None:
+        print(f"Skipping redundant documents per {args.dedup} ({dedup.stats.get('duplicates', 0)} mapped)")
+    chunks = iter_corpus(config['corpus_path'], config['supported_extensions'], args.io_workers, io_stats,
+                         store, dedup)
+    read = generate_packs(topics, chunks, config['output_path'], scanner, telemetry, args.force, args.compress)
+    io_stats.finish()
+    telemetry.count("bytes_read", io_stats.bytes)
+    counters = telemetry.to_dict()['counters']
+    print(f"Streamed {read} chunks; {counters.get('packs_written', 0)} packs rebuilt, "
+          f"{counters.get('packs_unchanged', 0)} unchanged")
+    print(f"Read {io_stats.summary()} [io_workers={args.io_workers}]")
+    print("Stages: " + ", ".join(f"{name} {span['seconds']:.2f}s"
+                                 for name, span in telemetry.to_dict()['spans'].items()))
+    if args.metrics_file:
+        telemetry.write_prometheus(args.metrics_file, "skyworks_packs")
+    
+    if not read:
+        print("ERROR: No chunks found. Check corpus path.")
+        sys.exit(1)
+    
     print("\n✓ Context pack generation complete")
 
 if __name__ == '__main__':
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5.3 — Skyworks V5: Append-only Agent Memory Store
+
+Replaces the full rewrite of `<agent>_memory.json` on every session with a
+segmented store:
+
+    agent_memory/<agent>_memory/
+    ├── header.json             (small: version, seq, snapshot + segment list)
+    ├── snapshot_000012.json    (compacted state, legacy memory-file schema)
+    └── segment_000013.jsonl    (one append-only file per training session)
+
+Each segment holds `add`, `forget` and `log` records. Loading reads the
+header, the latest snapshot and the few segments written since. Every
+`compact_every` sessions the segments are folded into a new snapshot and the
+training log is trimmed to `log_retention` sessions.
+
+After every session the latest state is also written, plain and in the
+legacy schema, to `agent_memory/<agent>_memory.json`: the .NET backend
+(AgentLLMService) and the VS Code extension read that single compat file
+instead of replaying the store. It is serialised from the state the trainer
+already holds (or from the snapshot being written), never by replaying.
+
+With `compression` ("gz", "xz" or "zst") snapshots and segments are written
+compressed (e.g. `snapshot_000012.json.gz`); the header names the files, so
+readers handle either form. The header itself always stays plain JSON.
+"""
+
+import json
+import os
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+from compressed_io import check_codec, compressed_path, open_text, write_text
+
+STORE_VERSION = 1
+
+# Defaults: same memory window as the legacy file, ~30 days of 3x daily sessions
+DEFAULT_MAX_MEMORY = 100
+DEFAULT_LOG_RETENTION = 90
+DEFAULT_COMPACT_EVERY = 8
+
+
+def _write_atomic(path: Path, text: str):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(text, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+class AgentMemoryStore:
+    """Segmented, append-only persistence for one agent's memory"""
+
+    def __init__(self, root: Path, agent_name: str,
+                 max_memory: int = DEFAULT_MAX_MEMORY,
+                 log_retention: int = DEFAULT_LOG_RETENTION,
+                 compact_every: int = DEFAULT_COMPACT_EVERY,
+                 compression: Optional[str] = None):
+        self.agent_name = agent_name
+        self.root = Path(root)
+        self.dir = self.root / f"{agent_name}_memory"
+        self.header_file = self.dir / "header.json"
+        self.legacy_file = self.root / f"{agent_name}_memory.json"
+        self.max_memory = max_memory
+        self.log_retention = log_retention
+        self.compact_every = compact_every
+        self.compression = check_codec(compression)
+
+    # --- Reading ---
+    def read_header(self) -> Optional[Dict[str, Any]]:
+        if not self.header_file.exists():
+            return None
+        header = json.loads(self.header_file.read_text(encoding='utf-8'))
+        return header if header.get("version") == STORE_VERSION else None
+
+    def exists(self) -> bool:
+        return self.read_header() is not None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Latest state in the legacy memory-file schema (plus `memory_version`).
+
+        Falls back to a legacy `<agent>_memory.json` when no store exists yet.
+        """
+        header = self.read_header()
+        if header is None:
+            if not self.legacy_file.exists():
+                return None
+            state = json.loads(self.legacy_file.read_text(encoding='utf-8'))
+            state["memory_version"] = 0
+            return state
+
+        state = {"memory": [], "training_log": []}
+        if header.get("snapshot"):
+            with open_text(self.dir / header["snapshot"]) as f:
+                state = json.load(f)
+
+        memory = state.get("memory", [])
+        training_log = state.get("training_log", [])
+        for segment in header.get("segments", []):
+            # Each session started from the window, as the trainer that wrote it did
+            memory = memory[-self.max_memory:]
+            with open_text(self.dir / segment) as f:
+                for line in f:
+                    if line.strip():
+                        memory, training_log = self._apply(memory, training_log, json.loads(line))
+
+        if header.get("segments"):
+            state = {"memory": memory, "training_log": training_log}
+        else:
+            # Snapshot only: keep the count it recorded before its window was applied
+            state = dict(state, memory=memory, training_log=training_log)
+        return self._legacy_state(state, header.get("expertise", []), header.get("seq", 0),
+                                  header.get("last_updated"))
+
+    def _legacy_state(self, state: Dict[str, Any], expertise: List[str], seq: int,
+                      last_updated: Optional[str]) -> Dict[str, Any]:
+        """Legacy memory-file schema; `total_memory_entries` counts entries before the window is applied"""
+        memory = state.get("memory", [])
+        return {
+            "agent": self.agent_name,
+            "last_updated": last_updated,
+            "total_memory_entries": state.get("total_memory_entries", len(memory)),
+            "expertise": expertise,
+            "memory": memory[-self.max_memory:],
+            "training_log": state.get("training_log", [])[-self.log_retention:],
+            "memory_version": seq
+        }
+
+    @staticmethod
+    def _apply(memory: List[Dict], training_log: List[Dict], record: Dict[str, Any]):
+        op = record.get("op")
+        if op == "add":
+            memory.append(record["entry"])
+        elif op == "forget":
+            stale = set(record.get("sources", []))
+            memory = [entry for entry in memory if entry["source"] not in stale]
+        elif op == "log":
+            training_log.append(record["session"])
+        return memory, training_log
+
+    # --- Writing ---
+    def append(self, records: List[Dict[str, Any]], expertise: List[str],
+               state: Optional[Dict[str, Any]] = None) -> int:
+        """Write one new segment with this session's records; returns the new version
+
+        `state` is the caller's current memory/training_log (after the records);
+        with it the compat file is written without replaying the store.
+        """
+        header = self.read_header()
+        if header is None:
+            # No store yet: seed it from the legacy file (or empty) as a snapshot
+            state = self.load() or {"memory": [], "training_log": []}
+            header = self._write_snapshot(state, expertise, seq=0)
+
+        seq = header["seq"] + 1
+        segment = compressed_path(f"segment_{seq:06d}.jsonl", self.compression).name
+        with open_text(self.dir / segment, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        header.update({
+            "seq": seq,
+            "expertise": expertise,
+            "last_updated": datetime.now(timezone.utc).isoformat(),
+            "segments": header.get("segments", []) + [segment]
+        })
+        _write_atomic(self.header_file, json.dumps(header, indent=2))
+
+        if len(header["segments"]) >= self.compact_every:
+            self.compact()
+        else:
+            if state is None:
+                state = self.load()
+            self._write_compat(self._legacy_state(state, expertise, seq, header["last_updated"]))
+        return seq
+
+    def rewrite(self, state: Dict[str, Any], expertise: List[str]) -> int:
+        """Replace the whole store with `state` (full rebuild)"""
+        header = self.read_header()
+        seq = header["seq"] + 1 if header else 1
+        return self._write_snapshot(state, expertise, seq, previous=header)["seq"]
+
+    def compact(self) -> int:
+        """Fold all segments into a new snapshot and apply the retention policy"""
+        header = self.read_header()
+        if header is None:
+            return 0
+        state = self.load()
+        return self._write_snapshot(state, header.get("expertise", []), header["seq"], previous=header)["seq"]
+
+    def _write_snapshot(self, state: Dict[str, Any], expertise: List[str], seq: int,
+                        previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        now = datetime.now(timezone.utc).isoformat()
+        compat = self._legacy_state(state, expertise, seq, now)
+        snapshot_text = json.dumps({k: v for k, v in compat.items() if k != "memory_version"}, ensure_ascii=False)
+        snapshot = write_text(self.dir / f"snapshot_{seq:06d}.json", snapshot_text, self.compression).name
+
+        header = {
+            "version": STORE_VERSION,
+            "agent": self.agent_name,
+            "seq": seq,
+            "expertise": expertise,
+            "last_updated": now,
+            "snapshot": snapshot,
+            "segments": []
+        }
+        _write_atomic(self.header_file, json.dumps(header, indent=2))
+        self._write_compat(compat)
+
+        # Old files are only removed once the new header points past them
+        if previous:
+            stale = list(previous.get("segments", []))
+            if previous.get("snapshot") and previous["snapshot"] != snapshot:
+                stale.append(previous["snapshot"])
+            for name in stale:
+                try:
+                    (self.dir / name).unlink()
+                except OSError:
+                    pass
+        return header
+
+    def _write_compat(self, state: Dict[str, Any]):
+        """Legacy-schema `<agent>_memory.json` for readers that do not know the store"""
+        _write_atomic(self.legacy_file, json.dumps(state, ensure_ascii=False))
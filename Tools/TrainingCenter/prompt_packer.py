@@ -0,0 +1,186 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Token-budgeted context packing for agent prompts.
+
+Takes the ranked passages returned by retrieval, reads their text and fills
+a token budget best-first. Overlapping or duplicated passages (a chunk file
+and the EXTRACTED document it came from share text) are packed once, and
+long passages are cut to the window around the question terms instead of
+being sent whole.
+
+Token counts come from an offline estimator (~4 characters per token for
+word runs, one token per punctuation mark) that stays within a few percent on
+English regulatory text. AGENT_TOKENIZER=tiktoken switches to exact o200k
+counts; tiktoken is then imported on the first count, not at startup.
+"""
+
+import math
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bm25_index import tokenize
+from compressed_io import read_text
+
+_ENCODING = None      # tiktoken encoding, loaded on first use
+_ENCODING_LOADED = False
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+# Chat format overhead per message (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _encoding():
+    # Opt-in only: the encoding files may have to be downloaded
+    global _ENCODING, _ENCODING_LOADED
+    if not _ENCODING_LOADED:
+        _ENCODING_LOADED = True
+        if os.getenv("AGENT_TOKENIZER", "estimate").lower() == "tiktoken":
+            try:
+                import tiktoken
+                _ENCODING = tiktoken.get_encoding("o200k_base")
+            except Exception:  # Optional dependency (or encoding files unavailable offline)
+                _ENCODING = None
+    return _ENCODING
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count for text (offline estimate, or tiktoken with AGENT_TOKENIZER=tiktoken)."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return sum(math.ceil(len(piece) / 4) for piece in _PIECE_RE.findall(text))
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages) + 3
+
+
+def read_source_text(path: str) -> str:
+    # Same decoding as the trainer, so index offsets line up (compressed packs by suffix)
+    return read_text(path, errors='ignore')
+
+
+class ContextPacker:
+    """Fill a token budget with the best passages, without duplicates."""
+
+    def __init__(self, budget_tokens: int = 3000, max_passage_tokens: int = 400,
+                 min_passage_tokens: int = 48,
+                 reader: Callable[[str], str] = read_source_text):
+        self.budget_tokens = budget_tokens
+        self.max_passage_tokens = max_passage_tokens
+        self.min_passage_tokens = min_passage_tokens
+        self.reader = reader
+
+    def pack(self, question: str, hits: List[Dict[str, Any]],
+             store=None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return (excerpts, stats); hits are ranked passages with path/start/end.
+
+        With a CorpusStore, passage text is sliced from its mmap; files that
+        are not (or no longer) in the store are read from disk.
+        """
+        query_terms = set(tokenize(question))
+        texts: Dict[str, Optional[str]] = {}
+        excerpts: List[Dict[str, Any]] = []
+        seen_ranges: Dict[str, List[Tuple[int, int]]] = {}
+        used = 0
+        stats = {"candidates": len(hits), "packed": 0, "duplicates": 0, "trimmed": 0,
+                 "skipped": 0, "budget_tokens": self.budget_tokens}
+
+        for hit in hits:
+            path = hit.get("path")
+            if not path or "start" not in hit:
+                stats["skipped"] += 1
+                continue
+            start, end = hit["start"], hit["end"]
+            ranges = seen_ranges.setdefault(path, [])
+            if any(start < r_end and r_start < end for r_start, r_end in ranges):
+                stats["duplicates"] += 1
+                continue
+            passage = self._passage(path, start, end, texts, store)
+            if passage is None:
+                stats["skipped"] += 1
+                continue
+            passage = passage.strip()
+            folded = _SPACE_RE.sub(" ", passage).casefold()
+            if any(folded in e["_folded"] or e["_folded"] in folded for e in excerpts):
+                stats["duplicates"] += 1
+                continue
+
+            remaining = self.budget_tokens - used
+            if remaining < self.min_passage_tokens:
+                break
+            limit = min(self.max_passage_tokens, remaining)
+            tokens = estimate_tokens(passage)
+            if tokens > limit:
+                passage = self._focus(passage, query_terms, limit - 2)
+                tokens = estimate_tokens(passage)
+                stats["trimmed"] += 1
+            if tokens > remaining:
+                stats["skipped"] += 1
+                continue
+
+            ranges.append((start, end))
+            excerpts.append({
+                "source": hit["source"],
+                "start": start,
+                "end": end,
+                "score": hit.get("score"),
+                "text": passage,
+                "tokens": tokens,
+                "_folded": folded
+            })
+            used += tokens
+
+        for excerpt in excerpts:
+            del excerpt["_folded"]
+        stats.update({"packed": len(excerpts), "context_tokens": used})
+        return excerpts, stats
+
+    def _passage(self, path: str, start: int, end: int,
+                 texts: Dict[str, Optional[str]], store=None) -> Optional[str]:
+        if store is not None:
+            passage = store.passage(path, start, end)
+            if passage is not None:
+                return passage
+        if path not in texts:
+            try:
+                texts[path] = self.reader(path)
+            except OSError:
+                texts[path] = None
+        text = texts[path]
+        return text[start:end] if text is not None else None
+
+    @staticmethod
+    def _focus(passage: str, query_terms: set, limit_tokens: int) -> str:
+        """Cut a long passage to the sentence window with the most question terms."""
+        sentences = [s for s in re.split(r"(?<=[.;:!?])\s+|\n+", passage) if s.strip()]
+        if not sentences:
+            return passage
+        weights = [len(query_terms.intersection(tokenize(s))) for s in sentences]
+        costs = [estimate_tokens(s) + 1 for s in sentences]
+
+        # Sliding window over sentences: most query-term hits within the limit
+        best = (-1, 0, 0)
+        lo = 0
+        hits = cost = 0
+        for hi in range(len(sentences)):
+            hits += weights[hi]
+            cost += costs[hi]
+            while cost > limit_tokens and lo <= hi:
+                hits -= weights[lo]
+                cost -= costs[lo]
+                lo += 1
+            if lo <= hi and hits > best[0]:
+                best = (hits, lo, hi + 1)
+        if best[0] < 0:
+            # Even one sentence is too long: hard cut at ~4 chars per token
+            return passage[:limit_tokens * 4].rstrip() + " …"
+
+        _, lo, hi = best
+        excerpt = " ".join(s.strip() for s in sentences[lo:hi])
+        return ("… " if lo > 0 else "") + excerpt + (" …" if hi < len(sentences) else "")
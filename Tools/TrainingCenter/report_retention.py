@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Phase1 Step5 — Skyworks V5: Training Report Retention
+
+Three training sessions a day leave ~90 `training_report_*.json` files a
+month in agent_memory/. This tool keeps the recent ones as they are and
+rolls older reports up into one compressed archive per month:
+
+    agent_memory/reports_archive/training_reports_202510.jsonl.gz
+
+Each archive line is {"file": <report name>, "report": <full report>}.
+Archives are rewritten through a temp file and renamed before any report is
+deleted, and reports already in an archive are not added twice, so an
+interrupted run can simply be repeated.
+
+Usage:
+    py -3 Tools/TrainingCenter/report_retention.py --keep-days 14
+    py -3 Tools/TrainingCenter/report_retention.py --keep-days 14 --keep-months 12 --dry-run
+"""
+
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from compressed_io import CODECS, atomic_writer, check_codec, compressed_path, open_text, resolve
+
+REPORT_RE = re.compile(r"^training_report_(\d{8})_(\d{6})\.json(\.gz|\.xz|\.zst)?$")
+ARCHIVE_RE = re.compile(r"^training_reports_(\d{6})\.jsonl(\.gz|\.xz|\.zst)?$")
+ARCHIVE_DIR = "reports_archive"
+
+
+def find_reports(memory_dir: Path) -> List[Dict[str, Any]]:
+    """Training reports (plain or compressed), oldest first"""
+    reports = []
+    for path in memory_dir.iterdir():
+        match = REPORT_RE.match(path.name)
+        if match and path.is_file():
+            taken = datetime.strptime(match.group(1) + match.group(2), "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+            reports.append({"path": path, "time": taken, "month": match.group(1)[:6]})
+    return sorted(reports, key=lambda r: (r["time"], r["path"].name))
+
+
+def rollup_month(archive_dir: Path, month: str, reports: List[Dict[str, Any]], codec: Optional[str]) -> int:
+    """Merge `reports` into the month's archive; returns how many were added"""
+    archive = archive_dir / f"training_reports_{month}.jsonl"
+    existing = resolve(archive)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    added = 0
+    with atomic_writer(archive, codec) as out:
+        seen = set()
+        if existing is not None:
+            # Streamed line by line: old archives are never loaded whole
+            with open_text(existing) as f:
+                for line in f:
+                    if line.strip():
+                        seen.add(json.loads(line)["file"])
+                        out.write(line if line.endswith("\n") else line + "\n")
+        for report in reports:
+            name = report["path"].name
+            if name in seen:
+                continue
+            with open_text(report["path"]) as f:
+                data = json.load(f)
+            out.write(json.dumps({"file": name, "report": data}, ensure_ascii=False, separators=(",", ":")) + "\n")
+            seen.add(name)
+            added += 1
+    return added
+
+
+def apply_retention(memory_dir: Path, keep_days: int = 14, keep_last: int = 3, keep_months: int = 0,
+                    codec: Optional[str] = "gz", dry_run: bool = False,
+                    now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Roll reports older than `keep_days` into monthly archives (the newest `keep_last` always stay)"""
+    memory_dir = Path(memory_dir)
+    archive_dir = memory_dir / ARCHIVE_DIR
+    codec = check_codec(codec)
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=keep_days)
+
+    reports = find_reports(memory_dir)
+    candidates = reports[:-keep_last] if keep_last > 0 else reports
+    old = [r for r in candidates if r["time"] < cutoff]
+    by_month: Dict[str, List[Dict[str, Any]]] = {}
+    for report in old:
+        by_month.setdefault(report["month"], []).append(report)
+
+    result = {"reports": len(reports), "archived": 0, "bytes_freed": 0, "months": {}, "archives_deleted": []}
+    for month, month_reports in sorted(by_month.items()):
+        size = sum(r["path"].stat().st_size for r in month_reports)
+        result["months"][month] = len(month_reports)
+        result["archived"] += len(month_reports)
+        result["bytes_freed"] += size
+        if dry_run:
+            continue
+        rollup_month(archive_dir, month, month_reports, codec)
+        # Only after the archive is in place
+        for report in month_reports:
+            report["path"].unlink()
+
+    if keep_months > 0 and archive_dir.exists():
+        oldest = (now.year * 12 + now.month - 1) - keep_months
+        for path in sorted(archive_dir.iterdir()):
+            match = ARCHIVE_RE.match(path.name)
+            if match:
+                year, month = int(match.group(1)[:4]), int(match.group(1)[4:])
+                if year * 12 + month - 1 < oldest:
+                    result["archives_deleted"].append(path.name)
+                    if not dry_run:
+                        path.unlink()
+    return result
+
+
+def main():
+    """CLI entry point"""
+    import argparse
+
+    script_path = Path(__file__).resolve()
+    base_path = script_path.parent.parent.parent
+
+    parser = argparse.ArgumentParser(description="Roll old SKYWORKS training reports into monthly archives")
+    parser.add_argument("--memory-dir",
+                       default=str(base_path / "Tools" / "TrainingCenter" / "agent_memory"),
+                       help="Directory with training_report_*.json")
+    parser.add_argument("--keep-days", type=int, default=14,
+                       help="Reports younger than this stay as individual files")
+    parser.add_argument("--keep-last", type=int, default=3,
+                       help="Newest reports that always stay, whatever their age")
+    parser.add_argument("--keep-months", type=int, default=0,
+                       help="Delete monthly archives older than this many months (0 = keep all)")
+    parser.add_argument("--compress", choices=CODECS, default="gz",
+                       help="Codec for the monthly archives")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Only show what would be archived or deleted")
+    args = parser.parse_args()
+
+    memory_dir = Path(args.memory_dir)
+    if not memory_dir.exists():
+        print(f"✗ Memory directory not found: {memory_dir}")
+        return
+
+    print("━━━ Training Report Retention ━━━")
+    result = apply_retention(memory_dir, args.keep_days, args.keep_last, args.keep_months,
+                             args.compress, args.dry_run)
+    prefix = "[dry run] " if args.dry_run else ""
+    for month, count in result["months"].items():
+        archive = compressed_path(memory_dir / ARCHIVE_DIR / f"training_reports_{month}.jsonl", args.compress)
+        print(f"✓ {prefix}{month}: {count} reports → {archive.name}")
+    for name in result["archives_deleted"]:
+        print(f"✓ {prefix}Deleted archive {name}")
+    print(f"✓ {prefix}{result['archived']} of {result['reports']} reports archived, "
+          f"{result['bytes_freed'] / 1024:.1f} KB of individual files removed")
+
+
+if __name__ == "__main__":
+    main()
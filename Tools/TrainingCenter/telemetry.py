@@ -0,0 +1,218 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Lightweight spans and counters for the Training Center tools.
+
+    telemetry = Telemetry(memory="rss")
+    with telemetry.span("load"):
+        ...
+    telemetry.count("documents_loaded", 120)
+    report["telemetry"] = telemetry.to_dict()
+    telemetry.write_prometheus("metrics/skyworks_training.prom", "skyworks_training")
+
+Spans with the same name accumulate (seconds, calls). Optional peak memory
+per span comes from tracemalloc (Python heap, reset for every span; slows the
+run) or from the process RSS high-water mark (cheap; the peak reached so far).
+The Prometheus output is a node_exporter textfile, written atomically.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+MEMORY_MODES = ("tracemalloc", "rss")
+
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Process peak resident set size, or None where it cannot be read"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize
+        except Exception:
+            pass
+    return None
+
+
+class Telemetry:
+    """Named spans (accumulated wall time), counters and gauges"""
+
+    def __init__(self, memory: Optional[str] = None):
+        if memory not in (None,) + MEMORY_MODES:
+            raise ValueError(f"memory must be one of {MEMORY_MODES} or None")
+        self.memory = memory
+        self.spans: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stack: List[List[int]] = []   # tracemalloc: highest peak seen inside each open span
+        if memory == "tracemalloc":
+            import tracemalloc  # Imported only when profiling (it pulls in pickle)
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    # --- Recording ---
+    def record(self, name: str, seconds: float, calls: int = 1, peak_bytes: Optional[int] = None):
+        with self._lock:
+            span = self.spans.setdefault(name, {"seconds": 0.0, "calls": 0})
+            span["seconds"] += seconds
+            span["calls"] += calls
+            if peak_bytes is not None:
+                span["peak_bytes"] = max(span.get("peak_bytes", 0), peak_bytes)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a block; spans may nest"""
+        if self.memory == "tracemalloc":
+            import tracemalloc
+            # One global peak: remember the parent's, measure this span from zero
+            if self._stack:
+                self._stack[-1][0] = max(self._stack[-1][0], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._stack.append([0])
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - started
+            peak = None
+            if self.memory == "tracemalloc":
+                peak = max(self._stack.pop()[0], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    self._stack[-1][0] = max(self._stack[-1][0], peak)
+            elif self.memory == "rss":
+                peak = peak_rss_bytes()
+            self.record(name, seconds, peak_bytes=peak)
+
+    def timed_iter(self, name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+        """Re-yield `iterable`, recording the time spent producing items under `name`"""
+        iterator = iter(iterable)
+        seconds = 0.0
+        items = 0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    seconds += time.perf_counter() - started
+                    break
+                seconds += time.perf_counter() - started
+                items += 1
+                yield item
+        finally:
+            self.record(name, seconds, calls=items)
+
+    def count(self, name: str, n: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        with self._lock:
+            self.gauges[name] = value
+
+    def merge(self, other: "Telemetry"):
+        """Add another telemetry's spans and counters (e.g. one request into a service total)"""
+        for name, span in other.spans.items():
+            self.record(name, span["seconds"], span["calls"], span.get("peak_bytes"))
+        for name, n in other.counters.items():
+            self.count(name, n)
+        with self._lock:
+            self.gauges.update(other.gauges)
+
+    # --- Reading ---
+    def seconds(self, name: str) -> float:
+        span = self.spans.get(name)
+        return span["seconds"] if span else 0.0
+
+    def milliseconds(self, names: Iterable[str]) -> Dict[str, float]:
+        """{name_ms: total ms} for the given spans (0 when a span never ran)"""
+        return {f"{name}_ms": round(self.seconds(name) * 1000, 1) for name in names}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = {}
+            for name, span in self.spans.items():
+                entry = {"seconds": round(span["seconds"], 4), "calls": span["calls"]}
+                if "peak_bytes" in span:
+                    entry["peak_mb"] = round(span["peak_bytes"] / (1024 * 1024), 2)
+                spans[name] = entry
+            return {
+                "memory": self.memory,
+                "spans": spans,
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges)
+            }
+
+    # --- Export ---
+    def write_prometheus(self, path: Union[str, Path], prefix: str, labels: Optional[Dict[str, str]] = None):
+        """Write a node_exporter textfile (tmp + rename, so the collector never reads half a file)"""
+        prefix = _NAME_RE.sub("_", prefix)
+        base = dict(labels or {})
+
+        def sample(metric: str, value: float, extra: Optional[Dict[str, str]] = None) -> str:
+            pairs = dict(base, **(extra or {}))
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(pairs.items()))
+            return f"{metric}{{{label_text}}} {value}" if label_text else f"{metric} {value}"
+
+        lines = []
+        snapshot = self.to_dict()
+        if snapshot["spans"]:
+            for metric, help_text, field in (
+                ("stage_seconds", "Wall time spent in each stage", "seconds"),
+                ("stage_calls", "Times each stage ran", "calls"),
+            ):
+                lines += [f"# HELP {prefix}_{metric} {help_text}", f"# TYPE {prefix}_{metric} gauge"]
+                lines += [sample(f"{prefix}_{metric}", span[field], {"stage": name})
+                          for name, span in snapshot["spans"].items()]
+            peaks = [(name, span["peak_mb"]) for name, span in snapshot["spans"].items() if "peak_mb" in span]
+            if peaks:
+                lines += [f"# HELP {prefix}_stage_peak_bytes Peak memory per stage ({self.memory})",
+                          f"# TYPE {prefix}_stage_peak_bytes gauge"]
+                lines += [sample(f"{prefix}_stage_peak_bytes", int(self.spans[name]["peak_bytes"]), {"stage": name})
+                          for name, _ in peaks]
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{prefix}_{_NAME_RE.sub('_', name)}_total"
+            lines += [f"# TYPE {metric} counter", sample(metric, value)]
+        for name, value in sorted(snapshot["gauges"].items()):
+            metric = f"{prefix}_{_NAME_RE.sub('_', name)}"
+            lines += [f"# TYPE {metric} gauge", sample(metric, value)]
+        lines += [f"# TYPE {prefix}_last_run_timestamp_seconds gauge",
+                  sample(f"{prefix}_last_run_timestamp_seconds", round(time.time(), 3))]
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_name(path.name + ".tmp")
+        tmp_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        os.replace(tmp_file, path)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
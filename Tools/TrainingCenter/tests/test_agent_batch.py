@@ -0,0 +1,153 @@
+"""
+Batch question API (agent_batch.py) against the mock LLM backend
+
+No Azure credentials: AgentLLMService answers from its mock, and
+AGENT_MOCK_FAULT_RATE makes a share of those calls fail with 429/500/503.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+
+import pytest
+
+import agent_batch
+from agent_llm import AgentLLMService
+
+AGENT = "SORA_Compliance_Agent"
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    for name in ("AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_API_KEY", "AGENT_METRICS_FILE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("AGENT_ANSWER_CACHE_SIZE", "0")   # every attempt reaches the mock
+    monkeypatch.setenv("AGENT_MOCK_FAULT_RATE", "0")
+    memory_dir = tmp_path / "Tools" / "TrainingCenter" / "agent_memory"
+    memory_dir.mkdir(parents=True)
+    (memory_dir / f"{AGENT}_memory.json").write_text(json.dumps({"agent_name": AGENT, "memory": []}))
+    return lambda: AgentLLMService(str(tmp_path))
+
+
+def items(count, agent=AGENT):
+    return [{"index": i, "id": i, "agent_name": agent, "question": f"What is SAIL {i}?"} for i in range(count)]
+
+
+def collect(svc, batch, **options):
+    async def run():
+        return [result async for result in agent_batch.ask_many(svc, batch, **options)]
+    return asyncio.run(run())
+
+
+class TestAskMany:
+    def test_concurrency_cap(self, service):
+        svc = service()
+        ask = svc.ask_agent
+        lock = threading.Lock()
+        active = [0, 0]   # in flight, peak
+
+        def tracked(agent_name, question):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            try:
+                time.sleep(0.01)
+                return ask(agent_name, question)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        svc.ask_agent = tracked
+        results = collect(svc, items(24), concurrency=3)
+        assert len(results) == 24 and all(r["success"] for r in results)
+        assert active[1] <= 3
+
+    def test_retries_with_growing_delays(self, service, monkeypatch):
+        monkeypatch.setenv("AGENT_MOCK_FAULT_RATE", "1")
+        monkeypatch.setattr(agent_batch.random, "uniform", lambda low, high: high)   # upper bound of the jitter
+        delays = []
+        backoff_delay = agent_batch.backoff_delay
+
+        def recorded(*args, **kwargs):
+            delays.append(backoff_delay(*args, **kwargs))
+            return delays[-1]
+
+        monkeypatch.setattr(agent_batch, "backoff_delay", recorded)
+        [result] = collect(service(), items(1), max_retries=4, backoff_base=0.001)
+        assert result["attempts"] == 5
+        assert result["status_code"] in agent_batch.RETRY_STATUS
+        assert delays == sorted(delays) and len(set(delays)) == 4
+
+    def test_transient_faults_recover(self, service, monkeypatch):
+        monkeypatch.setenv("AGENT_MOCK_FAULT_RATE", "0.5")
+        random.seed(7)
+        results = collect(service(), items(12), concurrency=4, max_retries=30, backoff_base=0.001)
+        assert all(r["success"] for r in results)
+        assert any(r["attempts"] > 1 for r in results)
+
+    def test_completion_order_and_latency(self, service):
+        svc = service()
+        ask = svc.ask_agent
+        pause = {0: 0.15, 1: 0.0, 2: 0.075}
+
+        def slow(agent_name, question):
+            time.sleep(pause[int(question.split()[-1].rstrip("?"))])
+            return ask(agent_name, question)
+
+        svc.ask_agent = slow
+        results = collect(svc, items(3), concurrency=3)
+        assert [r["index"] for r in results] == [1, 2, 0]
+        for r in results:
+            assert r["latency_ms"] >= pause[r["index"]] * 1000
+            assert r["attempts"] == 1
+
+    def test_permanent_failure_is_reported(self, service, monkeypatch):
+        monkeypatch.setenv("AGENT_MOCK_FAULT_RATE", "1")
+        results = collect(service(), items(2) + items(1, agent="Unknown_Agent"),
+                          max_retries=2, backoff_base=0.001)
+        failed = {r["agent_name"]: r for r in results}
+        assert not any(r["success"] for r in results)
+        assert failed[AGENT]["attempts"] == 3
+        # Not retryable: no status code
+        assert failed["Unknown_Agent"]["attempts"] == 1
+        assert "not found" in failed["Unknown_Agent"]["error"]
+
+
+class TestBackoff:
+    def test_delay_bounds(self):
+        for attempt in range(8):
+            delay = agent_batch.backoff_delay(attempt, base=0.5, cap=10.0)
+            assert 0 <= delay <= min(10.0, 0.5 * 2 ** attempt)
+
+    def test_retry_after_wins_up_to_cap(self):
+        assert agent_batch.backoff_delay(0, base=0.01, retry_after=2.0) >= 2.0
+        assert agent_batch.backoff_delay(0, base=0.01, cap=1.0, retry_after=5.0) == 1.0
+
+    def test_token_bucket_rate(self):
+        async def run():
+            bucket = agent_batch.TokenBucket(rate=20, capacity=1)
+            started = time.monotonic()
+            for _ in range(5):
+                await bucket.acquire()
+            return time.monotonic() - started
+
+        # One banked token, then 4 more at 20/s
+        assert asyncio.run(run()) >= 0.18
+
+
+class TestLoadQuestions:
+    def test_fan_out_and_ids(self, tmp_path):
+        path = tmp_path / "questions.jsonl"
+        path.write_text('{"id": "q1", "agent_name": "A", "question": "One?"}\n\n"Two?"\n', encoding="utf-8")
+        loaded = agent_batch.load_questions(path, agents=["A", "B"])
+        assert [(q["id"], q["agent_name"], q["question"]) for q in loaded] == [
+            ("q1", "A", "One?"), (3, "A", "Two?"), (3, "B", "Two?")]
+
+    @pytest.mark.parametrize("line", ['{"question": "Unclosed?"', '{"agent_name": "A"}', '[1, 2]', '{"question": ""}'])
+    def test_malformed_line_names_its_position(self, tmp_path, line):
+        path = tmp_path / "questions.jsonl"
+        path.write_text('"Fine?"\n' + line + "\n", encoding="utf-8")
+        with pytest.raises(ValueError, match=r"questions\.jsonl:2: "):
+            agent_batch.load_questions(path, agents=["A"])
@@ -0,0 +1,29 @@
+"""
+Import-time budget of the TrainingCenter CLIs (check_import_time.py)
+
+Each entry module is imported in a fresh `python -X importtime` interpreter;
+only its own subtree counts. IMPORT_TIME_SCALE multiplies the budgets on slow
+machines, as --scale does for the script.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import check_import_time
+
+SCRIPT_DIR = Path(check_import_time.__file__).resolve().parent
+RUNS = 3
+
+
+@pytest.mark.parametrize("module", sorted(check_import_time.BUDGETS_MS))
+class TestImportTime:
+    def test_within_budget(self, module):
+        best = min(check_import_time.measure(module, SCRIPT_DIR)[0] for _ in range(RUNS))
+        limit = check_import_time.BUDGETS_MS[module] * float(os.getenv("IMPORT_TIME_SCALE", "1"))
+        assert best <= limit, f"import {module}: {best:.1f} ms > {limit:.0f} ms"
+
+    def test_no_deferred_imports(self, module):
+        _, imported = check_import_time.measure(module, SCRIPT_DIR)
+        assert check_import_time.deferred_imports(imported) == []
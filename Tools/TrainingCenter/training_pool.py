@@ -0,0 +1,136 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Map/reduce document analysis for the agent trainer.
+
+The CPU work of training a document — keyword hits for the memory entry
+and the tokenized BM25 passages — does not depend on the agent, so it is
+done once per document and may run on a ProcessPoolExecutor:
+
+- map:    documents are sharded (by count and size) across `workers` processes
+- reduce: analyses come back in document order and are merged into every
+          agent the document is routed to, exactly as a serial run would
+
+With ``workers <= 1`` the same analysis runs in-process. Per-worker CPU
+time is recorded so the training report can show the effective speedup
+(CPU seconds of analysis per wall-clock second of the map phase).
+"""
+
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bm25_index import analyze_passages
+from keyword_scanner import KeywordScanner
+
+SHARD_DOCUMENTS = 16
+SHARD_CHARS = 1 << 20
+
+# Per-process state, set by _init_worker (or by DocumentAnalyzer in serial mode)
+_scanner: Optional[KeywordScanner] = None
+_passage_chars: Tuple[int, ...] = ()
+
+
+def analyze(scanner: KeywordScanner, content: str, passage_chars: Iterable[int]) -> Dict[str, Any]:
+    """Agent-independent analysis of one document"""
+    return {
+        "length": len(content),
+        "hits": scanner.scan(content),
+        "passages": {chars: analyze_passages(content, chars) for chars in passage_chars}
+    }
+
+
+def _init_worker(keywords: List[str], passage_chars: Tuple[int, ...]):
+    global _scanner, _passage_chars
+    _scanner = KeywordScanner(keywords)
+    _passage_chars = passage_chars
+
+
+def _analyze_shard(shard: List[Tuple[str, str]]) -> Tuple[List[Dict[str, Any]], int, float]:
+    # CPU time, so workers sharing a core do not count the wait as work
+    started = time.process_time()
+    results = [analyze(_scanner, content, _passage_chars) for _, content in shard]
+    return results, os.getpid(), time.process_time() - started
+
+
+class DocumentAnalyzer:
+    """Analyze documents in shards across worker processes, yielding results in input order"""
+
+    def __init__(self, keywords: Iterable[str], passage_chars: Iterable[int], workers: int = 1,
+                 shard_documents: int = SHARD_DOCUMENTS, shard_chars: int = SHARD_CHARS):
+        self.keywords = list(keywords)
+        self.passage_chars = tuple(sorted(set(passage_chars)))
+        self.workers = max(1, workers)
+        self.shard_documents = shard_documents
+        self.shard_chars = shard_chars
+        self.per_worker: Dict[str, Dict[str, float]] = {}
+        self.shards = 0
+        self.wall_seconds = 0.0
+
+    def _shards(self, items: Iterable[Tuple[str, Callable[[], str]]]) -> Iterator[List[Tuple[str, str]]]:
+        shard, size = [], 0
+        for key, load in items:
+            content = load()
+            shard.append((key, content))
+            size += len(content)
+            if len(shard) >= self.shard_documents or size >= self.shard_chars:
+                yield shard
+                shard, size = [], 0
+        if shard:
+            yield shard
+
+    def _record(self, worker: str, documents: int, seconds: float):
+        # seconds: CPU time spent analyzing
+        timing = self.per_worker.setdefault(worker, {"shards": 0, "documents": 0, "seconds": 0.0})
+        timing["shards"] += 1
+        timing["documents"] += documents
+        timing["seconds"] += seconds
+        self.shards += 1
+
+    def map(self, items: Iterable[Tuple[str, Callable[[], str]]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (key, analysis) for (key, loader) items; loaders run in this process, in order."""
+        started = time.perf_counter()
+        try:
+            if self.workers == 1:
+                _init_worker(self.keywords, self.passage_chars)
+                for shard in self._shards(items):
+                    results, _, seconds = _analyze_shard(shard)
+                    self._record("main", len(shard), seconds)
+                    yield from zip((key for key, _ in shard), results)
+                return
+
+            # Deferred: multiprocessing is a heavy import that serial runs never need
+            from concurrent.futures import ProcessPoolExecutor
+            # At most 2 shards per worker in flight keeps memory bounded
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.keywords, self.passage_chars)) as pool:
+                pending = deque()
+                shards = self._shards(items)
+                for shard in shards:
+                    pending.append(([key for key, _ in shard], pool.submit(_analyze_shard, shard)))
+                    if len(pending) >= 2 * self.workers:
+                        break
+                while pending:
+                    keys, future = pending.popleft()
+                    results, pid, seconds = future.result()
+                    self._record(f"pid{pid}", len(keys), seconds)
+                    yield from zip(keys, results)
+                    for shard in shards:
+                        pending.append(([key for key, _ in shard], pool.submit(_analyze_shard, shard)))
+                        break
+        finally:
+            self.wall_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        cpu = sum(t["seconds"] for t in self.per_worker.values())
+        return {
+            "workers": self.workers,
+            "shards": self.shards,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cpu_seconds": round(cpu, 3),
+            # Analysis CPU time over wall time: how many cores the map phase kept busy
+            "speedup": round(cpu / self.wall_seconds, 2) if self.wall_seconds > 0 else 0.0,
+            "per_worker": {name: {"shards": t["shards"], "documents": t["documents"],
+                                  "seconds": round(t["seconds"], 3)}
+                           for name, t in sorted(self.per_worker.items())}
+        }
@@ -0,0 +1,346 @@
+# Phase1 Step5 — Skyworks V5
+"""
+Hashed-feature vector retrieval for the agents (optional; needs NumPy).
+
+Every passage of an agent's BM25 index becomes one row of a dense float32
+matrix, built at training time and saved next to the agent memory:
+
+    agent_memory/<agent>_vectors.npy     (passages x dim), rows L2-normalised
+    agent_memory/<agent>_vectors.json    dim, feature settings, signature
+
+Features are hashed (signed, so collisions cancel on average) into `dim`
+buckets: word unigrams and bigrams plus character 3/4-grams of every word,
+which also match inflections and compounds the tokenizer keeps apart
+("operator" ~ "operators", "airspace" ~ "air space"). Words are weighted by
+1 + log(tf) and the BM25 idf of the passage index. A query — or a whole
+batch of queries — is hashed the same way and scored against every passage
+with one matrix product.
+
+Incremental sessions only hash the passages of changed documents; reused
+rows keep the idf they were weighted with. Every idf moves by at most the
+churn (passages hashed or dropped) since the last full build, relative to
+the passage count, so once that churn exceeds REWEIGHT_CHURN of the
+passages all rows are hashed again with the current idf. Until then vector
+scores may differ slightly from a full rebuild (BM25 results do not).
+
+Rows follow the passage ids of `<agent>_bm25.json`; the matrix is only used
+while the signature (size and mtime of that file) still matches. The matrix
+is read in one go rather than memory-mapped, so a training session can
+replace the file while the LLM service is using the previous one (Windows
+refuses to replace a mapped file).
+"""
+
+import json
+import math
+import os
+import threading
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from bm25_index import tokenize
+from compressed_io import read_text
+
+VECTOR_VERSION = 1
+# AGENT_RETRIEVER values of the LLM service
+RETRIEVERS = ("bm25", "vector", "fusion")
+DEFAULT_DIM = 1024
+CHAR_NGRAMS = (3, 4)
+# L2 mass of a word's character n-grams and of a bigram, relative to the word itself
+CHAR_WEIGHT = 0.5
+BIGRAM_WEIGHT = 0.7
+# Rows hashed per block (bounds the scratch arrays of a full build)
+BLOCK_ROWS = 2048
+# Fraction of passages changed since the last full build after which reused rows are re-weighted
+REWEIGHT_CHURN = 0.05
+# Reciprocal rank fusion constant (Cormack et al.)
+RRF_K = 60
+
+
+def _numpy():
+    # NumPy is optional and a heavy import: only vector retrieval needs it
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def numpy_available() -> bool:
+    return _numpy() is not None
+
+
+def check_dim(dim: int) -> int:
+    if dim < 16 or dim & (dim - 1):
+        raise ValueError(f"vector dim must be a power of two >= 16, got {dim}")
+    return dim
+
+
+def vector_paths(memory_dir: Path, agent_name: str) -> Tuple[Path, Path]:
+    """(matrix .npy, metadata .json) of an agent"""
+    memory_dir = Path(memory_dir)
+    return memory_dir / f"{agent_name}_vectors.npy", memory_dir / f"{agent_name}_vectors.json"
+
+
+def index_signature(memory_dir: Path, agent_name: str) -> Optional[List[int]]:
+    """[size, mtime_ns] of the BM25 index the rows are aligned with"""
+    try:
+        st = (Path(memory_dir) / f"{agent_name}_bm25.json").stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class FeatureHasher:
+    """Signed feature hashing of word unigrams, bigrams and character n-grams into `dim` buckets.
+
+    `idf(term)` weights words (and bigrams by their rarer word). Python only
+    maps tokens to term ids; counting, bigram hashing and the scatter into
+    buckets are array operations over the whole batch. Thread-safe: the
+    per-term feature table is shared by concurrent queries.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM, idf: Optional[Callable[[str], float]] = None):
+        self.dim = check_dim(dim)
+        self.idf = idf or (lambda term: 1.0)
+        self._mask = dim - 1
+        self._ids: Dict[str, int] = {}
+        # Per term id: idf, bigram hash and the range of its unigram + n-gram features
+        self._idfs = array("d")
+        self._hashes = array("q")
+        self._starts = array("q", [0])
+        self._buckets = array("q")
+        self._weights = array("f")
+        self._lock = threading.Lock()
+
+    def _add_term(self, term: str) -> int:
+        marked = f"<{term}>"
+        grams = [marked[i:i + n] for n in CHAR_NGRAMS for i in range(len(marked) - n + 1)] or [marked]
+        weight = CHAR_WEIGHT / math.sqrt(len(grams))
+        for key, w in [("u:" + term, 1.0)] + [("c:" + gram, weight) for gram in grams]:
+            # Bucket from the low bits, sign from the top bit
+            h = zlib.crc32(key.encode("utf-8"))
+            self._buckets.append(h & self._mask)
+            self._weights.append(-w if h & 0x80000000 else w)
+        self._starts.append(len(self._buckets))
+        self._hashes.append(zlib.crc32(("b:" + term).encode("utf-8")))
+        self._idfs.append(self.idf(term))
+        tid = self._ids[term] = len(self._ids)
+        return tid
+
+    def transform(self, texts: Sequence[str]):
+        """(len(texts), dim) float32 matrix of L2-normalised feature vectors"""
+        np = _numpy()
+        n = len(texts)
+        tokens = array("q")
+        lengths = array("q")
+        with self._lock:
+            ids, add = self._ids, self._add_term
+            for text in texts:
+                row = [ids[t] if t in ids else add(t) for t in tokenize(text)]
+                tokens.extend(row)
+                lengths.append(len(row))
+
+            # Viewed, not copied, and only while the lock is held (the table may grow after)
+            idfs = np.frombuffer(self._idfs, dtype=np.float64)
+            hashes = np.frombuffer(self._hashes, dtype=np.int64)
+            starts = np.frombuffer(self._starts, dtype=np.int64)
+            tok = np.frombuffer(tokens, dtype=np.int64)
+            rows = np.repeat(np.arange(n, dtype=np.int64), np.frombuffer(lengths, dtype=np.int64))
+
+            # Words: tf per (row, term), weighted 1 + log(tf) times idf
+            keys, tf = np.unique(rows * len(ids) + tok, return_counts=True)
+            term_rows, term_ids = np.divmod(keys, len(ids))
+            term_weight = (1 + np.log(tf)) * idfs[term_ids]
+            # ... expanded into each word's unigram and character n-gram features
+            count = starts[term_ids + 1] - starts[term_ids]
+            first = np.repeat(starts[term_ids] - np.cumsum(count) + count, count)
+            offsets = first + np.arange(first.size, dtype=np.int64)
+            buckets = [np.frombuffer(self._buckets, dtype=np.int64)[offsets]]
+            weights = [np.repeat(term_weight, count) * np.frombuffer(self._weights, dtype=np.float32)[offsets]]
+            feature_rows = [np.repeat(term_rows, count)]
+
+            # Bigrams: consecutive tokens of one text, hashed from both words' hashes
+            same = rows[1:] == rows[:-1]
+            a, b = tok[:-1][same], tok[1:][same]
+            pair_rows = rows[1:][same]
+            pair_hash = _mix((hashes[a].astype(np.uint64) << np.uint64(32)) | hashes[b].astype(np.uint64))
+            pair_weight = np.minimum(idfs[a], idfs[b]) * BIGRAM_WEIGHT
+            del idfs, hashes, starts, tok
+
+        _, first_seen, tf = np.unique(pair_hash ^ _mix(pair_rows.astype(np.uint64)),
+                                      return_index=True, return_counts=True)
+        pair_hash = pair_hash[first_seen]
+        sign = np.where(pair_hash >> np.uint64(63), -1.0, 1.0)
+        buckets.append((pair_hash & np.uint64(self._mask)).astype(np.int64))
+        weights.append((1 + np.log(tf)) * pair_weight[first_seen] * sign)
+        feature_rows.append(pair_rows[first_seen])
+
+        matrix = np.bincount(np.concatenate(feature_rows) * self.dim + np.concatenate(buckets),
+                             weights=np.concatenate(weights),
+                             minlength=n * self.dim).reshape(n, self.dim).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+def _mix(x):
+    """splitmix64 finalizer over a uint64 array (wraps around by design)"""
+    np = _numpy()
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def bm25_idf(index) -> Callable[[str], float]:
+    """The passage index's BM25 idf (BM25Index or PackedBM25Index)"""
+    n = len(index)
+
+    def idf(term: str) -> float:
+        df = index.df(term)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+    return idf
+
+
+def iter_passage_texts(passages: Iterable[Tuple[str, int, int]], store=None) -> Iterator[str]:
+    """Text of (path, start, end) passages, in order ("" if unreadable).
+
+    Passages of one document are consecutive in a BM25 index, so each file
+    is read (or sliced from the corpus store) once.
+    """
+    current: Tuple[Optional[str], Optional[str]] = (None, None)
+    for path, start, end in passages:
+        if store is not None and path:
+            text = store.passage(path, start, end)
+            if text is not None:
+                yield text
+                continue
+        if current[0] != path:
+            try:
+                current = (path, read_text(path, errors='ignore') if path else "")
+            except OSError:
+                current = (path, "")
+        yield current[1][start:end]
+
+
+class VectorIndex:
+    """Passage vectors of one agent; hits are described by its passage index"""
+
+    def __init__(self, matrix, hasher: FeatureHasher, passages, churn: int = 0):
+        self.matrix = matrix
+        self.hasher = hasher
+        self.passages = passages
+        # Passages hashed or dropped since the last full build (idf drift of the other rows)
+        self.churn = churn
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k passages for a free-text query, best first (cosine similarity)."""
+        return self.search_many([query], k)[0]
+
+    def search_many(self, queries: Sequence[str], k: int = 10) -> List[List[Dict[str, Any]]]:
+        """Top-k passages for every query; the batch is scored with one matrix product."""
+        np = _numpy()
+        n = len(self)
+        if not n or not queries:
+            return [[] for _ in queries]
+        scores = self.hasher.transform(queries) @ self.matrix.T
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(scores, top):
+            ranked = candidates[np.argsort(-row[candidates], kind="stable")]
+            results.append([dict(self.passages.passage_info(int(pid)), score=round(float(row[pid]), 4))
+                            for pid in ranked if row[pid] > 0])
+        return results
+
+    @classmethod
+    def load(cls, memory_dir: Path, agent_name: str, passages) -> Optional["VectorIndex"]:
+        """Load an agent's vectors; None if missing, stale or NumPy is not installed."""
+        np = _numpy()
+        matrix_file, meta_file = vector_paths(memory_dir, agent_name)
+        if np is None or not matrix_file.exists():
+            return None
+        try:
+            meta = json.loads(meta_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if (meta.get("version") != VECTOR_VERSION or meta.get("char_ngrams") != list(CHAR_NGRAMS)
+                or meta.get("signature") != index_signature(memory_dir, agent_name)):
+            return None
+        try:
+            matrix = np.load(matrix_file)
+        except (OSError, ValueError):
+            return None
+        if matrix.shape != (len(passages), meta["dim"]):
+            return None
+        return cls(matrix, FeatureHasher(meta["dim"], bm25_idf(passages)), passages, meta.get("churn", 0))
+
+
+def write_vectors(memory_dir: Path, agent_name: str, index, dim: int = DEFAULT_DIM, store=None,
+                  previous: Optional[VectorIndex] = None,
+                  reuse: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+    """Build and save the vectors of a saved (compacted) BM25 index.
+
+    `reuse[pid]` names the row of `previous` that already holds passage
+    `pid` (-1 for passages new in this session), so an incremental session
+    only hashes the documents it retrained - unless the churn since the last
+    full build exceeds REWEIGHT_CHURN, then every row is re-weighted.
+    """
+    np = _numpy()
+    signature = index_signature(memory_dir, agent_name)
+    if np is None or signature is None:
+        return None
+    n = len(index.passages)
+    matrix = np.zeros((n, check_dim(dim)), dtype=np.float32)
+    incremental = previous is not None and reuse is not None and previous.hasher.dim == dim
+    churn = 0
+    if incremental:
+        kept = sum(1 for row in reuse if row >= 0)
+        churn = previous.churn + (n - kept) + (len(previous) - kept)
+        incremental = churn <= REWEIGHT_CHURN * n
+    if not incremental:
+        reuse = [-1] * n
+        churn = 0
+    reused = [(pid, row) for pid, row in enumerate(reuse) if row >= 0]
+    if reused:
+        new_rows, old_rows = zip(*reused)
+        matrix[list(new_rows)] = previous.matrix[list(old_rows)]
+
+    hasher = FeatureHasher(dim, bm25_idf(index))
+    fresh = [pid for pid, row in enumerate(reuse) if row < 0]
+    texts = iter_passage_texts(((index.sources.get(index.passages[pid][0], ""),) + tuple(index.passages[pid][1:3])
+                                for pid in fresh), store)
+    for block in range(0, len(fresh), BLOCK_ROWS):
+        pids = fresh[block:block + BLOCK_ROWS]
+        matrix[pids] = hasher.transform([next(texts) for _ in pids])
+
+    matrix_file, meta_file = vector_paths(memory_dir, agent_name)
+    tmp_file = matrix_file.with_name(matrix_file.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        np.save(f, matrix)
+    os.replace(tmp_file, matrix_file)
+    meta = {"version": VECTOR_VERSION, "dim": dim, "char_ngrams": list(CHAR_NGRAMS),
+            "passages": n, "signature": signature, "churn": churn}
+    tmp_meta = meta_file.with_name(meta_file.name + ".tmp")
+    tmp_meta.write_text(json.dumps(meta), encoding='utf-8')
+    os.replace(tmp_meta, meta_file)
+    return {"path": matrix_file, "passages": n, "hashed": len(fresh), "reused": len(reused),
+            "bytes": matrix.nbytes}
+
+
+def fuse(rankings: Iterable[List[Dict[str, Any]]], k: int = 10, rrf_k: int = RRF_K) -> List[Dict[str, Any]]:
+    """Reciprocal rank fusion of ranked hit lists (by passage_id); score = sum of 1 / (rrf_k + rank)"""
+    fused: Dict[int, Dict[str, Any]] = {}
+    for hits in rankings:
+        for rank, hit in enumerate(hits, 1):
+            entry = fused.setdefault(hit["passage_id"], dict(hit, score=0.0))
+            entry["score"] += 1.0 / (rrf_k + rank)
+    ranked = sorted(fused.values(), key=lambda hit: hit["score"], reverse=True)[:k]
+    for hit in ranked:
+        hit["score"] = round(hit["score"], 6)
+    return ranked